@@ -0,0 +1,121 @@
+"""Server version and capability discovery.
+
+Some REST endpoints were removed in newer Gerrit releases. The version and
+the configuration of a server are fetched once per server URL and cached,
+so facades and commands can refuse unsupported calls locally instead of
+paying for a round trip that is known to fail.
+"""
+
+import re
+import threading
+
+from gerritclient import error
+from gerritclient.v1 import server
+
+# Features (endpoints) removed from Gerrit, mapped to the first release
+# that does not provide them anymore
+REMOVED_FEATURES = {
+    "assignee": (3, 7),
+    "publish_draft": (2, 15),
+}
+
+VERSION_PATTERN = re.compile(r"^v?(\d+)\.(\d+)(?:\.(\d+))?")
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def parse_version(version):
+    """Parses Gerrit version string into a comparable tuple.
+
+    :param version: Version string as returned by the server,
+                    e.g. '3.9.1' or '2.14.6-2-g4f7a2e1'
+    :return: Tuple of (major, minor, patch) integers or None if the
+             version can not be recognized
+    """
+
+    match = VERSION_PATTERN.match(version or "")
+    if match is None:
+        return None
+    return tuple(int(part or 0) for part in match.groups())
+
+
+class ServerCapabilities:
+    """Describes what a particular Gerrit server supports."""
+
+    def __init__(self, version=None, config=None):
+        """Creates ServerCapabilities.
+
+        :param version: Version string of the server, None if unknown
+        :param config: ServerInfo entity of the server, None if unknown
+        """
+
+        self.version = version
+        self.version_info = parse_version(version)
+        self.config = config or {}
+
+    def supports(self, feature):
+        """Checks whether the server provides the feature.
+
+        If the server version is unknown the feature is assumed to be
+        supported, so the server has the final word.
+
+        :param feature: Name of the feature, see REMOVED_FEATURES
+        :return: True if the feature is (possibly) supported
+        """
+
+        if feature not in REMOVED_FEATURES:
+            raise ValueError(f"Unknown feature '{feature}'.")
+        if self.version_info is None:
+            return True
+        return self.version_info < REMOVED_FEATURES[feature]
+
+    def require(self, feature):
+        """Raises UnsupportedFeatureException if feature is not supported."""
+
+        if not self.supports(feature):
+            removed_in = ".".join(str(v) for v in REMOVED_FEATURES[feature])
+            raise error.UnsupportedFeatureException(
+                f"Feature '{feature}' is not supported by Gerrit {self.version} "
+                f"(removed in {removed_in})."
+            )
+
+
+def discover(connection):
+    """Fetches version and configuration of the server.
+
+    Failures are not fatal: capabilities with unknown version are returned.
+    """
+
+    server_client = server.get_client(connection)
+    try:
+        version = server_client.get_version()
+    except error.HTTPError:
+        version = None
+    try:
+        config = server_client.get_config()
+    except error.HTTPError:
+        config = None
+    return ServerCapabilities(version=version, config=config)
+
+
+def get_capabilities(connection, refresh=False):
+    """Returns capabilities of the server, cached per server URL.
+
+    :param connection: API connection
+    :type connection: gerritclient.client.APIClient
+    :param refresh: If True, discard cached data and query the server again
+    :rtype: ServerCapabilities
+    """
+
+    with _lock:
+        if refresh or connection.root not in _cache:
+            _cache[connection.root] = discover(connection)
+        return _cache[connection.root]
+
+
+def clear_cache():
+    """Drops all cached server capabilities."""
+
+    with _lock:
+        _cache.clear()
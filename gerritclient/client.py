@@ -1,18 +1,32 @@
 import json
+import threading
 
 import requests
-from requests import auth
+from requests import adapters, auth
 
 import gerritclient
 from gerritclient import error
 from gerritclient.common import utils
 from gerritclient.settings import get_settings
 
+# Maximum number of connections kept alive per host in the HTTP session pool
+DEFAULT_POOL_MAXSIZE = 10
+
+# Size of chunks of streamed response bodies in bytes
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
 
 class APIClient:
     """This class handles API requests."""
 
-    def __init__(self, url, auth_type=None, username=None, password=None):
+    def __init__(
+        self,
+        url,
+        auth_type=None,
+        username=None,
+        password=None,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+    ):
         """Creates APIClient.
 
         :param url: URL path to the Gerrit server
@@ -24,11 +38,15 @@ class APIClient:
         :type username: str
         :param password: password
         :type password: str
+        :param pool_maxsize: Maximum number of connections to keep alive
+                             in the session pool
+        :type pool_maxsize: int
         """
 
         self.root = url
         self._username = username
         self._password = password
+        self._pool_maxsize = pool_maxsize
         self._session = None
         self._auth = None
         if auth_type:
@@ -62,6 +80,11 @@ class APIClient:
         session = requests.Session()
         session.auth = self._auth
         session.headers.update(self._make_common_headers())
+        adapter = adapters.HTTPAdapter(
+            pool_connections=self._pool_maxsize, pool_maxsize=self._pool_maxsize
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         return session
 
     @property
@@ -72,6 +95,13 @@ class APIClient:
             self._session = self._make_session()
         return self._session
 
+    def close(self):
+        """Closes the HTTP session and releases pooled connections."""
+
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def delete_request(self, api, data=None):
         """Make DELETE request to specific API with some data.
 
@@ -99,15 +129,35 @@ class APIClient:
         self._raise_for_status_with_info(resp)
         return self._decode_content(resp)
 
-    def get_request_raw(self, api, params=None):
+    def get_request_raw(self, api, params=None, stream=False):
         """Make a GET request to specific API and return raw response.
 
         :param api: API endpoint (path)
         :param params: params passed to GET request
+        :param stream: If True, the body is not downloaded until it is read
         """
 
         url = self.api_root + api
-        return self.session.get(url, params=params)
+        return self.session.get(url, params=params, stream=stream)
+
+    def get_request_chunks(self, api, params=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Make GET request to specific API and yield the body in chunks.
+
+        The body is never held in memory as a whole, the connection is
+        released when the generator is exhausted or closed.
+
+        :param api: API endpoint (path)
+        :param params: params passed to GET request
+        :param chunk_size: Maximum size of chunks in bytes
+        :return: Generator of bytes
+        """
+
+        resp = self.get_request_raw(api, params, stream=True)
+        try:
+            self._raise_for_status_with_info(resp)
+            yield from resp.iter_content(chunk_size=chunk_size)
+        finally:
+            resp.close()
 
     def get_request(self, api, params=None):
         """Make GET request to specific API."""
@@ -129,11 +179,13 @@ class APIClient:
 
         url = self.api_root + api
         # Some POST requests require 'Content-Type' value other
-        # than default 'application/json'
+        # than default 'application/json'. Pass it per request, since
+        # the session (and its default headers) may be shared.
+        headers = None
         if content_type is not None:
-            self.session.headers.update({"Content-Type": content_type})
+            headers = {"Content-Type": content_type}
 
-        return self.session.post(url, data=data, json=json_data)
+        return self.session.post(url, data=data, json=json_data, headers=headers)
 
     def post_request(self, api, data=None, json_data=None, content_type=None):
         """Make POST request to specific API with some data."""
@@ -147,7 +199,9 @@ class APIClient:
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError as e:
-            raise error.HTTPError(error.get_full_error_message(e))
+            raise error.HTTPError(
+                error.get_full_error_message(e), status_code=response.status_code
+            )
 
     @staticmethod
     def _decode_content(response):
@@ -162,10 +216,95 @@ class APIClient:
         return json.loads(response.text.strip(")]}'"))
 
 
-def connect(url, auth_type=None, username=None, password=None):
+def connect(
+    url, auth_type=None, username=None, password=None, pool_maxsize=DEFAULT_POOL_MAXSIZE
+):
     """Creates API connection."""
 
-    return APIClient(url, auth_type=auth_type, username=username, password=password)
+    return APIClient(
+        url,
+        auth_type=auth_type,
+        username=username,
+        password=password,
+        pool_maxsize=pool_maxsize,
+    )
+
+
+class ClientRegistry:
+    """Process-wide cache of API connections and resource facades.
+
+    Connections are keyed by their settings, so all facades created for
+    the same Gerrit server share one validated configuration and one pooled
+    HTTP session instead of building new ones on every call.
+    """
+
+    def __init__(self, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        self._pool_maxsize = pool_maxsize
+        self._lock = threading.RLock()
+        self._default_config = None
+        self._connections = {}
+        self._facades = {}
+
+    @staticmethod
+    def _make_key(config):
+        return tuple(sorted(config.items()))
+
+    def get_connection(self, config=None):
+        """Returns a shared API connection for the given settings.
+
+        :param config: Dictionary compatible with connect(). If None, the
+                       settings are loaded from the environment only once
+                       and reused afterwards.
+        :type config: dict
+        :return: gerritclient.client.APIClient
+        """
+
+        with self._lock:
+            if config is None:
+                if self._default_config is None:
+                    self._default_config = get_settings()
+                config = self._default_config
+            key = self._make_key(config)
+            if key not in self._connections:
+                self._connections[key] = connect(
+                    pool_maxsize=self._pool_maxsize, **config
+                )
+            return self._connections[key]
+
+    def get_client(self, resource, version="v1", config=None):
+        """Returns a cached facade bound to a shared connection."""
+
+        with self._lock:
+            connection = self.get_connection(config)
+            key = (resource, version, id(connection))
+            if key not in self._facades:
+                self._facades[key] = _make_client(resource, version, connection)
+            return self._facades[key]
+
+    def close(self):
+        """Closes all shared connections and drops cached facades."""
+
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+            self._facades.clear()
+            self._default_config = None
+
+
+registry = ClientRegistry()
+
+
+def get_connection(config=None):
+    """Gets a shared API connection from the process-wide registry."""
+
+    return registry.get_connection(config)
+
+
+def close():
+    """Closes all connections held by the process-wide registry."""
+
+    registry.close()
 
 
 def get_client(resource, version="v1", connection=None):
@@ -180,12 +319,19 @@ def get_client(resource, version="v1", connection=None):
     :param version:  Version of the API
     :type version:   str,
                      Available: v1. Default: v1.
-    :param connection: API connection
+    :param connection: API connection. If None, a shared connection and
+                       facade are taken from the process-wide registry.
     :type connection: gerritclient.client.APIClient
     :return:         Facade to the specified resource that wraps
                      calls to the specified version of the API.
     """
 
+    if connection is None:
+        return registry.get_client(resource, version)
+    return _make_client(resource, version, connection)
+
+
+def _make_client(resource, version, connection):
     version_map = {
         "v1": {
             "account": gerritclient.v1.account,
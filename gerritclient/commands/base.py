@@ -1,11 +1,13 @@
 import abc
 import argparse
+import collections
 import os
+import time
 
 from cliff import command, lister, show
 
 from gerritclient import client, error
-from gerritclient.common import utils
+from gerritclient.common import bulk, utils
 
 VERSION = "v1"
 
@@ -76,6 +78,9 @@ class BaseListCommand(lister.Lister, BaseCommand, abc.ABC):
 class BaseShowCommand(show.ShowOne, BaseCommand, abc.ABC):
     """Shows detailed information about the entity."""
 
+    # Value of 'nargs' for the entity identifier argument, '?' makes it optional
+    entity_id_nargs = None
+
     @property
     @abc.abstractmethod
     def columns(self):
@@ -89,6 +94,7 @@ class BaseShowCommand(show.ShowOne, BaseCommand, abc.ABC):
             "entity_id",
             metavar=f"{self.entity_name}-identifier",
             type=str,
+            nargs=self.entity_id_nargs,
             help=f"{self.entity_name.capitalize()} identifier.",
         )
 
@@ -180,3 +186,130 @@ class BaseDownloadCommand(BaseCommand, abc.ABC):
             help="Destination directory. Defaults to the current directory.",
         )
         return parser
+
+
+class BaseBulkMixIn:
+    """Runs an action for many entities concurrently and reports results."""
+
+    bulk_columns = ("id", "status", "detail")
+
+    @staticmethod
+    def add_bulk_arguments(parser):
+        group = parser.add_argument_group("bulk options")
+        group.add_argument(
+            "--parallel",
+            type=int,
+            default=bulk.DEFAULT_WORKERS,
+            help="Maximum number of concurrent requests. "
+            f"Defaults to {bulk.DEFAULT_WORKERS}.",
+        )
+        group.add_argument(
+            "--retries",
+            type=int,
+            default=bulk.DEFAULT_RETRIES,
+            help="Number of retries for requests failed with transient "
+            f"errors. Defaults to {bulk.DEFAULT_RETRIES}.",
+        )
+        return parser
+
+    def run_bulk(self, func, items, parsed_args, skip=None):
+        """Applies func to all items, writing progress to stderr.
+
+        :return: List of bulk.Result entries in the order of items
+        """
+
+        return self.collect_bulk_results(
+            bulk.run_concurrently(
+                func,
+                items,
+                max_workers=parsed_args.parallel,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+                skip=skip,
+            )
+        )
+
+    # Minimal interval between progress updates in seconds
+    progress_interval = 0.1
+
+    def collect_bulk_results(self, results_iter, keep=None, describe=None):
+        """Consumes bulk.Result entries, writing progress to stderr.
+
+        :param results_iter: Iterable of bulk.Result entries
+        :param keep: Callable taking a result and returning False if it
+                     should not be kept (e.g. to save memory on large runs)
+        :param describe: Callable returning extra text for the progress line
+        :return: List of kept bulk.Result entries sorted by index
+        """
+
+        results = []
+        counter = collections.Counter()
+        total = 0
+        started = last_update = time.monotonic()
+
+        def write_progress(now):
+            rate = total / max(now - started, 0.001)
+            progress = (
+                f"\rProcessed {total}: {counter[bulk.OK]} ok, "
+                f"{counter[bulk.FAILED]} failed, {counter[bulk.SKIPPED]} skipped"
+            )
+            if counter[bulk.BLOCKED]:
+                progress += f", {counter[bulk.BLOCKED]} blocked"
+            progress += f" ({rate:.1f} items/s)"
+            if describe is not None:
+                progress += f" {describe()}"
+            self.app.stderr.write(progress)
+
+        for result in results_iter:
+            total += 1
+            counter[result.status] += 1
+            if keep is None or keep(result):
+                results.append(result)
+            now = time.monotonic()
+            if now - last_update >= self.progress_interval or total == 1:
+                write_progress(now)
+                last_update = now
+        if total:
+            now = time.monotonic()
+            write_progress(now)
+            self.app.stderr.write(f"\nFinished in {now - started:.1f}s.\n")
+        results.sort(key=lambda r: r.index)
+        return results
+
+    @staticmethod
+    def format_bulk_results(results, get_id, get_detail=None):
+        """Converts results into rows of the bulk_columns table.
+
+        :param results: List of bulk.Result entries
+        :param get_id: Callable returning identifier of the processed item
+        :param get_detail: Callable returning details of a successful
+                           result from its value
+        """
+
+        return [
+            [
+                get_id(r.item),
+                r.status,
+                get_detail(r.value)
+                if get_detail is not None and r.status == bulk.OK
+                else r.detail,
+            ]
+            for r in results
+        ]
+
+
+class StdoutOutputMixIn:
+    """Writes the table to stderr when records are streamed to stdout.
+
+    For commands whose '--output' argument accepts '-' for stdout, so the
+    stream of records is not mixed with the table.
+    """
+
+    def produce_output(self, parsed_args, column_names, data):
+        if parsed_args.output != "-":
+            return super().produce_output(parsed_args, column_names, data)
+        stdout = self.app.stdout
+        self.app.stdout = self.app.stderr
+        try:
+            return super().produce_output(parsed_args, column_names, data)
+        finally:
+            self.app.stdout = stdout
@@ -1,9 +1,35 @@
 import abc
 import argparse
+import operator
+import os
 
-from gerritclient import error
+from cliff.formatters import base as base_formatters
+
+from gerritclient import client, error
 from gerritclient.commands import base
-from gerritclient.common import utils
+from gerritclient.common import (
+    attention,
+    bulk,
+    cherrypick,
+    comments,
+    consistency,
+    export,
+    graph,
+    index,
+    latency,
+    messages,
+    patches,
+    rebase,
+    reindex,
+    relations,
+    review,
+    reviewers,
+    snapshot,
+    submit,
+    tagging,
+    utils,
+    workload,
+)
 
 
 class ChangeMixIn:
@@ -121,6 +147,186 @@ class ChangeList(ChangeMixIn, base.BaseListCommand):
         return fetched_columns, data
 
 
+class ChangeLocalIndexSync(ChangeMixIn, base.BaseCommand):
+    """Synchronizes the local index of changes matching the query.
+
+    The first run fetches all changes, the following ones fetch only the
+    changes updated since the previous run, as well as the indexed open
+    changes, which may not match the query any more (e.g. 'status:open'
+    changes merged since then). An index is bound to the query it was
+    built for, use --full to rebuild it for another query.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument("query", help="Query of the changes to be indexed.")
+        parser.add_argument(
+            "--database",
+            default=index.DEFAULT_PATH,
+            help=f"Path to the index database. Defaults to {index.DEFAULT_PATH}.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Fetch all changes again, dropping the indexed ones.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=500,
+            help="Number of changes fetched per request. Defaults to 500.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        with index.ChangeIndex(parsed_args.database) as change_index:
+            count = change_index.sync(
+                self.client,
+                parsed_args.query,
+                full=parsed_args.full,
+                page_size=parsed_args.page_size,
+            )
+            total = change_index.count()
+        self.app.stdout.write(
+            f"Fetched {count} changes, the index contains {total} changes.\n"
+        )
+
+
+class ChangeLocalIndexQuery(ChangeMixIn, base.BaseListCommand):
+    """Queries changes in the local index.
+
+    Supports the status, is, project, projects, branch, owner, topic,
+    hashtag and age operators, combined with AND, OR, negation and
+    parentheses.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument("query", nargs="+", help="Query string.")
+        parser.add_argument(
+            "--database",
+            default=index.DEFAULT_PATH,
+            help=f"Path to the index database. Defaults to {index.DEFAULT_PATH}.",
+        )
+        parser.add_argument(
+            "-l",
+            "--limit",
+            type=int,
+            help="Limit the number of changes to be included in the results.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        if not os.path.exists(parsed_args.database):
+            raise error.BadDataException(
+                f"Index {parsed_args.database} does not exist, "
+                "run 'gerrit change local-index sync' first."
+            )
+        with index.ChangeIndex(parsed_args.database) as change_index:
+            response = change_index.query(
+                " ".join(parsed_args.query), limit=parsed_args.limit
+            )
+        fetched_columns = [c for c in self.columns if response and c in response[0]]
+        data = utils.get_display_data_multi(fetched_columns, response)
+        return fetched_columns, data
+
+
+class ChangeExport(ChangeMixIn, base.BaseCommand):
+    """Exports changes matching the query to a JSON Lines or Parquet file.
+
+    Changes are fetched page by page and written as they arrive, so
+    memory usage does not depend on the number of changes. Nested fields
+    are flattened according to a schema: a JSON or YAML file with
+    a mapping of column names to dotted paths (e.g. 'owner.email').
+    Parquet export requires the 'pyarrow' package.
+    """
+
+    @staticmethod
+    def get_file_path(file_path):
+        if not utils.file_exists(file_path):
+            raise argparse.ArgumentTypeError(f"File '{file_path}' does not exist")
+        return file_path
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument("query", help="Query string.")
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Output file, '-' for stdout. Format and compression are "
+            "guessed by the extension (.parquet, .gz, .bz2, .xz).",
+        )
+        parser.add_argument(
+            "--format",
+            choices=export.SUPPORTED_FORMATS,
+            help="Output format, overrides the file extension.",
+        )
+        parser.add_argument(
+            "--compress",
+            choices=sorted(export.COMPRESSORS),
+            help="Compression of JSON Lines, overrides the file extension.",
+        )
+        schema = parser.add_mutually_exclusive_group()
+        schema.add_argument(
+            "--schema",
+            type=self.get_file_path,
+            help="File with the flattening schema.",
+        )
+        schema.add_argument(
+            "--raw",
+            action="store_true",
+            help="Write changes as they are, without flattening (JSON Lines only).",
+        )
+        parser.add_argument(
+            "-o", "--option", nargs="+", help="Fetch additional data about changes."
+        )
+        parser.add_argument(
+            "-l",
+            "--limit",
+            type=int,
+            help="Limit the number of changes to be exported.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=500,
+            help="Number of changes fetched per request. Defaults to 500.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        data_format = parsed_args.format or export.get_format(parsed_args.output)
+        if parsed_args.raw and data_format != export.JSONL:
+            raise error.BadDataException("Raw export is supported for JSON Lines only.")
+        schema = (
+            export.load_schema(parsed_args.schema)
+            if parsed_args.schema
+            else export.CHANGE_SCHEMA
+        )
+        changes = self.client.iter_all(
+            parsed_args.query,
+            options=parsed_args.option,
+            limit=parsed_args.limit,
+            page_size=parsed_args.page_size,
+        )
+        with export.get_writer(
+            parsed_args.output,
+            data_format=data_format,
+            compression=parsed_args.compress,
+            columns=list(schema),
+            types=export.get_types(schema),
+        ) as writer:
+            for change in changes:
+                writer.write(
+                    change if parsed_args.raw else export.flatten(change, schema)
+                )
+                if writer.count % 1000 == 0:
+                    self.app.stderr.write(f"\rExported {writer.count} changes")
+        self.app.stderr.write(
+            f"\rExported {writer.count} changes to {parsed_args.output}.\n"
+        )
+
+
 class ChangeShow(ChangeMixIn, base.BaseShowCommand):
     """Retrieves a change."""
 
@@ -198,8 +404,23 @@ class ChangeCreate(ChangeMixIn, base.BaseCommand, base.show.ShowOne):
         return self.columns, data
 
 
-class BaseChangeAction(ChangeMixIn, base.BaseShowCommand, abc.ABC):
-    """Base class to perform actions on changes."""
+class BaseChangeAction(base.BaseBulkMixIn, ChangeMixIn, base.BaseShowCommand, abc.ABC):
+    """Base class to perform actions on changes.
+
+    Instead of a single change the action can be applied to all changes
+    matching a query. In that case changes are processed concurrently
+    and a table with the result for every change is displayed.
+    """
+
+    # Whether the action can be applied to changes matching a query
+    supports_query = True
+
+    # Statuses of changes the action is applicable to, None means any status
+    applicable_statuses = None
+
+    @property
+    def entity_id_nargs(self):
+        return "?" if self.supports_query else None
 
     @property
     def parameters(self):
@@ -211,18 +432,131 @@ class BaseChangeAction(ChangeMixIn, base.BaseShowCommand, abc.ABC):
     def action(self, change_id, **kwargs):
         pass
 
+    def get_parser(self, app_name):
+        parser = super().get_parser(app_name)
+        if self.supports_query:
+            parser.add_argument(
+                "--query",
+                help="Apply the action to all changes matching the query "
+                "instead of a single change.",
+            )
+            self.add_bulk_arguments(parser)
+        return parser
+
+    def get_skip_reason(self, change):
+        """Returns the reason to skip the change or None."""
+
+        status = change.get("status")
+        if self.applicable_statuses and status not in self.applicable_statuses:
+            return f"Change status is {status}."
+        return None
+
+    def take_bulk_action(self, parsed_args, params):
+        # Resolve all matching changes before applying the action, as the
+        # action may affect the query results and break the pagination
+        changes = list(self.client.iter_all(parsed_args.query))
+        results = self.run_bulk(
+            lambda change: self.action(change["id"], **params),
+            changes,
+            parsed_args,
+            skip=self.get_skip_reason,
+        )
+        data = self.format_bulk_results(results, operator.itemgetter("id"))
+        return self.bulk_columns, data
+
     def take_action(self, parsed_args):
         # Retrieve necessary parameters from argparse.Namespace object
         params = {k: v for k, v in vars(parsed_args).items() if k in self.parameters}
+        if getattr(parsed_args, "query", None):
+            if parsed_args.entity_id is not None:
+                raise error.BadDataException(
+                    "Change identifier and --query are mutually exclusive."
+                )
+            return self.take_bulk_action(parsed_args, params)
+        if parsed_args.entity_id is None:
+            raise error.BadDataException(
+                "Either change identifier or --query must be specified."
+            )
         response = self.action(parsed_args.entity_id, **params)
         fetched_columns = [c for c in self.columns if c in response]
         data = utils.get_display_data_single(fetched_columns, response)
         return fetched_columns, data
 
+    def produce_output(self, parsed_args, column_names, data):
+        if not getattr(parsed_args, "query", None):
+            return super().produce_output(parsed_args, column_names, data)
+        # Results of a bulk action are a table rather than a single entity
+        if not isinstance(self.formatter, base_formatters.ListFormatter):
+            raise error.BadDataException(
+                f"Output format '{parsed_args.formatter}' is not supported "
+                "with --query."
+            )
+        self.formatter.emit_list(column_names, data, self.app.stdout, parsed_args)
+        return 0
+
+
+class BaseChangeBulkCommand(
+    base.BaseBulkMixIn, ChangeMixIn, base.BaseCommand, base.lister.Lister, abc.ABC
+):
+    """Base class to process many changes concurrently.
+
+    Changes are given either as a list of identifiers or as a query.
+    """
+
+    # Options to be passed to the query, e.g. to fetch the data needed
+    # to skip no-op changes without extra requests
+    query_options = None
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "change_id",
+            metavar="change-identifier",
+            nargs="*",
+            help="Change identifier(s).",
+        )
+        parser.add_argument("--query", help="Process all changes matching the query.")
+        self.add_bulk_arguments(parser)
+        return parser
+
+    @staticmethod
+    def format_added_removed(value):
+        """Formats a tuple of (added, removed) lists as a result detail."""
+
+        added, removed = value
+        return "; ".join(
+            "{}: {}".format(action, ", ".join(map(str, items)))
+            for action, items in (("Added", added), ("Removed", removed))
+            if items
+        )
+
+    def get_changes(self, parsed_args, lazy=False):
+        """Returns changes to be processed as ChangeInfo entities.
+
+        Changes given by identifiers have only the 'id' field.
+
+        :param lazy: If True, query results are fetched page by page while
+                     being consumed. Safe only if processing does not
+                     affect the query results.
+        """
+
+        if bool(parsed_args.query) == bool(parsed_args.change_id):
+            raise error.BadDataException(
+                "Either change identifiers or --query must be specified."
+            )
+        if parsed_args.change_id:
+            return [{"id": change_id} for change_id in parsed_args.change_id]
+        changes = self.client.iter_all(parsed_args.query, options=self.query_options)
+        # Otherwise resolve all changes first, as processing may affect
+        # the query results and break the pagination
+        return changes if lazy else list(changes)
+
 
 class ChangeAbandon(BaseChangeAction):
     """Abandons a change."""
 
+    applicable_statuses = ("NEW",)
+
     def action(self, change_id, **kwargs):
         return self.client.abandon(change_id)
 
@@ -230,6 +564,8 @@ class ChangeAbandon(BaseChangeAction):
 class ChangeRestore(BaseChangeAction):
     """Restores a change."""
 
+    applicable_statuses = ("ABANDONED",)
+
     def action(self, change_id, **kwargs):
         return self.client.restore(change_id)
 
@@ -237,6 +573,7 @@ class ChangeRestore(BaseChangeAction):
 class ChangeRevert(BaseChangeAction):
     """Reverts a change."""
 
+    applicable_statuses = ("MERGED",)
     parameters = ("message",)
 
     def get_parser(self, app_name):
@@ -255,6 +592,7 @@ class ChangeRevert(BaseChangeAction):
 class ChangeMove(BaseChangeAction):
     """Moves a change."""
 
+    applicable_statuses = ("NEW",)
     parameters = ("branch", "message")
 
     def get_parser(self, app_name):
@@ -272,6 +610,7 @@ class ChangeMove(BaseChangeAction):
 class ChangeSubmit(BaseChangeAction):
     """Submits a change."""
 
+    applicable_statuses = ("NEW",)
     parameters = ("on_behalf_of", "notify")
 
     def get_parser(self, app_name):
@@ -292,9 +631,86 @@ class ChangeSubmit(BaseChangeAction):
         return self.client.submit(change_id, on_behalf_of=on_behalf_of, notify=notify)
 
 
+class ChangeBulkSubmit(BaseChangeBulkCommand):
+    """Submits many changes in the order of their dependencies.
+
+    Changes are ordered using related changes and the changes that would be
+    submitted together. Independent chains are submitted concurrently and
+    dependent changes one after another. If a submit fails, the changes
+    that depend on it are not submitted.
+    """
+
+    query_options = ("CURRENT_REVISION",)
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--on-behalf-of", help="Submit the changes on behalf of the given user."
+        )
+        parser.add_argument(
+            "--notify",
+            choices=["NONE", "OWNER", "OWNER_REVIEWERS", "ALL"],
+            default="ALL",
+            help="Notify handling that defines to whom email notifications "
+            "should be sent after the changes are submitted.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show the submission order without submitting the changes.",
+        )
+        return parser
+
+    @staticmethod
+    def get_plan_detail(train, number):
+        parents = sorted(train.dependencies[number])
+        detail = []
+        if parents:
+            detail.append("After: {}".format(", ".join(map(str, parents))))
+        if len(train.groups[number]) > 1:
+            detail.append(
+                "Together with: {}".format(
+                    ", ".join(map(str, train.groups[number][1:]))
+                )
+            )
+        return "; ".join(detail) or None
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args)
+        train = submit.SubmitTrain(
+            self.client,
+            on_behalf_of=parsed_args.on_behalf_of,
+            notify=parsed_args.notify,
+        )
+        retry_policy = bulk.RetryPolicy(retries=parsed_args.retries)
+        train.plan(changes, max_workers=parsed_args.parallel, retry_policy=retry_policy)
+
+        if parsed_args.dry_run:
+            order = graph.topological_sort(train.dependencies)
+            data = [
+                [number, "planned", self.get_plan_detail(train, number)]
+                for number in order
+            ]
+            return self.bulk_columns, data
+
+        results = self.collect_bulk_results(
+            train.run(max_workers=parsed_args.parallel, retry_policy=retry_policy)
+        )
+        data = []
+        for number, status, detail in self.format_bulk_results(
+            results, lambda number: number, lambda _: None
+        ):
+            data.append([number, status, detail])
+            if status == bulk.OK:
+                detail = f"Submitted together with {number}."
+            data.extend([other, status, detail] for other in train.groups[number][1:])
+        return self.bulk_columns, data
+
+
 class ChangeRebase(BaseChangeAction):
     """Rebases a change."""
 
+    applicable_statuses = ("NEW",)
     parameters = ("parent",)
 
     def get_parser(self, app_name):
@@ -306,6 +722,65 @@ class ChangeRebase(BaseChangeAction):
         return self.client.rebase(change_id, parent=parent)
 
 
+class ChangeBulkRebase(BaseChangeBulkCommand):
+    """Rebases many changes, respecting their relation chains.
+
+    Every chain is rebased from its root to its tip, independent chains
+    are rebased concurrently. A conflict only stops the changes that
+    depend on the conflicting one.
+    """
+
+    columns = ("id", "chain", "status", "detail")
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show the chains and the rebase order without rebasing.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args)
+        rebaser = rebase.ChainRebaser(self.client)
+        retry_policy = bulk.RetryPolicy(retries=parsed_args.retries)
+        rebaser.plan(
+            changes, max_workers=parsed_args.parallel, retry_policy=retry_policy
+        )
+
+        if parsed_args.dry_run:
+            order = graph.topological_sort(rebaser.dependencies)
+            rows = [
+                [
+                    number,
+                    "planned",
+                    "After: {}".format(
+                        ", ".join(map(str, sorted(rebaser.dependencies[number])))
+                    )
+                    if rebaser.dependencies[number]
+                    else None,
+                    index,
+                ]
+                for index, number in enumerate(order)
+            ]
+        else:
+            results = self.collect_bulk_results(
+                rebaser.run(max_workers=parsed_args.parallel, retry_policy=retry_policy)
+            )
+            rows = [[r.item, r.status, r.detail, r.index] for r in results]
+
+        # Group rows by chains, keeping the rebase order inside of a chain
+        data = sorted(
+            (
+                [number, rebaser.get_chain_root(number), status, detail, index]
+                for number, status, detail, index in rows
+            ),
+            key=operator.itemgetter(1, 4),
+        )
+        return self.columns, [row[:4] for row in data]
+
+
 class ChangeDelete(ChangeMixIn, base.BaseCommand):
     """Deletes a change."""
 
@@ -363,9 +838,51 @@ class ChangeTopicDelete(ChangeMixIn, base.BaseShowCommand):
         return self.columns, data
 
 
+class ChangeBulkTopicSet(BaseChangeBulkCommand):
+    """Sets the topic of many changes concurrently.
+
+    Changes that already have the topic are skipped.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument("-t", "--topic", required=True, help="Topic of a change.")
+        return parser
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args)
+        updater = tagging.TopicUpdater(self.client, parsed_args.topic)
+        results = self.run_bulk(updater.apply, changes, parsed_args)
+        data = self.format_bulk_results(
+            results,
+            operator.itemgetter("id"),
+            lambda previous: f"Previous topic: '{previous}'." if previous else None,
+        )
+        return self.bulk_columns, data
+
+
+class ChangeBulkTopicDelete(BaseChangeBulkCommand):
+    """Deletes the topic of many changes concurrently.
+
+    Changes without a topic are skipped.
+    """
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args)
+        updater = tagging.TopicUpdater(self.client)
+        results = self.run_bulk(updater.apply, changes, parsed_args)
+        data = self.format_bulk_results(
+            results,
+            operator.itemgetter("id"),
+            lambda previous: f"Previous topic: '{previous}'.",
+        )
+        return self.bulk_columns, data
+
+
 class ChangeAssigneeShow(BaseChangeAction):
     """Retrieves the account of the user assigned to a change."""
 
+    supports_query = False
     columns = ("_account_id", "name", "email", "username")
 
     def action(self, change_id, **kwargs):
@@ -440,6 +957,7 @@ class ChangeDraftPublish(ChangeMixIn, base.BaseCommand):
 class ChangeIncludedInSHow(BaseChangeAction):
     """Retrieves the branches and tags in which a change is included."""
 
+    supports_query = False
     columns = ("branches", "tags", "external")
 
     def action(self, change_id, **kwargs):
@@ -465,6 +983,103 @@ class ChangeIndex(ChangeMixIn, base.BaseCommand):
         self.app.stdout.write(msg)
 
 
+class ChangeBulkIndex(BaseChangeBulkCommand):
+    """Adds or updates many changes in the secondary index.
+
+    Changes are given by identifiers, a query or a file with one change
+    identifier per line. The number of concurrent requests adapts to the
+    server latency: it grows while the server responds steadily and backs
+    off when the latency rises. Only failed changes are shown.
+    """
+
+    @staticmethod
+    def get_file_path(file_path):
+        if not utils.file_exists(file_path):
+            raise argparse.ArgumentTypeError(f"File '{file_path}' does not exist")
+        return file_path
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--file",
+            type=self.get_file_path,
+            help="File with change identifiers, one per line.",
+        )
+        parser.add_argument(
+            "--resume",
+            metavar="JOURNAL",
+            help="File to record reindexed changes in. Changes already "
+            "recorded in the file are not reindexed again.",
+        )
+        parser.add_argument(
+            "--max-parallel",
+            type=int,
+            help="Upper limit of concurrent requests. "
+            "Defaults to four times the --parallel value.",
+        )
+        return parser
+
+    def get_change_ids(self, parsed_args):
+        sources = [
+            source
+            for source in (parsed_args.change_id, parsed_args.query, parsed_args.file)
+            if source
+        ]
+        if len(sources) != 1:
+            raise error.BadDataException(
+                "Exactly one of change identifiers, --query or --file "
+                "must be specified."
+            )
+        if parsed_args.file:
+            return reindex.read_change_ids(parsed_args.file)
+        if parsed_args.query:
+            # Reindexing does not affect the query results, so changes can
+            # be streamed page by page
+            return (change["id"] for change in self.client.iter_all(parsed_args.query))
+        return iter(parsed_args.change_id)
+
+    def take_action(self, parsed_args):
+        change_ids = self.get_change_ids(parsed_args)
+        limiter = bulk.AdaptiveLimiter(
+            initial=parsed_args.parallel,
+            maximum=max(
+                parsed_args.parallel,
+                parsed_args.max_parallel or parsed_args.parallel * 4,
+            ),
+        )
+
+        journal = None
+        if parsed_args.resume:
+            journal = reindex.ResumeJournal(parsed_args.resume)
+            done = journal.load()
+            if done:
+                self.app.stderr.write(
+                    f"Resuming: {len(done)} changes were already reindexed.\n"
+                )
+                change_ids = (c for c in change_ids if c not in done)
+
+        def index(change_id):
+            self.client.index(change_id)
+            if journal is not None:
+                journal.record(change_id)
+
+        def describe():
+            latency = limiter.latency * 1000 if limiter.latency is not None else 0
+            return f"[concurrency {limiter.limit}, latency {latency:.0f} ms]"
+
+        results = self.collect_bulk_results(
+            bulk.run_adaptive(
+                index,
+                change_ids,
+                limiter,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            ),
+            keep=lambda r: r.status != bulk.OK,
+            describe=describe,
+        )
+        return self.bulk_columns, self.format_bulk_results(results, str)
+
+
 class ChangeCommentList(ChangeCommentMixIn, base.BaseListCommand):
     """Lists the published comments of all revisions of the change."""
 
@@ -492,6 +1107,83 @@ class ChangeCommentList(ChangeCommentMixIn, base.BaseListCommand):
         return fetched_columns, data
 
 
+class ChangeBulkCommentExport(base.StdoutOutputMixIn, BaseChangeBulkCommand):
+    """Exports comments of many changes as flat records.
+
+    Comments of the requested types are fetched concurrently and written
+    to a JSON Lines (optionally compressed) or Parquet file as soon as they
+    arrive. Every record carries the change, patch set, file and line of
+    the comment. Only changes whose comments could not be fetched are
+    shown, on stderr if the records are written to stdout.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "-t",
+            "--type",
+            action="append",
+            choices=list(comments.COMMENT_TYPES),
+            help="The type of comments, can be specified multiple times. "
+            "Defaults to published.",
+        )
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Output file, '-' for stdout. Format and compression are "
+            "guessed by the extension (.parquet, .gz, .bz2, .xz).",
+        )
+        # -f/--format is taken by the formatter of failures
+        parser.add_argument(
+            "--output-format",
+            choices=export.SUPPORTED_FORMATS,
+            help="Output file format, overrides the file extension.",
+        )
+        parser.add_argument(
+            "--compress",
+            choices=sorted(export.COMPRESSORS),
+            help="Compression of JSON Lines, overrides the file extension.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        # Fetching comments does not affect the query results
+        changes = self.get_changes(parsed_args, lazy=True)
+        harvester = comments.CommentHarvester(self.client, parsed_args.type)
+        with export.get_writer(
+            parsed_args.output,
+            data_format=parsed_args.output_format,
+            compression=parsed_args.compress,
+            columns=comments.RECORD_FIELDS,
+            types=comments.RECORD_TYPES,
+        ) as writer:
+
+            def write_records(results):
+                for result in results:
+                    if result.status == bulk.OK:
+                        for record in result.value:
+                            writer.write(record)
+                    yield result
+
+            results = self.collect_bulk_results(
+                write_records(
+                    harvester.harvest(
+                        (change["id"] for change in changes),
+                        max_workers=parsed_args.parallel,
+                        retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+                    )
+                ),
+                keep=lambda r: r.status != bulk.OK,
+                describe=lambda: f"[{writer.count} comments]",
+            )
+        self.app.stderr.write(
+            f"Exported {writer.count} comments to {parsed_args.output}.\n"
+        )
+        return self.bulk_columns, self.format_bulk_results(
+            results, lambda item: f"{item[0]} ({item[1]})"
+        )
+
+
 class ChangeCheck(ChangeMixIn, base.BaseShowCommand):
     """Performs consistency checks on the change.
 
@@ -541,34 +1233,336 @@ class ChangeFix(ChangeMixIn, base.BaseShowCommand):
         return fetched_columns, data
 
 
-# Reviewer commands
-
-
-class ChangeReviewerMixIn:
-    entity_name = "change"
-
-    columns = (
-        "_account_id",
-        "name",
-        "email",
-        "username",
-        "approvals",
-    )
+class ChangeBulkCheck(BaseChangeBulkCommand):
+    """Performs consistency checks on many changes concurrently.
 
+    Shows how many changes are affected by every type of problems. With
+    --fix the summary is written to stderr first and, once confirmed (or
+    with --yes), only the affected changes are fixed and the outcome is
+    shown for each of them.
+    """
 
-class ChangeReviewerList(ChangeReviewerMixIn, base.BaseListCommand):
-    """Lists the reviewers of a change."""
+    summary_columns = ("problem", "count", "changes")
 
     def get_parser(self, prog_name):
         parser = super().get_parser(prog_name)
         parser.add_argument(
-            "change_id", metavar="change-identifier", help="Change identifier."
+            "--fix",
+            action="store_true",
+            help="Fix the problems that can be fixed automatically.",
         )
-        return parser
-
-    def take_action(self, parsed_args):
-        response = self.client.get_reviewers(parsed_args.change_id)
-        fetched_columns = [c for c in self.columns if response and c in response[0]]
+        parser.add_argument(
+            "--delete-patchset",
+            action="store_true",
+            help="Delete patch sets from the database "
+            "if they refer to missing commit options.",
+        )
+        parser.add_argument(
+            "--expect-merged-as",
+            action="store_true",
+            help="Check that the changes are merged into the destination "
+            "branch as this exact SHA-1. If not, insert a new patch set "
+            "referring to this commit.",
+        )
+        parser.add_argument(
+            "-y",
+            "--yes",
+            action="store_true",
+            help="Fix the problems without asking for confirmation.",
+        )
+        return parser
+
+    def confirm(self, count):
+        self.app.stderr.write(f"Fix {count} change(s)? [y/N] ")
+        self.app.stderr.flush()
+        answer = self.app.stdin.readline().strip().lower()
+        return answer in ("y", "yes")
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args, lazy=True)
+        sweeper = consistency.ConsistencySweeper(
+            self.client,
+            is_delete=parsed_args.delete_patchset,
+            expect_merged_as=parsed_args.expect_merged_as,
+        )
+        retry_policy = bulk.RetryPolicy(retries=parsed_args.retries)
+        # Only changes with problems (or failed checks) are kept
+        results = self.collect_bulk_results(
+            sweeper.sweep(
+                (change["id"] for change in changes),
+                max_workers=parsed_args.parallel,
+                retry_policy=retry_policy,
+            ),
+            keep=lambda r: r.status != bulk.OK or r.value,
+        )
+        affected = {r.item: r.value for r in results if r.status == bulk.OK}
+        summary = consistency.summarize(affected)
+        for r in results:
+            if r.status != bulk.OK:
+                problem = f"Check failed: {consistency.get_problem_type(r.detail)}"
+                summary.setdefault(problem, []).append(r.item)
+        data = [
+            [problem, len(change_ids), ", ".join(change_ids)]
+            for problem, change_ids in sorted(
+                summary.items(), key=lambda item: (-len(item[1]), item[0])
+            )
+        ]
+        if not parsed_args.fix:
+            return self.summary_columns, data
+
+        for problem, count, _ in data:
+            self.app.stderr.write(f"{count:>6}  {problem}\n")
+        if not affected:
+            return self.bulk_columns, []
+        if not parsed_args.yes and not self.confirm(len(affected)):
+            raise error.BadDataException("Fixing the changes is cancelled.")
+        results = self.run_bulk(sweeper.fix, sorted(affected), parsed_args)
+        data = self.format_bulk_results(
+            results,
+            str,
+            lambda problems: "; ".join(
+                f"{p.get('message')}: {p.get('status', 'NOT_FIXED')}" for p in problems
+            ),
+        )
+        return self.bulk_columns, data
+
+
+class ChangeLatencyReport(BaseChangeBulkCommand):
+    """Shows review latency percentiles of many changes.
+
+    Messages of the changes are fetched concurrently to find the first
+    review of every change (the first message of anyone but the owner,
+    ignoring autogenerated ones). Time to first review and time to merge
+    are summarized by project, owner or reviewer. Grouped by reviewer,
+    time to first review is the time until the first message of the
+    reviewer. Changes whose data could not be fetched are reported to
+    stderr and left out.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--group-by",
+            choices=latency.GROUP_BY,
+            default="project",
+            help="Summarize changes by project, owner or reviewer. "
+            "Defaults to project.",
+        )
+        parser.add_argument(
+            "-m",
+            "--metric",
+            action="append",
+            choices=latency.METRICS,
+            help="Metric to summarize, can be specified multiple times. "
+            "Defaults to all metrics.",
+        )
+        parser.add_argument(
+            "-p",
+            "--percentile",
+            action="append",
+            type=float,
+            help="Percentile to compute, can be specified multiple times. "
+            "Defaults to {}.".format(
+                ", ".join(str(p) for p in latency.DEFAULT_PERCENTILES)
+            ),
+        )
+        parser.add_argument(
+            "--unit",
+            choices=list(latency.UNITS),
+            default="hours",
+            help="Unit of the latencies. Defaults to hours.",
+        )
+        parser.add_argument(
+            "--per-change",
+            action="store_true",
+            help="Show the metrics of every change instead of percentiles.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        percentiles = parsed_args.percentile or latency.DEFAULT_PERCENTILES
+        if any(not 0 <= p <= 100 for p in percentiles):
+            raise error.BadDataException("Percentiles must be between 0 and 100.")
+        changes = self.get_changes(parsed_args, lazy=True)
+        collector = latency.LatencyCollector(self.client)
+        results = self.collect_bulk_results(
+            collector.collect(
+                changes,
+                max_workers=parsed_args.parallel,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            )
+        )
+        for result in results:
+            if result.status != bulk.OK:
+                self.app.stderr.write(f"{result.item['id']}: {result.detail}\n")
+        metrics_list = [r.value for r in results if r.status == bulk.OK]
+
+        scale = latency.UNITS[parsed_args.unit]
+        if parsed_args.per_change:
+            columns = ("number", "project", "owner", "reviewers", *latency.METRICS)
+            data = [
+                [
+                    metrics["number"],
+                    metrics["project"],
+                    metrics["owner"],
+                    len(metrics["reviewers"]),
+                    *(
+                        None if metrics[m] is None else round(metrics[m] / scale, 2)
+                        for m in latency.METRICS
+                    ),
+                ]
+                for metrics in metrics_list
+            ]
+            return columns, data
+
+        columns = (
+            parsed_args.group_by,
+            "metric",
+            "count",
+            "mean",
+            *(f"p{p:g}" for p in percentiles),
+        )
+        data = []
+        for metric in parsed_args.metric or latency.METRICS:
+            for group, *values in latency.aggregate(
+                metrics_list,
+                parsed_args.group_by,
+                metric,
+                percentiles=percentiles,
+                unit=parsed_args.unit,
+            ):
+                data.append([group, metric, *values])
+        return columns, data
+
+
+class ChangeDependencyGraph(base.StdoutOutputMixIn, BaseChangeBulkCommand):
+    """Builds the dependency graph of changes related to the given ones.
+
+    Relation chains and submitted together changes of the given changes
+    are fetched concurrently, then the same is done for every related
+    change found, until the whole graph is visited. Changes are shown in
+    topological order (parents first) with the changes they depend on,
+    on stderr if the graph is written to stdout. The graph can be saved
+    as JSON or in the DOT language of Graphviz. Relations are cached by
+    revision, so with --cache only relations of changes with new patch
+    sets are fetched again.
+    """
+
+    columns = ("order", "number", "project", "branch", "status", "subject")
+    graph_formats = ("json", "dot")
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--output",
+            help="Save the graph to the file, '-' for stdout. The format is "
+            "guessed by the extension (.json, .dot).",
+        )
+        # -f/--format is taken by the formatter of the changes
+        parser.add_argument(
+            "--output-format",
+            choices=self.graph_formats,
+            help="Format of the graph file, overrides the file extension.",
+        )
+        parser.add_argument(
+            "--cache", help="JSON file to keep relations of revisions between runs."
+        )
+        parser.add_argument(
+            "--max-changes",
+            type=int,
+            default=1000,
+            help="Stop crawling after visiting that many changes. Defaults to 1000.",
+        )
+        return parser
+
+    def get_graph_format(self, parsed_args):
+        if parsed_args.output_format:
+            return parsed_args.output_format
+        extension = os.path.splitext(parsed_args.output)[1].lower()
+        return "dot" if extension in (".dot", ".gv") else "json"
+
+    def write_graph(self, parsed_args, crawler, dependencies):
+        def dump(stream):
+            if self.get_graph_format(parsed_args) == "dot":
+                stream.write(crawler.to_dot(dependencies))
+            else:
+                utils.safe_dump("json", stream, crawler.to_json(dependencies))
+
+        if parsed_args.output == "-":
+            dump(self.app.stdout)
+        else:
+            with open(parsed_args.output, "w") as stream:
+                dump(stream)
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args, lazy=True)
+        cache = relations.EdgeCache(parsed_args.cache)
+        crawler = relations.RelationCrawler(
+            self.client, cache=cache, max_changes=parsed_args.max_changes
+        )
+        try:
+            dependencies = crawler.crawl(
+                (change["id"] for change in changes),
+                max_workers=parsed_args.parallel,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            )
+        finally:
+            cache.save()
+        for change_id, reason in sorted(crawler.failures.items()):
+            self.app.stderr.write(f"{change_id}: {reason}\n")
+        if parsed_args.max_changes and len(crawler.nodes) >= parsed_args.max_changes:
+            self.app.stderr.write(
+                f"Stopped after {len(crawler.nodes)} changes, the graph may "
+                "be incomplete.\n"
+            )
+        if parsed_args.output:
+            self.write_graph(parsed_args, crawler, dependencies)
+
+        cycles = graph.find_cycles(dependencies)
+        for cycle in cycles:
+            self.app.stderr.write(f"Dependency cycle: {', '.join(map(str, cycle))}\n")
+        # Without a topological order changes are shown by number
+        order = sorted(dependencies) if cycles else graph.topological_sort(dependencies)
+        data = [
+            [
+                position,
+                number,
+                *(crawler.nodes[number].get(c) for c in self.columns[2:]),
+                ", ".join(map(str, sorted(dependencies[number]))),
+            ]
+            for position, number in enumerate(order, 1)
+        ]
+        return (*self.columns, "depends_on"), data
+
+
+# Reviewer commands
+
+
+class ChangeReviewerMixIn:
+    entity_name = "change"
+
+    columns = (
+        "_account_id",
+        "name",
+        "email",
+        "username",
+        "approvals",
+    )
+
+
+class ChangeReviewerList(ChangeReviewerMixIn, base.BaseListCommand):
+    """Lists the reviewers of a change."""
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "change_id", metavar="change-identifier", help="Change identifier."
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        response = self.client.get_reviewers(parsed_args.change_id)
+        fetched_columns = [c for c in self.columns if response and c in response[0]]
         data = utils.get_display_data_multi(fetched_columns, response)
         return fetched_columns, data
 
@@ -717,9 +1711,144 @@ class ChangeReviewerSuggest(ChangeReviewerMixIn, base.BaseListCommand):
         return fetched_columns, data
 
 
+class ChangeReviewerWorkload(ChangeMixIn, base.BaseListCommand):
+    """Shows the review workload of every reviewer.
+
+    Changes matching the query (open changes by default) are fetched page
+    by page with their reviewers, votes and attention sets and counted in
+    a single pass. For every account shows the number of changes to be
+    reviewed, pending reviews (without a vote on the current revision),
+    changes in the attention set of the account and changes voted on,
+    with the age of the oldest pending review and of the votes.
+    """
+
+    columns = workload.COLUMNS
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--query",
+            default="status:open",
+            help="Query of the changes to be counted. Defaults to status:open.",
+        )
+        parser.add_argument(
+            "--include-cc",
+            action="store_true",
+            help="Count accounts in CC as reviewers.",
+        )
+        parser.add_argument(
+            "--unit",
+            choices=list(latency.UNITS),
+            default="days",
+            help="Unit of the ages. Defaults to days.",
+        )
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=500,
+            help="Number of changes fetched per request. Defaults to 500.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        changes = self.client.iter_all(
+            parsed_args.query,
+            options=workload.QUERY_OPTIONS,
+            page_size=parsed_args.page_size,
+        )
+        report = workload.WorkloadReport(include_cc=parsed_args.include_cc)
+        report.collect(changes)
+        self.app.stderr.write(f"Counted {report.count} changes.\n")
+        return self.columns, report.get_rows(parsed_args.unit)
+
+
+class ChangeBulkReviewerAdd(BaseChangeBulkCommand):
+    """Adds reviewers to many changes concurrently.
+
+    Reviewers already present on a change are not added again, nor are
+    groups whose members are all present. By default no email
+    notifications are sent to avoid flooding the reviewers.
+    """
+
+    query_options = ("DETAILED_LABELS", "DETAILED_ACCOUNTS")
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "-r",
+            "--reviewer",
+            action="append",
+            required=True,
+            help="The ID of one account or group to add as reviewer. "
+            "Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "-s",
+            "--state",
+            choices=["REVIEWER", "CC"],
+            default="REVIEWER",
+            help="The state in which to add the reviewers (default: REVIEWER).",
+        )
+        parser.add_argument(
+            "--confirmed",
+            action="store_true",
+            help="Confirm adding the reviewers even if there are warnings.",
+        )
+        parser.add_argument(
+            "--notify",
+            choices=["NONE", "OWNER", "OWNER_REVIEWERS", "ALL"],
+            default="NONE",
+            help="Notify handling for adding the reviewers (default: NONE).",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        changes = self.get_changes(parsed_args)
+        assigner = reviewers.ReviewerAssigner(
+            self.client,
+            parsed_args.reviewer,
+            state=parsed_args.state,
+            notify=parsed_args.notify,
+            confirmed=parsed_args.confirmed if parsed_args.confirmed else None,
+            group_client=client.get_client("group", base.VERSION),
+        )
+        results = self.run_bulk(assigner.assign, changes, parsed_args)
+        data = self.format_bulk_results(
+            results,
+            operator.itemgetter("id"),
+            lambda added: "Added: {}".format(", ".join(added)),
+        )
+        return self.bulk_columns, data
+
+
 # Review (voting) command
 
 
+def parse_labels(label_args):
+    """Parses 'Label-Name=value' arguments into a dict.
+
+    :param label_args: List of label arguments or None
+    :return: A dict of label names to voting values or None
+    """
+
+    if not label_args:
+        return None
+    labels = {}
+    for label_arg in label_args:
+        if "=" not in label_arg:
+            raise error.BadDataException(
+                f"Invalid label format: '{label_arg}'. Expected 'Label-Name=value'."
+            )
+        name, value = label_arg.split("=", 1)
+        try:
+            labels[name] = int(value)
+        except ValueError:
+            raise error.BadDataException(
+                f"Invalid label value: '{value}'. Must be an integer."
+            )
+    return labels
+
+
 class ChangeReview(ChangeMixIn, base.BaseCommand, base.show.ShowOne):
     """Sets a review on a change (post votes and comments)."""
 
@@ -771,23 +1900,7 @@ class ChangeReview(ChangeMixIn, base.BaseCommand, base.show.ShowOne):
         return parser
 
     def take_action(self, parsed_args):
-        # Parse label arguments into a dict
-        labels = None
-        if parsed_args.label:
-            labels = {}
-            for label_arg in parsed_args.label:
-                if "=" not in label_arg:
-                    raise error.BadDataException(
-                        f"Invalid label format: '{label_arg}'. Expected 'Label-Name=value'."
-                    )
-                name, value = label_arg.split("=", 1)
-                try:
-                    labels[name] = int(value)
-                except ValueError:
-                    raise error.BadDataException(
-                        f"Invalid label value: '{value}'. Must be an integer."
-                    )
-
+        labels = parse_labels(parsed_args.label)
         response = self.client.set_review(
             parsed_args.change_id,
             revision_id=parsed_args.revision,
@@ -804,6 +1917,101 @@ class ChangeReview(ChangeMixIn, base.BaseCommand, base.show.ShowOne):
         return fetched_columns, data
 
 
+class ChangeBulkReview(
+    base.BaseBulkMixIn, ChangeMixIn, base.BaseCommand, base.lister.Lister
+):
+    """Sets reviews on many changes concurrently.
+
+    Reviews are read from a manifest file (JSON Lines, JSON or YAML list of
+    entries with 'change', optional 'revision' and ReviewInput fields) or
+    built from --label/--message options for all changes matching a query.
+    Options given on the command line are defaults for manifest entries.
+    Reviews whose votes are already in place are skipped.
+    """
+
+    @staticmethod
+    def get_file_path(file_path):
+        if not utils.file_exists(file_path):
+            raise argparse.ArgumentTypeError(f"File '{file_path}' does not exist")
+        return file_path
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument(
+            "--manifest",
+            type=self.get_file_path,
+            help="File with reviews to be posted (JSONL/JSON/YAML).",
+        )
+        source.add_argument(
+            "--query", help="Post the review on all changes matching the query."
+        )
+        parser.add_argument("-m", "--message", help="Review message to post.")
+        parser.add_argument(
+            "-l",
+            "--label",
+            action="append",
+            metavar="LABEL=VALUE",
+            help="Label vote in format 'Label-Name=value' (e.g., 'Verified=+1'). "
+            "Can be specified multiple times.",
+        )
+        parser.add_argument("--tag", help="Tag for the reviews.")
+        parser.add_argument(
+            "--notify",
+            choices=["NONE", "OWNER", "OWNER_REVIEWERS", "ALL"],
+            help="Notify handling for the reviews.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Post reviews even if the votes are already in place.",
+        )
+        self.add_bulk_arguments(parser)
+        return parser
+
+    def take_action(self, parsed_args):
+        defaults = {
+            k: v
+            for k, v in (
+                ("labels", parse_labels(parsed_args.label)),
+                ("message", parsed_args.message),
+                ("tag", parsed_args.tag),
+                ("notify", parsed_args.notify),
+            )
+            if v is not None
+        }
+        reviewer = review.BulkReviewer(
+            self.client,
+            client.get_client("account", base.VERSION),
+            deduplicate=not parsed_args.force,
+        )
+
+        if parsed_args.manifest:
+            try:
+                entries = review.load_manifest(parsed_args.manifest)
+            except OSError as e:
+                raise error.InvalidFileException(
+                    f"Could not read reviews at {parsed_args.manifest}. {e}"
+                )
+            items = [(dict(defaults, **entry), None) for entry in entries]
+        else:
+            if "labels" not in defaults and "message" not in defaults:
+                raise error.BadDataException(
+                    "At least one --label or --message must be specified."
+                )
+            # Detailed labels are needed to skip votes already in place.
+            # Resolve all changes first, as posted votes may affect the
+            # query results and break the pagination.
+            changes = list(
+                self.client.iter_all(parsed_args.query, options=["DETAILED_LABELS"])
+            )
+            items = [(dict(defaults, change=c["id"]), c) for c in changes]
+
+        results = self.run_bulk(lambda item: reviewer.post(*item), items, parsed_args)
+        data = self.format_bulk_results(results, lambda item: item[0]["change"])
+        return self.bulk_columns, data
+
+
 # Attention Set commands
 
 
@@ -921,6 +2129,70 @@ class ChangeAttentionSetRemove(ChangeMixIn, base.BaseCommand):
         )
 
 
+class ChangeBulkAttentionSetUpdate(BaseChangeBulkCommand):
+    """Adds and removes users from the attention set of many changes.
+
+    Attention sets are read concurrently and only the necessary add and
+    remove calls are made. By default no email notifications are sent.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--add",
+            action="append",
+            metavar="ACCOUNT",
+            help="The account identifier to add to the attention set. "
+            "Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "--remove",
+            action="append",
+            metavar="ACCOUNT",
+            help="The account identifier to remove from the attention set. "
+            "Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "--add-if-removed",
+            action="store_true",
+            help="Add accounts only to the changes where any account was "
+            "removed, e.g. to hand changes over to a delegate.",
+        )
+        parser.add_argument(
+            "-r",
+            "--reason",
+            default="Attention set update",
+            help="Reason for updating the attention set.",
+        )
+        parser.add_argument(
+            "--notify",
+            choices=["NONE", "OWNER", "OWNER_REVIEWERS", "ALL"],
+            default="NONE",
+            help="Notify handling (default: NONE).",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        if not parsed_args.add and not parsed_args.remove:
+            raise error.BadDataException(
+                "At least one of --add or --remove must be specified."
+            )
+        changes = self.get_changes(parsed_args)
+        updater = attention.AttentionSetUpdater(
+            self.client,
+            add=parsed_args.add,
+            remove=parsed_args.remove,
+            reason=parsed_args.reason,
+            notify=parsed_args.notify,
+            add_if_removed=parsed_args.add_if_removed,
+        )
+        results = self.run_bulk(
+            updater.apply, [change["id"] for change in changes], parsed_args
+        )
+        data = self.format_bulk_results(results, str, self.format_added_removed)
+        return self.bulk_columns, data
+
+
 # Work-in-Progress / Ready-for-Review commands
 
 
@@ -1023,6 +2295,45 @@ class ChangeHashtagsSet(ChangeMixIn, base.BaseCommand, base.lister.Lister):
         return self.columns, data
 
 
+class ChangeBulkHashtagsSet(BaseChangeBulkCommand):
+    """Adds and/or removes hashtags from many changes concurrently.
+
+    Only the hashtags that differ from the current state of a change are
+    sent, changes that are already up to date are skipped.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--add",
+            action="append",
+            metavar="HASHTAG",
+            help="Hashtag to add. Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "--remove",
+            action="append",
+            metavar="HASHTAG",
+            help="Hashtag to remove. Can be specified multiple times.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        if not parsed_args.add and not parsed_args.remove:
+            raise error.BadDataException(
+                "At least one of --add or --remove must be specified."
+            )
+        changes = self.get_changes(parsed_args)
+        updater = tagging.HashtagsUpdater(
+            self.client, add=parsed_args.add, remove=parsed_args.remove
+        )
+        results = self.run_bulk(updater.apply, changes, parsed_args)
+        data = self.format_bulk_results(
+            results, operator.itemgetter("id"), self.format_added_removed
+        )
+        return self.bulk_columns, data
+
+
 # Change Messages commands
 
 
@@ -1057,6 +2368,83 @@ class ChangeMessageList(ChangeMessageMixIn, base.BaseListCommand):
         return fetched_columns, data
 
 
+class ChangeBulkMessageExport(base.StdoutOutputMixIn, BaseChangeBulkCommand):
+    """Exports messages of many changes as one stream ordered by date.
+
+    Messages are fetched concurrently and merged by their timestamps into
+    a JSON Lines (optionally compressed) or Parquet file. Messages of all
+    changes have to be fetched before the first one is written, so they
+    are sorted and spilled to temporary files in runs of --run-size
+    messages, which are merged at the end. Only changes whose messages
+    could not be fetched are shown, on stderr if the messages are written
+    to stdout.
+    """
+
+    @staticmethod
+    def get_run_size(value):
+        run_size = int(value)
+        if run_size <= 0:
+            raise argparse.ArgumentTypeError("Run size must be greater than 0")
+        return run_size
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Output file, '-' for stdout. Format and compression are "
+            "guessed by the extension (.parquet, .gz, .bz2, .xz).",
+        )
+        # -f/--format is taken by the formatter of failures
+        parser.add_argument(
+            "--output-format",
+            choices=export.SUPPORTED_FORMATS,
+            help="Output file format, overrides the file extension.",
+        )
+        parser.add_argument(
+            "--compress",
+            choices=sorted(export.COMPRESSORS),
+            help="Compression of JSON Lines, overrides the file extension.",
+        )
+        parser.add_argument(
+            "--run-size",
+            type=self.get_run_size,
+            default=messages.DEFAULT_RUN_SIZE,
+            help="Number of messages kept in memory before they are spilled "
+            f"to disk. Defaults to {messages.DEFAULT_RUN_SIZE}.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        # Fetching messages does not affect the query results
+        changes = self.get_changes(parsed_args, lazy=True)
+        with messages.MessageStream(self.client, parsed_args.run_size) as stream:
+            results = self.collect_bulk_results(
+                stream.collect(
+                    changes,
+                    max_workers=parsed_args.parallel,
+                    retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+                ),
+                keep=lambda r: r.status != bulk.OK,
+                describe=lambda: f"[{stream.count} messages]",
+            )
+            with export.get_writer(
+                parsed_args.output,
+                data_format=parsed_args.output_format,
+                compression=parsed_args.compress,
+                columns=messages.RECORD_FIELDS,
+                types=messages.RECORD_TYPES,
+            ) as writer:
+                for record in stream.merge():
+                    writer.write(record)
+        self.app.stderr.write(
+            f"Exported {writer.count} messages to {parsed_args.output}.\n"
+        )
+        return self.bulk_columns, self.format_bulk_results(
+            results, lambda change: change["id"]
+        )
+
+
 class ChangeMessageShow(ChangeMessageMixIn, base.BaseShowCommand):
     """Retrieves a change message."""
 
@@ -1166,6 +2554,207 @@ class ChangeRevisionFileList(RevisionFileMixIn, base.BaseListCommand):
         return fetched_columns, data
 
 
+class ChangeRevisionDiffBundle(base.BaseBulkMixIn, ChangeMixIn, base.BaseCommand):
+    """Writes diffs of all files of a revision to a JSON Lines file.
+
+    Diffs are fetched concurrently and written as soon as they arrive, one
+    line per file with the FileInfo fields, the 'path' and the 'diff'
+    (DiffInfo entity).
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "change_id", metavar="change-identifier", help="Change identifier."
+        )
+        parser.add_argument(
+            "-r",
+            "--revision",
+            default="current",
+            help="Revision (patchset) identifier. Defaults to 'current'.",
+        )
+        parser.add_argument(
+            "--base", type=int, help="Patchset number to compare against."
+        )
+        parser.add_argument(
+            "--parent",
+            type=int,
+            help="For merge commits, the parent number to compare against.",
+        )
+        parser.add_argument(
+            "--context", type=int, help="Number of context lines to include."
+        )
+        parser.add_argument(
+            "--intraline",
+            action="store_true",
+            help="Include intraline differences.",
+        )
+        parser.add_argument(
+            "--whitespace",
+            choices=[
+                "IGNORE_NONE",
+                "IGNORE_TRAILING",
+                "IGNORE_LEADING_AND_TRAILING",
+                "IGNORE_ALL",
+            ],
+            help="Whitespace handling.",
+        )
+        parser.add_argument(
+            "--skip-binary", action="store_true", help="Skip binary files."
+        )
+        parser.add_argument(
+            "--skip-generated",
+            action="store_true",
+            help="Skip generated files (lock files, minified and protobuf "
+            "sources, ...).",
+        )
+        parser.add_argument(
+            "--generated",
+            action="append",
+            metavar="PATTERN",
+            help="Glob pattern of generated files, can be specified multiple "
+            "times. Replaces the default patterns.",
+        )
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Output file, '-' for stdout. Compression is guessed by the "
+            "extension (.gz, .bz2, .xz).",
+        )
+        parser.add_argument(
+            "--compress",
+            choices=sorted(export.COMPRESSORS),
+            help="Compression of the output, overrides the file extension.",
+        )
+        self.add_bulk_arguments(parser)
+        return parser
+
+    def take_action(self, parsed_args):
+        records = self.client.get_revision_diff_bundle(
+            parsed_args.change_id,
+            revision_id=parsed_args.revision,
+            base=parsed_args.base,
+            parent=parsed_args.parent,
+            skip_binary=parsed_args.skip_binary,
+            skip_generated=parsed_args.skip_generated or bool(parsed_args.generated),
+            generated_patterns=parsed_args.generated,
+            max_workers=parsed_args.parallel,
+            retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            context=parsed_args.context,
+            intraline=parsed_args.intraline if parsed_args.intraline else None,
+            whitespace=parsed_args.whitespace,
+        )
+        with export.JsonLinesWriter(
+            parsed_args.output,
+            compression=parsed_args.compress
+            or export.get_compression(parsed_args.output),
+        ) as writer:
+            for record in records:
+                writer.write(record)
+        self.app.stderr.write(
+            f"Wrote diffs of {writer.count} files to {parsed_args.output}.\n"
+        )
+
+
+class ChangeRevisionSnapshot(
+    base.BaseBulkMixIn, ChangeMixIn, base.BaseCommand, base.lister.Lister
+):
+    """Downloads the tree of a revision into a directory.
+
+    The whole tree is extracted from the archive of the revision, streamed
+    by one request. With --modified-only just the files modified by the
+    revision are downloaded concurrently instead, deleted files are left
+    out. Submodules are skipped, modes of executable files and symbolic
+    links are preserved. Sizes and hashes of the written files are kept in
+    a manifest in the directory, so running the command again writes only
+    missing or changed files. Only the files that could not be written
+    are shown.
+    """
+
+    columns = ("path", "status", "detail")
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "change_id", metavar="change-identifier", help="Change identifier."
+        )
+        parser.add_argument(
+            "-r",
+            "--revision",
+            default="current",
+            help="Revision (patchset) identifier. Defaults to 'current'.",
+        )
+        parser.add_argument(
+            "--modified-only",
+            action="store_true",
+            help="Download only the files modified by the revision.",
+        )
+        parser.add_argument(
+            "--base",
+            type=int,
+            help="With --modified-only, patchset number to compare against.",
+        )
+        parser.add_argument(
+            "--parent",
+            type=int,
+            help="With --modified-only, for merge commits, the parent number "
+            "to compare against.",
+        )
+        parser.add_argument(
+            "-d",
+            "--directory",
+            required=True,
+            help="Destination directory.",
+        )
+        self.add_bulk_arguments(parser)
+        return parser
+
+    def download_modified(self, parsed_args, revision_snapshot):
+        files = self.client.get_revision_files(
+            parsed_args.change_id,
+            revision_id=revision_snapshot.revision,
+            base=parsed_args.base,
+            parent=parsed_args.parent,
+        )
+        return revision_snapshot.run(
+            snapshot.select_files(files),
+            max_workers=parsed_args.parallel,
+            retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+        )
+
+    def take_action(self, parsed_args):
+        revision = parsed_args.revision
+        # The manifest of a snapshot is bound to an immutable revision
+        if revision == "current":
+            change = self.client.get_by_id(
+                parsed_args.change_id, options=["CURRENT_REVISION"]
+            )
+            revision = change["current_revision"]
+        if not parsed_args.modified_only and (parsed_args.base or parsed_args.parent):
+            raise error.BadDataException(
+                "--base and --parent can be used with --modified-only only."
+            )
+        revision_snapshot = snapshot.Snapshot(
+            self.client, parsed_args.change_id, parsed_args.directory, revision
+        )
+        if parsed_args.modified_only:
+            results_iter = self.download_modified(parsed_args, revision_snapshot)
+            get_path = operator.itemgetter(0)
+        else:
+            results_iter = revision_snapshot.extract(
+                self.client.iter_archive(parsed_args.change_id, revision_id=revision)
+            )
+            get_path = str
+        try:
+            results = self.collect_bulk_results(
+                results_iter, keep=lambda r: r.status == bulk.FAILED
+            )
+        finally:
+            revision_snapshot.save_manifest()
+        data = self.format_bulk_results(results, get_path)
+        return self.columns, data
+
+
 class ChangeFileDiff(ChangeMixIn, base.BaseShowCommand):
     """Gets the diff of a file from a revision."""
 
@@ -1333,6 +2922,101 @@ class ChangeCherryPick(ChangeMixIn, base.BaseShowCommand):
         return fetched_columns, data
 
 
+class ChangeBulkCherryPick(BaseChangeBulkCommand):
+    """Cherry picks changes to many destination branches concurrently.
+
+    Branches that already include a change are skipped.
+    """
+
+    columns = ("id", "branch", "status", "detail")
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "-d",
+            "--destination",
+            action="append",
+            required=True,
+            help="The destination branch. Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "-r",
+            "--revision",
+            default="current",
+            help="Revision (patchset) identifier. Defaults to 'current'.",
+        )
+        parser.add_argument(
+            "-m", "--message", help="The commit message for the cherry-picks."
+        )
+        parser.add_argument(
+            "--notify",
+            choices=["NONE", "OWNER", "OWNER_REVIEWERS", "ALL"],
+            help="Notify handling.",
+        )
+        parser.add_argument(
+            "--keep-reviewers",
+            action="store_true",
+            help="Keep the original reviewers.",
+        )
+        parser.add_argument(
+            "--allow-conflicts",
+            action="store_true",
+            help="Allow cherry-picking with conflicts.",
+        )
+        parser.add_argument(
+            "-t", "--topic", help="Topic to set on the resulting changes."
+        )
+        parser.add_argument(
+            "--hashtag",
+            action="append",
+            help="Hashtag to add to the resulting changes. "
+            "Can be specified multiple times.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Do not skip branches that already include a change.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        change_ids = [change["id"] for change in self.get_changes(parsed_args)]
+        fan_out = cherrypick.CherryPickFanOut(
+            self.client,
+            revision=parsed_args.revision,
+            message=parsed_args.message,
+            notify=parsed_args.notify,
+            keep_reviewers=parsed_args.keep_reviewers or None,
+            allow_conflicts=parsed_args.allow_conflicts or None,
+            topic=parsed_args.topic,
+            hashtags=parsed_args.hashtag,
+        )
+        if not parsed_args.force:
+            fan_out.load_included(
+                change_ids,
+                max_workers=parsed_args.parallel,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            )
+        items = [
+            (change_id, branch)
+            for change_id in change_ids
+            for branch in parsed_args.destination
+        ]
+        results = self.run_bulk(fan_out.pick, items, parsed_args)
+        data = [
+            [
+                r.item[0],
+                r.item[1],
+                r.status,
+                "Created change {}.".format(r.value["_number"])
+                if r.status == bulk.OK
+                else r.detail,
+            ]
+            for r in results
+        ]
+        return self.columns, data
+
+
 class ChangePatch(ChangeMixIn, base.BaseCommand):
     """Gets the formatted patch for a revision."""
 
@@ -1361,6 +3045,75 @@ class ChangePatch(ChangeMixIn, base.BaseCommand):
         self.app.stdout.write(str(response))
 
 
+class ChangeBulkPatchDownload(BaseChangeBulkCommand):
+    """Downloads formatted patches of many changes concurrently.
+
+    Patches are decoded while they are downloaded and written to separate
+    '<change>-<patch set>.patch' files of a directory, or to one mbox file
+    or tar archive, depending on the extension of the output path. Only
+    the changes whose patches could not be downloaded are shown.
+    """
+
+    query_options = ("CURRENT_REVISION",)
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "-r",
+            "--revision",
+            default="current",
+            help="Revision (patchset) identifier. Defaults to 'current'.",
+        )
+        parser.add_argument(
+            "--output",
+            required=True,
+            help="Output directory, mbox file (.mbox, .mbox.gz, ...) or tar "
+            "archive (.tar, .tar.gz, .tgz, ...).",
+        )
+        parser.add_argument(
+            "--archive",
+            choices=patches.ARCHIVE_FORMATS,
+            help="Output format, overrides the extension of the output path.",
+        )
+        parser.add_argument(
+            "--compress",
+            choices=sorted(export.COMPRESSORS),
+            help="Compression of an mbox file, overrides the file extension.",
+        )
+        parser.add_argument(
+            "--skip-existing",
+            action="store_true",
+            help="Skip patches whose files already exist in the output directory.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        # Downloading patches does not affect the query results
+        changes = self.get_changes(parsed_args, lazy=True)
+        with patches.get_archive(
+            parsed_args.output,
+            archive_format=parsed_args.archive,
+            compression=parsed_args.compress,
+        ) as archive:
+            downloader = patches.PatchDownloader(
+                self.client,
+                archive,
+                revision=parsed_args.revision,
+                skip_existing=parsed_args.skip_existing,
+            )
+            results = self.collect_bulk_results(
+                downloader.run(
+                    changes,
+                    max_workers=parsed_args.parallel,
+                    retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+                ),
+                keep=lambda r: r.status == bulk.FAILED,
+            )
+        return self.bulk_columns, self.format_bulk_results(
+            results, operator.itemgetter("id")
+        )
+
+
 # Submitted Together command
 
 
@@ -1,9 +1,10 @@
+import abc
 import argparse
 import os
 
 from gerritclient import error
 from gerritclient.commands import base
-from gerritclient.common import utils
+from gerritclient.common import access, bulk, configs, hierarchy, utils
 
 
 class ProjectMixIn:
@@ -462,6 +463,124 @@ class ProjectChildList(ProjectMixIn, base.BaseListCommand):
         return self.columns, data
 
 
+class BaseProjectHierarchyCommand(
+    base.BaseBulkMixIn, ProjectMixIn, base.BaseCommand, abc.ABC
+):
+    """Base class of commands working with the hierarchy of all projects.
+
+    The hierarchy is built from one listing of all projects with their
+    parents. Children of projects are fetched concurrently only if the
+    server omits some parents. With --cache the hierarchy is reused until
+    it gets older than --max-age.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--depth", type=int, help="Limit the number of levels to be shown."
+        )
+        parser.add_argument("--cache", help="JSON file to keep the hierarchy in.")
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=3600,
+            help="Maximum age of the cached hierarchy in seconds. Defaults to 3600.",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Fetch the hierarchy again, ignoring the cache.",
+        )
+        self.add_bulk_arguments(parser)
+        return parser
+
+    def get_hierarchy(self, parsed_args):
+        project_hierarchy = None
+        if parsed_args.cache and not parsed_args.refresh:
+            project_hierarchy = hierarchy.ProjectHierarchy.load(
+                parsed_args.cache, max_age=parsed_args.max_age
+            )
+        if project_hierarchy is None:
+            project_hierarchy = hierarchy.fetch(
+                self.client,
+                max_workers=parsed_args.parallel,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            )
+            if parsed_args.cache:
+                project_hierarchy.save(parsed_args.cache)
+        return project_hierarchy
+
+    @staticmethod
+    def check_project(project_hierarchy, name):
+        if name not in project_hierarchy:
+            raise error.BadDataException(f"Project '{name}' is not found.")
+
+
+class ProjectHierarchyShow(BaseProjectHierarchyCommand):
+    """Shows the inheritance tree of projects.
+
+    Shows the projects inheriting from the given project or, by default,
+    the whole forest of projects.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "name", nargs="?", help="Name of the project at the top of the tree."
+        )
+        parser.add_argument(
+            "-f",
+            "--format",
+            choices=("tree", "json"),
+            default="tree",
+            help="Output format. Defaults to tree.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        project_hierarchy = self.get_hierarchy(parsed_args)
+        if parsed_args.name:
+            self.check_project(project_hierarchy, parsed_args.name)
+            roots = [parsed_args.name]
+        else:
+            roots = project_hierarchy.get_roots()
+        if parsed_args.format == "json":
+            trees = [
+                project_hierarchy.to_dict(root, max_depth=parsed_args.depth)
+                for root in roots
+            ]
+            utils.safe_dump("json", self.app.stdout, trees)
+            self.app.stdout.write("\n")
+        else:
+            for root in roots:
+                self.app.stdout.write(
+                    project_hierarchy.render(root, max_depth=parsed_args.depth)
+                )
+
+
+class ProjectHierarchyDescendantList(BaseProjectHierarchyCommand, base.lister.Lister):
+    """Lists all projects inheriting from a project.
+
+    Unlike 'project child list --recursively', the projects are found in
+    the (possibly cached) hierarchy of all projects.
+    """
+
+    columns = ("name", "parent", "depth")
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument("name", help="Name of the project.")
+        return parser
+
+    def take_action(self, parsed_args):
+        project_hierarchy = self.get_hierarchy(parsed_args)
+        self.check_project(project_hierarchy, parsed_args.name)
+        data = list(
+            project_hierarchy.walk(parsed_args.name, max_depth=parsed_args.depth)
+        )
+        return self.columns, data
+
+
 class ProjectGCRun(ProjectMixIn, base.BaseCommand):
     """Runs the Git garbage collection for the repository of a project.
 
@@ -674,6 +793,90 @@ class ProjectConfigDownload(ProjectMixIn, base.BaseDownloadCommand):
         self.app.stdout.write(msg)
 
 
+class ProjectBulkConfigDownload(
+    base.BaseBulkMixIn, ProjectMixIn, base.BaseCommand, base.lister.Lister
+):
+    """Downloads configuration information about many projects concurrently.
+
+    Projects are given by names or glob patterns (e.g. 'tools/*'), by a
+    regex matched by the server or with --all. Every config is saved into
+    a separate file of the destination directory, named as by the
+    'project configuration download' command; projects whose names map to
+    the same file are refused. Files are replaced only when complete, files
+    whose content is unchanged are not rewritten. Only updated projects and
+    failures are shown.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "name", nargs="*", help="Names of the projects or glob patterns."
+        )
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
+            "-r", "--regex", help="Download configs of projects matching the regex."
+        )
+        group.add_argument(
+            "--all",
+            action="store_true",
+            help="Download configs of all projects, including hidden ones.",
+        )
+        # -f/--format is taken by the formatter of results
+        parser.add_argument(
+            "--file-format",
+            default="json",
+            choices=utils.SUPPORTED_FILE_FORMATS,
+            help="Format of serialization. Defaults to json.",
+        )
+        parser.add_argument(
+            "-d",
+            "--directory",
+            default=os.path.curdir,
+            help="Destination directory. Defaults to the current directory.",
+        )
+        self.add_bulk_arguments(parser)
+        return parser
+
+    def get_projects(self, parsed_args):
+        if bool(parsed_args.name) == bool(parsed_args.regex or parsed_args.all):
+            raise error.BadDataException(
+                "Either project names, --regex or --all must be specified."
+            )
+        if parsed_args.regex:
+            return sorted(
+                self.client.get_all(
+                    is_all=True, pattern_dispatcher={"regex": parsed_args.regex}
+                )
+            )
+        if parsed_args.all:
+            return sorted(self.client.get_all(is_all=True))
+        if not any(configs.is_pattern(name) for name in parsed_args.name):
+            return sorted(set(parsed_args.name))
+        return configs.select_projects(
+            self.client.get_all(is_all=True), parsed_args.name
+        )
+
+    def take_action(self, parsed_args):
+        projects = self.get_projects(parsed_args)
+        downloader = configs.ConfigDownloader(
+            self.client, parsed_args.directory, data_format=parsed_args.file_format
+        )
+        results = self.collect_bulk_results(
+            downloader.run(
+                projects,
+                max_workers=parsed_args.parallel,
+                retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+            ),
+            keep=lambda r: r.status != bulk.SKIPPED,
+        )
+        updated = sum(r.status == bulk.OK for r in results)
+        self.app.stderr.write(
+            f"Updated {updated} of {len(projects)} configs "
+            f"in {parsed_args.directory}.\n"
+        )
+        return self.bulk_columns, self.format_bulk_results(results, str)
+
+
 class ProjectConfigSet(ProjectMixIn, base.BaseCommand):
     """Sets the configuration of a project."""
 
@@ -831,6 +1034,117 @@ class ProjectAccessSet(ProjectMixIn, base.BaseShowCommand):
         return fetched_columns, data
 
 
+class ProjectAccessEffective(
+    base.BaseBulkMixIn, ProjectMixIn, base.BaseCommand, base.lister.Lister
+):
+    """Shows who has permissions on refs of projects.
+
+    Access rights of the projects and all their ancestors are fetched
+    concurrently (every project once), then effective permissions are
+    computed locally for every combination of the given projects, refs
+    and permissions, taking into account inheritance, the most specific
+    ref patterns, exclusive permissions and BLOCK rules.
+
+    For every group shows ALLOW if it has the permission, BLOCKED if it is
+    allowed but blocked and BLOCK for blocking rules. Group membership is
+    not resolved, so BLOCK rules of custom groups are applied only to the
+    same groups.
+    """
+
+    columns = (
+        "project",
+        "ref",
+        "permission",
+        "group",
+        "action",
+        "source",
+        "pattern",
+        "force",
+        "range",
+    )
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "name", nargs="+", help="Names of the projects or glob patterns."
+        )
+        parser.add_argument(
+            "--ref",
+            action="append",
+            required=True,
+            help="Ref or ref pattern like 'refs/heads/release/*', "
+            "can be specified multiple times.",
+        )
+        parser.add_argument(
+            "-p",
+            "--permission",
+            action="append",
+            required=True,
+            help="Permission like 'push' or 'label-Code-Review', "
+            "can be specified multiple times.",
+        )
+        parser.add_argument("--cache", help="JSON file to keep access rights in.")
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=3600,
+            help="Maximum age of the cached access rights in seconds. "
+            "Defaults to 3600.",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Fetch access rights again, ignoring the cache.",
+        )
+        self.add_bulk_arguments(parser)
+        return parser
+
+    @staticmethod
+    def format_range(entry):
+        if entry["min"] is None and entry["max"] is None:
+            return None
+        return f"{entry['min']}..{entry['max']}"
+
+    def take_action(self, parsed_args):
+        if any(configs.is_pattern(name) for name in parsed_args.name):
+            projects = configs.select_projects(
+                self.client.get_all(is_all=True), parsed_args.name
+            )
+        else:
+            projects = list(dict.fromkeys(parsed_args.name))
+        resolver = None
+        if parsed_args.cache and not parsed_args.refresh:
+            resolver = access.AccessResolver.load(
+                self.client, parsed_args.cache, max_age=parsed_args.max_age
+            )
+        resolver = resolver or access.AccessResolver(self.client)
+        cached = len(resolver.access)
+        resolver.fetch(
+            projects,
+            max_workers=parsed_args.parallel,
+            retry_policy=bulk.RetryPolicy(retries=parsed_args.retries),
+        )
+        if parsed_args.cache and len(resolver.access) > cached:
+            resolver.save(parsed_args.cache)
+        data = [
+            [
+                entry["queried_project"],
+                entry["ref"],
+                entry["permission"],
+                entry["group_name"],
+                entry["action"],
+                entry["project"],
+                entry["pattern"],
+                entry["force"],
+                self.format_range(entry),
+            ]
+            for entry in resolver.query(
+                projects, parsed_args.ref, parsed_args.permission
+            )
+        ]
+        return self.columns, data
+
+
 # Labels commands
 
 
@@ -0,0 +1,294 @@
+"""Effective permissions computed locally from inherited access rights.
+
+Access rights of the given projects are fetched concurrently, then those
+of their parents, level by level up to All-Projects, so every project is
+fetched once however many of the queried projects inherit from it. Once
+fetched, any number of (project, ref, permission) queries are answered
+without further requests.
+
+Evaluation follows the rules of Gerrit:
+
+* Access sections of a project and its ancestors whose ref patterns
+  match the ref are ordered from the most specific pattern to the least
+  specific one (exact refs first, then by the length of the literal
+  prefix of the pattern), child projects first for the same pattern.
+* For a ref pattern and group the first rule wins, so a child project
+  may override (e.g. DENY) what its parents allow on the same pattern.
+* Once an exclusive permission is met, ALLOW and DENY rules of the same
+  permission in less specific sections and in parent projects are
+  ignored. BLOCK rules still apply, unless they are in the same project.
+* A BLOCK rule can not be overridden by child projects, only by an ALLOW
+  rule in the same access section. BLOCK rules of Anonymous and
+  Registered Users apply to everyone.
+
+Group membership is not resolved: a BLOCK rule of a custom group is only
+applied to the same group. Ref patterns with parameters (like
+'${username}') depend on the user and never match.
+"""
+
+import json
+import os
+import re
+import time
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+ALLOW = "ALLOW"
+DENY = "DENY"
+BLOCK = "BLOCK"
+# Action of rules allowing something that is blocked elsewhere
+BLOCKED = "BLOCKED"
+
+# Groups every user is a member of
+EVERYONE = ("global:Anonymous-Users", "global:Registered-Users")
+
+REGEX_METACHARACTERS = ".*+?()[]{}|\\$^"
+
+
+def matches(pattern, ref):
+    """Checks whether the access section pattern applies to the ref.
+
+    A ref ending with '/*' stands for all refs under it and is matched
+    only by patterns covering all of them.
+    """
+
+    if "${" in pattern:
+        return False
+    if pattern.startswith("^"):
+        return re.fullmatch(pattern, ref) is not None
+    if pattern.endswith("/*"):
+        return ref.startswith(pattern[:-1])
+    return pattern == ref
+
+
+def get_specificity(pattern, ref):
+    """Returns the sort key of patterns, the most specific ones first."""
+
+    if pattern == ref:
+        return 0, 0, 0
+    if pattern.startswith("^"):
+        literal = pattern[1:]
+        for position, character in enumerate(literal):
+            if character in REGEX_METACHARACTERS:
+                literal = literal[:position]
+                break
+        return 1, -len(literal), 1
+    return 1, -len(pattern.rstrip("*")), 0
+
+
+class AccessResolver:
+    """Fetches access rights of projects and evaluates permissions."""
+
+    def __init__(self, project_client, access=None, created=None):
+        """Creates AccessResolver.
+
+        :param access: Dict of project names to ProjectAccessInfo entities
+                       fetched before (e.g. loaded from a cache)
+        :param created: Timestamp of the oldest access rights, defaults to
+                        the current time
+        """
+
+        self.project_client = project_client
+        self.access = dict(access or {})
+        self.created = time.time() if created is None else created
+
+    def get_parent(self, project):
+        return (self.access[project].get("inherits_from") or {}).get("name")
+
+    def fetch(self, projects, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Fetches access rights of the projects and all their ancestors.
+
+        :raises error.BadDataException: if access rights of a project can
+                                        not be fetched
+        """
+
+        level = sorted(self.get_missing(projects))
+        while level:
+            for result in bulk.run_concurrently(
+                self.project_client.get_access,
+                level,
+                max_workers=max_workers,
+                retry_policy=retry_policy,
+            ):
+                if result.status != bulk.OK:
+                    raise error.BadDataException(
+                        f"Unable to get access rights of {result.item}: {result.detail}"
+                    )
+                self.access[result.item] = result.value
+            level = sorted(self.get_missing(self.get_parent(p) for p in level))
+
+    def get_missing(self, projects):
+        """Returns the first projects not fetched yet on the way to the root."""
+
+        missing, seen = set(), set()
+        for project in projects:
+            while project and project not in seen:
+                seen.add(project)
+                if project not in self.access:
+                    missing.add(project)
+                    break
+                project = self.get_parent(project)
+        return missing
+
+    def get_chain(self, project):
+        """Returns the project and its ancestors, the project first."""
+
+        chain = []
+        while project and project not in chain:
+            if project not in self.access:
+                raise error.BadDataException(
+                    f"Access rights of {project} are not fetched."
+                )
+            chain.append(project)
+            project = self.get_parent(project)
+        return chain
+
+    def get_group_names(self, chain):
+        names = {}
+        for project in reversed(chain):
+            for uuid, group in (self.access[project].get("groups") or {}).items():
+                names[uuid] = group.get("name") or uuid
+        return names
+
+    def get_sections(self, chain, ref):
+        """Returns matching (project, pattern, AccessSectionInfo) tuples.
+
+        Sections are ordered from the most specific one, see the module
+        description.
+        """
+
+        sections = [
+            (get_specificity(pattern, ref), depth, project, pattern, section)
+            for depth, project in enumerate(chain)
+            for pattern, section in (self.access[project].get("local") or {}).items()
+            if matches(pattern, ref)
+        ]
+        sections.sort(key=lambda s: (s[0], s[1]))
+        return [
+            (project, pattern, section) for _, _, project, pattern, section in sections
+        ]
+
+    def get_rules(self, project, ref, permission):
+        """Returns the rules of the permission that are in effect.
+
+        :return: Tuple of (allow, block) lists of dicts with the 'project',
+                 'pattern', 'group', 'action', 'force', 'min', 'max' keys
+        """
+
+        seen = set()
+        allow, block = [], []
+        exclusive_projects = set()
+        for source, pattern, section in self.get_sections(self.get_chain(project), ref):
+            info = (section.get("permissions") or {}).get(permission)
+            if not info:
+                continue
+            for group, rule in (info.get("rules") or {}).items():
+                entry = {
+                    "project": source,
+                    "pattern": pattern,
+                    "group": group,
+                    "action": rule.get("action", ALLOW),
+                    "force": rule.get("force", False),
+                    "min": rule.get("min"),
+                    "max": rule.get("max"),
+                }
+                if entry["action"] == BLOCK:
+                    if source not in exclusive_projects:
+                        block.append(entry)
+                elif (pattern, group) not in seen and not exclusive_projects:
+                    seen.add((pattern, group))
+                    if entry["action"] != DENY:
+                        allow.append(entry)
+            if info.get("exclusive"):
+                exclusive_projects.add(source)
+        return allow, block
+
+    def is_blocked(self, rule, block, allow):
+        """Checks whether the ALLOW rule is overridden by a BLOCK rule."""
+
+        for blocking in block:
+            if blocking["group"] != rule["group"] and blocking["group"] not in EVERYONE:
+                continue
+            # An ALLOW rule in the same section overrides the BLOCK rule
+            if not any(
+                (a["project"], a["pattern"], a["group"])
+                == (blocking["project"], blocking["pattern"], rule["group"])
+                for a in allow
+            ):
+                return True
+        return False
+
+    def evaluate(self, project, ref, permission):
+        """Computes who has the permission on the ref of the project.
+
+        :return: List of dicts of the rules in effect, with the 'group_name'
+                 and the action: ALLOW if the group has the permission,
+                 BLOCKED if it is allowed but blocked, BLOCK for blocks
+        """
+
+        allow, block = self.get_rules(project, ref, permission)
+        names = self.get_group_names(self.get_chain(project))
+        entries = []
+        for rule in allow:
+            action = BLOCKED if self.is_blocked(rule, block, allow) else ALLOW
+            entries.append(dict(rule, action=action))
+        entries.extend(block)
+        for entry in entries:
+            entry["group_name"] = names.get(entry["group"], entry["group"])
+        return entries
+
+    def query(self, projects, refs, permissions):
+        """Evaluates all combinations of projects, refs and permissions.
+
+        Access rights of the projects must be fetched first.
+
+        :return: Generator of dicts returned by evaluate() with the
+                 'ref' and 'permission' keys and the queried 'project' as
+                 'queried_project'
+        """
+
+        for project in projects:
+            for ref in refs:
+                for permission in permissions:
+                    for entry in self.evaluate(project, ref, permission):
+                        yield dict(
+                            entry,
+                            queried_project=project,
+                            ref=ref,
+                            permission=permission,
+                        )
+
+    def save(self, path):
+        """Writes fetched access rights to a JSON file atomically.
+
+        The timestamp of the file is the one of the oldest access rights,
+        so data loaded from a cache expires even if more are fetched.
+        """
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.part"
+        with open(partial, "w") as stream:
+            json.dump({"created": self.created, "access": self.access}, stream)
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, project_client, path, max_age=None):
+        """Reads access rights from a JSON file.
+
+        :param max_age: Maximum age of the data in seconds
+        :return: AccessResolver, None if the file does not exist or the
+                 data is too old
+        """
+
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as stream:
+                data = json.load(stream)
+        except ValueError as e:
+            raise error.BadDataException(f"Malformed cache {path}: {e}")
+        if max_age is not None and time.time() - data["created"] > max_age:
+            return None
+        return cls(project_client, access=data["access"], created=data["created"])
@@ -0,0 +1,90 @@
+"""Moving accounts in and out of the attention set of many changes.
+
+Attention sets are read first, so only the add and remove calls that
+actually change something are made.
+"""
+
+from gerritclient.common import bulk, reviewers
+
+
+def get_attention_accounts(attention_set):
+    """Returns AccountInfo entities of the attention set.
+
+    :param attention_set: List of AttentionSetInfo entities or a dict of
+                          them keyed by account ID (as in ChangeInfo)
+    """
+
+    if isinstance(attention_set, dict):
+        attention_set = attention_set.values()
+    return [entry["account"] for entry in attention_set or ()]
+
+
+class AttentionSetUpdater:
+    """Adds and removes accounts from the attention set of changes."""
+
+    def __init__(
+        self,
+        change_client,
+        add=None,
+        remove=None,
+        reason=None,
+        notify="NONE",
+        add_if_removed=False,
+    ):
+        """Creates AttentionSetUpdater.
+
+        :param add: Accounts to be added to the attention set
+        :param remove: Accounts to be removed from the attention set
+        :param reason: Reason of the update
+        :param notify: Notify handling
+        :param add_if_removed: If True, accounts are added only to the
+                               changes that had any account removed
+                               (e.g. to hand changes over to a delegate)
+        """
+
+        self.change_client = change_client
+        self.add = add or []
+        self.remove = remove or []
+        self.reason = reason
+        self.notify = notify
+        self.add_if_removed = add_if_removed
+
+    def get_updates(self, attention_set):
+        """Returns accounts that actually need to be added and removed.
+
+        :return: Tuple of (add, remove) lists
+        """
+
+        accounts = get_attention_accounts(attention_set)
+
+        def is_present(account_id):
+            return any(reviewers.account_matches(a, account_id) for a in accounts)
+
+        remove = [a for a in self.remove if is_present(a)]
+        add = [a for a in self.add if not is_present(a)]
+        if self.add_if_removed and not remove:
+            add = []
+        return add, remove
+
+    def apply(self, change_id):
+        """Updates the attention set of the change.
+
+        Accounts are added before others are removed, so the change is not
+        left without anybody's attention in between.
+
+        :raises bulk.SkipItem: if nothing has to be changed
+        :return: Tuple of (added, removed) accounts
+        """
+
+        add, remove = self.get_updates(self.change_client.get_attention_set(change_id))
+        if not add and not remove:
+            raise bulk.SkipItem("Attention set is already up to date.")
+        for account_id in add:
+            self.change_client.add_to_attention_set(
+                change_id, account_id, reason=self.reason, notify=self.notify
+            )
+        for account_id in remove:
+            self.change_client.remove_from_attention_set(
+                change_id, account_id, reason=self.reason, notify=self.notify
+            )
+        return add, remove
@@ -0,0 +1,352 @@
+"""Concurrent execution of an action over many entities.
+
+Items are dispatched to a bounded thread pool: no more than a fixed number
+of items are in flight at a time, so arbitrary long (lazy) iterables can be
+processed without materializing them. Every item ends up in exactly one of
+the OK, FAILED or SKIPPED states (or BLOCKED, when items depend on each
+other).
+"""
+
+import collections
+import threading
+import time
+from concurrent import futures
+
+import requests
+
+from gerritclient import error
+from gerritclient.common import graph
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+# Not processed because an item it depends on has failed
+BLOCKED = "blocked"
+
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 2
+
+# HTTP status codes that are worth retrying
+RETRIABLE_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+# HTTP status codes telling that the server is overloaded
+OVERLOAD_STATUS_CODES = frozenset((429, 503))
+
+Result = collections.namedtuple(
+    "Result", ("index", "item", "status", "value", "detail", "attempts")
+)
+
+
+class SkipItem(Exception):
+    """Raised by an action to mark the item as skipped (e.g. a no-op)."""
+
+
+class RetryPolicy:
+    """Defines whether and when a failed call should be repeated."""
+
+    def __init__(self, retries=DEFAULT_RETRIES, backoff=1.0, max_backoff=30.0):
+        """Creates RetryPolicy.
+
+        :param retries: Number of retries after the first attempt
+        :param backoff: Delay before the first retry in seconds, doubled
+                        for every next retry
+        :param max_backoff: Upper limit of the delay in seconds
+        """
+
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @staticmethod
+    def is_retriable(exc):
+        """Transient network errors and server overload are retried."""
+
+        if isinstance(exc, error.HTTPError):
+            return exc.status_code in RETRIABLE_STATUS_CODES
+        return isinstance(
+            exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        )
+
+    def delay(self, attempt):
+        """Returns delay in seconds before the given retry attempt (1-based)."""
+
+        return min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+
+
+class AdaptiveLimiter:
+    """Adjusts the number of concurrent calls to the latency of the server.
+
+    The limit grows by one after a full round of calls with normal latency
+    and is halved when the smoothed latency exceeds the lowest one seen so
+    far by the tolerance factor, or when the server reports overload. The
+    reference latency slowly drifts up while the server stays slow, so the
+    limit can recover once the new latency becomes the normal one.
+    """
+
+    def __init__(
+        self,
+        initial=DEFAULT_WORKERS,
+        minimum=1,
+        maximum=DEFAULT_WORKERS * 4,
+        tolerance=2.0,
+        smoothing=0.2,
+        drift=0.01,
+    ):
+        """Creates AdaptiveLimiter.
+
+        :param initial: Initial number of concurrent calls
+        :param minimum: Lower limit of concurrent calls
+        :param maximum: Upper limit of concurrent calls
+        :param tolerance: Ratio of the current latency to the reference
+                          one considered as a slowdown
+        :param smoothing: Weight of a new sample in the moving average
+        :param drift: Relative growth of the reference latency per slow call
+        """
+
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Limits must satisfy 1 <= minimum <= initial <= maximum.")
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.drift = drift
+        # Smoothed and reference latencies in seconds
+        self.latency = None
+        self.baseline = None
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def _decrease(self):
+        # Calls started before the previous decrease report the old
+        # latency, so back off at most once per round of calls
+        if self._calls >= self.limit:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._calls = 0
+
+    def record(self, latency):
+        """Takes the latency (in seconds) of a successful call into account."""
+
+        with self._lock:
+            self._calls += 1
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            if self.baseline is None or self.latency < self.baseline:
+                self.baseline = self.latency
+            if self.latency > self.baseline * self.tolerance:
+                self.baseline *= 1 + self.drift
+                self._decrease()
+            elif self._calls >= self.limit:
+                self.limit = min(self.maximum, self.limit + 1)
+                self._calls = 0
+
+    def record_overload(self):
+        """Takes a call rejected due to the server overload into account."""
+
+        with self._lock:
+            self._calls += 1
+            self._decrease()
+
+
+def execute(func, item, index=0, retry_policy=None, skip=None):
+    """Calls func(item) according to the retry policy.
+
+    Errors of Gerrit and of the connection are retried if the policy
+    allows it, any other exception (e.g. on an unexpected response) fails
+    the item at once, so one bad item never aborts the whole run.
+
+    :param func: Callable taking a single item
+    :param item: Item to be processed
+    :param index: Position of the item in the input sequence
+    :param retry_policy: RetryPolicy instance, no retries if None
+    :param skip: Callable taking an item and returning the reason to skip
+                 it or None if the item should be processed
+    :rtype: Result
+    """
+
+    retry_policy = retry_policy or RetryPolicy(retries=0)
+    reason = skip(item) if skip is not None else None
+    if reason:
+        return Result(index, item, SKIPPED, None, reason, 0)
+
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            value = func(item)
+        except SkipItem as e:
+            return Result(index, item, SKIPPED, None, str(e), attempt)
+        except (error.GerritClientException, requests.exceptions.RequestException) as e:
+            if attempt > retry_policy.retries or not retry_policy.is_retriable(e):
+                return Result(index, item, FAILED, None, str(e), attempt)
+            time.sleep(retry_policy.delay(attempt))
+        except Exception as e:
+            return Result(
+                index, item, FAILED, None, f"{e.__class__.__name__}: {e}", attempt
+            )
+        else:
+            return Result(index, item, OK, value, None, attempt)
+
+
+def run_concurrently(
+    func, items, max_workers=DEFAULT_WORKERS, retry_policy=None, skip=None
+):
+    """Applies func to every item using a bounded pool of threads.
+
+    :param func: Callable taking a single item
+    :param items: Iterable of items, consumed lazily
+    :param max_workers: Maximum number of concurrent calls
+    :param retry_policy: RetryPolicy instance, no retries if None
+    :param skip: Callable taking an item and returning the reason to skip
+                 it or None if the item should be processed
+    :return: Generator of Result entries in order of completion
+    """
+
+    if max_workers < 1:
+        raise ValueError("Number of workers must be a positive integer.")
+
+    # Keep the queue short: twice the number of workers is enough to keep
+    # all of them busy while the caller consumes results.
+    max_pending = max_workers * 2
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for index, item in enumerate(items):
+            if len(pending) >= max_pending:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(execute, func, item, index, retry_policy, skip))
+        for future in futures.as_completed(pending):
+            yield future.result()
+
+
+def run_all(func, items, max_workers=DEFAULT_WORKERS, retry_policy=None, get_id=str):
+    """Applies func to all items concurrently, requiring every call to succeed.
+
+    Useful to fetch data that is needed before any action can be taken.
+
+    :param func: Callable taking a single item
+    :param items: Iterable of items
+    :param max_workers: Maximum number of concurrent calls
+    :param retry_policy: RetryPolicy instance, no retries if None
+    :param get_id: Callable returning identifier of an item for errors
+    :raises error.BadDataException: if processing of any item has failed
+    :return: List of values returned by func in the order of items
+    """
+
+    results = sorted(
+        run_concurrently(
+            func, items, max_workers=max_workers, retry_policy=retry_policy
+        ),
+        key=lambda r: r.index,
+    )
+    errors = [f"{get_id(r.item)}: {r.detail}" for r in results if r.status != OK]
+    if errors:
+        raise error.BadDataException("; ".join(errors))
+    return [r.value for r in results]
+
+
+def run_dependent(
+    func, dependencies, max_workers=DEFAULT_WORKERS, retry_policy=None, key=None
+):
+    """Applies func to nodes of a dependency graph using a pool of threads.
+
+    A node is processed only after all of its parents have been processed
+    successfully or skipped, so independent chains run concurrently while
+    dependent nodes run one after another. Descendants of a failed node
+    are not processed and end up in the BLOCKED state.
+
+    :param func: Callable taking a single node
+    :param dependencies: Dict of nodes to the sets of their parents
+    :param max_workers: Maximum number of concurrent calls
+    :param retry_policy: RetryPolicy instance, no retries if None
+    :param key: Sort key for nodes, defines the order among ready nodes
+    :raises error.BadDataException: if the graph has a cycle
+    :return: Generator of Result entries in order of completion, indexes
+             are positions of the nodes in the topological order
+    """
+
+    if max_workers < 1:
+        raise ValueError("Number of workers must be a positive integer.")
+
+    order = graph.topological_sort(dependencies, key=key)
+    index = {node: i for i, node in enumerate(order)}
+    children = graph.get_children(dependencies)
+    waiting = {
+        node: {p for p in parents if p in dependencies}
+        for node, parents in dependencies.items()
+    }
+    blocked = set()
+    ready = [node for node in order if not waiting[node]]
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        while ready or pending:
+            for node in ready:
+                future = executor.submit(execute, func, node, index[node], retry_policy)
+                pending[future] = node
+            ready = []
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                node = pending.pop(future)
+                result = future.result()
+                yield result
+                if result.status == FAILED:
+                    descendants = graph.get_descendants(children, node) - blocked
+                    for descendant in sorted(descendants, key=index.get):
+                        blocked.add(descendant)
+                        yield Result(
+                            index[descendant],
+                            descendant,
+                            BLOCKED,
+                            None,
+                            f"Blocked by failed upstream {node}.",
+                            0,
+                        )
+                    continue
+                for child in children[node]:
+                    waiting[child].discard(node)
+                    if not waiting[child] and child not in blocked:
+                        ready.append(child)
+            ready.sort(key=index.get)
+
+
+def run_adaptive(func, items, limiter, retry_policy=None, skip=None):
+    """Applies func to every item, adapting concurrency to the server.
+
+    :param func: Callable taking a single item
+    :param items: Iterable of items, consumed lazily
+    :param limiter: AdaptiveLimiter instance defining the concurrency
+    :param retry_policy: RetryPolicy instance, no retries if None
+    :param skip: Callable taking an item and returning the reason to skip
+                 it or None if the item should be processed
+    :return: Generator of Result entries in order of completion
+    """
+
+    def timed(item):
+        started = time.monotonic()
+        try:
+            value = func(item)
+        except error.HTTPError as e:
+            if e.status_code in OVERLOAD_STATUS_CODES:
+                limiter.record_overload()
+            raise
+        limiter.record(time.monotonic() - started)
+        return value
+
+    with futures.ThreadPoolExecutor(max_workers=limiter.maximum) as executor:
+        pending = set()
+        for index, item in enumerate(items):
+            while len(pending) >= limiter.limit:
+                done, pending = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+            pending.add(
+                executor.submit(execute, timed, item, index, retry_policy, skip)
+            )
+        for future in futures.as_completed(pending):
+            yield future.result()
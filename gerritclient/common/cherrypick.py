@@ -0,0 +1,136 @@
+"""Cherry picking changes to many destination branches at once.
+
+Branches that already include a change (according to the branches and
+tags it is included in) are skipped. The resulting changes can be given
+a topic and hashtags, so a backport to several branches is easy to track.
+
+Cherry picks are not idempotent: repeating a request that has reached the
+server creates a duplicate change. Only requests rejected before being
+processed are retried, any other failure of a cherry pick or of tagging
+its result is reported as a permanent one.
+"""
+
+import requests
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+BRANCH_PREFIX = "refs/heads/"
+
+# Status codes returned for changes that are not included anywhere yet
+NOT_INCLUDED_STATUS_CODES = (404, 409)
+# Status codes of requests rejected before being processed
+NOT_PROCESSED_STATUS_CODES = (429,)
+
+
+def get_short_branch_name(branch):
+    """Returns the name of the branch without 'refs/heads/' prefix."""
+
+    if branch.startswith(BRANCH_PREFIX):
+        return branch[len(BRANCH_PREFIX) :]
+    return branch
+
+
+def is_processed(exc):
+    """Checks whether the failed request may have been processed."""
+
+    if isinstance(exc, error.HTTPError):
+        return exc.status_code not in NOT_PROCESSED_STATUS_CODES
+    return not isinstance(exc, requests.exceptions.ConnectTimeout)
+
+
+class CherryPickFanOut:
+    """Cherry picks changes to a set of destination branches."""
+
+    def __init__(
+        self,
+        change_client,
+        revision="current",
+        message=None,
+        notify=None,
+        keep_reviewers=None,
+        allow_conflicts=None,
+        topic=None,
+        hashtags=None,
+    ):
+        self.change_client = change_client
+        self.revision = revision
+        self.message = message
+        self.notify = notify
+        self.keep_reviewers = keep_reviewers
+        self.allow_conflicts = allow_conflicts
+        self.topic = topic
+        self.hashtags = hashtags
+        # Change identifier -> short names of branches that include it
+        self.included = {}
+
+    def get_included_branches(self, change_id):
+        """Returns short names of the branches the change is included in."""
+
+        try:
+            included = self.change_client.get_included(change_id)
+        except error.HTTPError as e:
+            if e.status_code in NOT_INCLUDED_STATUS_CODES:
+                return set()
+            raise
+        return {get_short_branch_name(b) for b in included.get("branches") or ()}
+
+    def load_included(
+        self, change_ids, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None
+    ):
+        """Fetches the branches every change is already included in."""
+
+        change_ids = list(change_ids)
+        branches = bulk.run_all(
+            self.get_included_branches,
+            change_ids,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+        )
+        self.included = dict(zip(change_ids, branches, strict=True))
+
+    def pick(self, item):
+        """Cherry picks the change to the branch.
+
+        :param item: Tuple of (change identifier, destination branch)
+        :raises bulk.SkipItem: if the branch already includes the change
+        :return: ChangeInfo entity of the resulting change
+        """
+
+        change_id, destination = item
+        if get_short_branch_name(destination) in self.included.get(change_id, ()):
+            raise bulk.SkipItem("Change is already included in the branch.")
+
+        try:
+            change = self.change_client.cherry_pick(
+                change_id,
+                revision_id=self.revision,
+                destination=destination,
+                message=self.message,
+                notify=self.notify,
+                keep_reviewers=self.keep_reviewers,
+                allow_conflicts=self.allow_conflicts,
+            )
+        except (error.HTTPError, requests.exceptions.RequestException) as e:
+            if bulk.RetryPolicy.is_retriable(e) and is_processed(e):
+                raise error.BadDataException(
+                    f"Cherry pick failed and was not retried, check the branch "
+                    f"for a new change: {e}"
+                )
+            raise
+        # The cherry-pick must not be repeated if the follow-up calls fail,
+        # so their errors are reported as permanent ones
+        try:
+            if self.topic:
+                self.change_client.set_topic(change["id"], self.topic)
+            if self.hashtags:
+                self.change_client.set_hashtags(change["id"], add=self.hashtags)
+        except (
+            error.GerritClientException,
+            requests.exceptions.RequestException,
+        ) as e:
+            raise error.BadDataException(
+                f"Change {change['_number']} was created, but it could not be "
+                f"tagged: {e}"
+            )
+        return change
@@ -0,0 +1,104 @@
+"""Harvesting comments of many changes as a stream of flat records.
+
+Every (change, comment type) pair is a separate work item, so comments
+of all requested types are fetched concurrently. The bounded pool of
+workers (see bulk.run_concurrently) fetches only a
+few changes ahead of the consumer, so a slow writer throttles fetching
+instead of letting records pile up in memory.
+"""
+
+from gerritclient.common import bulk
+
+# Comment types mapped to the 'comment_type' argument of get_comments()
+COMMENT_TYPES = {
+    "published": None,
+    "drafts": "drafts",
+    "robot": "robotcomments",
+}
+
+# Fields of records and their Parquet types
+RECORD_TYPES = {
+    "change": "string",
+    "type": "string",
+    "file": "string",
+    "patch_set": "int64",
+    "line": "int64",
+    "side": "string",
+    "id": "string",
+    "in_reply_to": "string",
+    "author": "int64",
+    "updated": "string",
+    "unresolved": "bool",
+    "robot_id": "string",
+    "message": "string",
+}
+RECORD_FIELDS = tuple(RECORD_TYPES)
+
+
+def get_records(change_id, comments, comment_type):
+    """Converts comments of a change into flat records.
+
+    :param change_id: Identifier of the change
+    :param comments: Dict of file paths to lists of CommentInfo entities
+    :param comment_type: One of COMMENT_TYPES keys
+    :return: Generator of dicts with RECORD_FIELDS keys
+    """
+
+    for file_path, file_comments in sorted((comments or {}).items()):
+        for comment in file_comments:
+            author = comment.get("author") or {}
+            yield {
+                "change": change_id,
+                "type": comment_type,
+                "file": file_path,
+                "patch_set": comment.get("patch_set"),
+                "line": comment.get("line"),
+                "side": comment.get("side", "REVISION"),
+                "id": comment.get("id"),
+                "in_reply_to": comment.get("in_reply_to"),
+                "author": author.get("_account_id"),
+                "updated": comment.get("updated"),
+                "unresolved": comment.get("unresolved"),
+                "robot_id": comment.get("robot_id"),
+                "message": comment.get("message"),
+            }
+
+
+class CommentHarvester:
+    """Fetches comments of the given types for changes."""
+
+    def __init__(self, change_client, comment_types=None):
+        self.change_client = change_client
+        self.comment_types = comment_types or ["published"]
+        unknown = set(self.comment_types) - COMMENT_TYPES.keys()
+        if unknown:
+            raise ValueError(
+                "Unknown comment types: {}".format(", ".join(sorted(unknown)))
+            )
+
+    def fetch(self, change_id, comment_type):
+        """Returns comments of the type as a list of flat records."""
+
+        comments = self.change_client.get_comments(
+            change_id, comment_type=COMMENT_TYPES[comment_type]
+        )
+        return list(get_records(change_id, comments, comment_type))
+
+    def harvest(self, change_ids, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Fetches comments of all changes concurrently.
+
+        :param change_ids: Iterable of change identifiers, consumed lazily
+        :return: Generator of bulk.Result entries with lists of records,
+                 items are (change identifier, comment type) tuples
+        """
+
+        return bulk.run_concurrently(
+            lambda item: self.fetch(*item),
+            (
+                (change_id, comment_type)
+                for change_id in change_ids
+                for comment_type in self.comment_types
+            ),
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+        )
@@ -0,0 +1,135 @@
+"""Downloading configurations of many projects into a directory.
+
+Projects are selected by names, glob patterns (matched against one
+listing of all projects) or a regex (matched by the server). Configs are
+fetched concurrently by a bounded pool of workers and every file is
+written to a temporary file first and then renamed, so an interrupted
+run never leaves a truncated file behind.
+
+A file is rewritten only if the SHA-256 hash of the new content differs
+from the hash of the existing file, so unchanged configs keep their
+modification times and backups can be synced incrementally.
+
+File names replace special characters of project names, so different
+projects (e.g. 'a/b' and 'a_b') may map to the same file. Such projects
+are refused before anything is downloaded.
+"""
+
+import contextlib
+import fnmatch
+import hashlib
+import io
+import os
+
+from gerritclient import error
+from gerritclient.common import bulk, snapshot, utils
+
+GLOB_CHARACTERS = "*?["
+
+
+def is_pattern(name):
+    """Checks whether the name is a glob pattern."""
+
+    return any(c in name for c in GLOB_CHARACTERS)
+
+
+def select_projects(projects, names):
+    """Selects projects matching names or glob patterns.
+
+    :param projects: Iterable of names of all projects
+    :param names: List of project names or glob patterns
+    :return: Sorted list of the names of matching projects, names that
+             are not patterns are kept even if they are not listed
+    """
+
+    patterns = [name for name in names if is_pattern(name)]
+    selected = {name for name in names if not is_pattern(name)}
+    for project in projects:
+        if any(fnmatch.fnmatchcase(project, pattern) for pattern in patterns):
+            selected.add(project)
+    return sorted(selected)
+
+
+def get_file_name(project, data_format):
+    """Returns the name of the config file of a project."""
+
+    return f"{utils.normalize(project)}.{data_format}"
+
+
+def check_file_names(projects, data_format):
+    """Checks that configs of the projects are saved into different files.
+
+    :raises error.BadDataException: if several projects map to one file
+    """
+
+    names = {}
+    for project in projects:
+        names.setdefault(get_file_name(project, data_format), []).append(project)
+    collisions = [
+        f"{', '.join(sorted(set(p)))} -> {name}"
+        for name, p in sorted(names.items())
+        if len(set(p)) > 1
+    ]
+    if collisions:
+        raise error.BadDataException(
+            "Configs of several projects would be saved into the same file: "
+            + "; ".join(collisions)
+        )
+
+
+def serialize(data_format, data):
+    """Serializes the data into bytes the way 'safe_dump' writes them."""
+
+    stream = io.StringIO()
+    utils.safe_dump(data_format, stream, data)
+    return stream.getvalue().encode("utf-8")
+
+
+class ConfigDownloader:
+    """Downloads configs of projects into a directory."""
+
+    def __init__(self, project_client, directory, data_format="json"):
+        self.project_client = project_client
+        self.directory = directory
+        self.data_format = data_format
+        os.makedirs(directory, exist_ok=True)
+
+    def download(self, project):
+        """Downloads the config of the project.
+
+        :raises bulk.SkipItem: if the content of the file is unchanged
+        :raises error.BadDataException: if the file can not be written
+        :return: Path to the written file
+        """
+
+        content = serialize(self.data_format, self.project_client.get_config(project))
+        target = os.path.join(self.directory, get_file_name(project, self.data_format))
+        if (
+            os.path.isfile(target)
+            and os.path.getsize(target) == len(content)
+            and snapshot.get_file_hash(target) == hashlib.sha256(content).hexdigest()
+        ):
+            raise bulk.SkipItem("Configuration is unchanged.")
+
+        partial = f"{target}.part"
+        try:
+            with open(partial, "wb") as stream:
+                stream.write(content)
+            os.replace(partial, target)
+        except OSError as e:
+            with contextlib.suppress(OSError):
+                os.remove(partial)
+            raise error.BadDataException(f"Unable to write {target}: {e}")
+        return target
+
+    def run(self, projects, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Downloads configs of all projects concurrently.
+
+        :raises error.BadDataException: if several projects map to one file
+        :return: Generator of bulk.Result entries
+        """
+
+        check_file_names(projects, self.data_format)
+        return bulk.run_concurrently(
+            self.download, projects, max_workers=max_workers, retry_policy=retry_policy
+        )
@@ -0,0 +1,83 @@
+"""Checking and fixing consistency of many changes.
+
+Problems reported by the server are grouped by type: variable parts of
+the messages (commit SHA-1s, numbers, refs) are replaced by placeholders,
+so the same kind of damage found on many changes ends up in one group.
+"""
+
+import collections
+import re
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+PROBLEM_PATTERNS = (
+    (re.compile(r"\b[0-9a-f]{40}\b"), "<sha1>"),
+    (re.compile(r"\brefs/\S+"), "<ref>"),
+    (re.compile(r"\b\d+\b"), "<n>"),
+)
+
+
+def get_problem_type(message):
+    """Returns the message of a problem without its variable parts."""
+
+    for pattern, placeholder in PROBLEM_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def summarize(problems_by_change):
+    """Groups changes by types of their problems.
+
+    :param problems_by_change: Dict of change identifiers to the lists of
+                               their ProblemInfo entities
+    :return: Dict of problem types to the sorted lists of change identifiers
+    """
+
+    summary = collections.defaultdict(set)
+    for change_id, problems in problems_by_change.items():
+        for problem in problems:
+            summary[get_problem_type(problem.get("message", ""))].add(change_id)
+    return {problem: sorted(changes) for problem, changes in summary.items()}
+
+
+class ConsistencySweeper:
+    """Checks changes for problems and fixes the affected ones."""
+
+    def __init__(self, change_client, is_delete=False, expect_merged_as=False):
+        self.change_client = change_client
+        self.is_delete = is_delete
+        self.expect_merged_as = expect_merged_as
+
+    def check(self, change_id):
+        """Returns the list of ProblemInfo entities of the change."""
+
+        return self.change_client.check_consistency(change_id).get("problems") or []
+
+    def fix(self, change_id):
+        """Fixes problems of the change.
+
+        :raises error.BadDataException: if any problem could not be fixed
+        :return: List of ProblemInfo entities with the fix outcomes
+        """
+
+        response = self.change_client.fix_consistency(
+            change_id, is_delete=self.is_delete, expect_merged_as=self.expect_merged_as
+        )
+        problems = response.get("problems") or []
+        failed = [p for p in problems if p.get("status") == "FIX_FAILED"]
+        if failed:
+            raise error.BadDataException(
+                "; ".join(f"{p.get('message')}: {p.get('outcome')}" for p in failed)
+            )
+        return problems
+
+    def sweep(self, change_ids, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Checks all changes concurrently.
+
+        :return: Generator of bulk.Result entries with lists of problems
+        """
+
+        return bulk.run_concurrently(
+            self.check, change_ids, max_workers=max_workers, retry_policy=retry_policy
+        )
@@ -0,0 +1,111 @@
+"""Fetching diffs of all files of a revision concurrently.
+
+Files of a revision are listed by one request, then their diffs are
+fetched by a bounded pool of workers and yielded as soon as they arrive,
+so a bundle can be written to disk without keeping every diff in memory.
+"""
+
+import fnmatch
+import posixpath
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+# Files generated by tools, their diffs are rarely reviewed
+GENERATED_PATTERNS = (
+    "*.min.js",
+    "*.min.css",
+    "*.pb.go",
+    "*.pb.h",
+    "*.pb.cc",
+    "*_pb2.py",
+    "*_pb2_grpc.py",
+    "package-lock.json",
+    "yarn.lock",
+    "go.sum",
+    "Cargo.lock",
+    "poetry.lock",
+    "Gemfile.lock",
+    "composer.lock",
+)
+
+FILE_FIELDS = ("status", "old_path", "lines_inserted", "lines_deleted", "size_delta")
+
+
+def is_generated(file_path, patterns=GENERATED_PATTERNS):
+    """Checks whether the file path or its name matches any pattern."""
+
+    name = posixpath.basename(file_path)
+    return any(
+        fnmatch.fnmatchcase(file_path, p) or fnmatch.fnmatchcase(name, p)
+        for p in patterns
+    )
+
+
+def select_files(
+    files, skip_binary=False, skip_generated=False, generated_patterns=None
+):
+    """Filters files of a revision.
+
+    :param files: Dict of file paths to FileInfo entities
+    :param skip_binary: Leave out binary files
+    :param skip_generated: Leave out files matching generated_patterns
+    :param generated_patterns: Glob patterns of generated files, defaults
+                               to GENERATED_PATTERNS
+    :return: List of (path, FileInfo) tuples sorted by path
+    """
+
+    patterns = generated_patterns or GENERATED_PATTERNS
+    return [
+        (file_path, info)
+        for file_path, info in sorted((files or {}).items())
+        if not (skip_binary and info.get("binary"))
+        and not (skip_generated and is_generated(file_path, patterns))
+    ]
+
+
+def get_record(file_path, file_info, diff):
+    """Combines FileInfo and DiffInfo of a file into one record."""
+
+    record = {"path": file_path, "binary": bool(file_info.get("binary"))}
+    record.update((k, file_info.get(k)) for k in FILE_FIELDS)
+    # Status is omitted by the server for modified files
+    record["status"] = record["status"] or "M"
+    record["diff"] = diff
+    return record
+
+
+def iter_diffs(
+    change_client,
+    change_id,
+    files,
+    revision_id="current",
+    max_workers=bulk.DEFAULT_WORKERS,
+    retry_policy=None,
+    **diff_options,
+):
+    """Fetches diffs of the files concurrently.
+
+    :param change_client: ChangeClient instance
+    :param files: List of (path, FileInfo) tuples
+    :param diff_options: Arguments of ChangeClient.get_file_diff(), like
+                         'base', 'parent', 'context' or 'whitespace'
+    :raises error.BadDataException: if a diff can not be fetched
+    :return: Generator of records (see get_record()) in completion order
+    """
+
+    def fetch(entry):
+        file_path, file_info = entry
+        diff = change_client.get_file_diff(
+            change_id, file_path, revision_id=revision_id, **diff_options
+        )
+        return get_record(file_path, file_info, diff)
+
+    for result in bulk.run_concurrently(
+        fetch, files, max_workers=max_workers, retry_policy=retry_policy
+    ):
+        if result.status != bulk.OK:
+            raise error.BadDataException(
+                f"Unable to get the diff of {result.item[0]}: {result.detail}"
+            )
+        yield result.value
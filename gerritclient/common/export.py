@@ -0,0 +1,322 @@
+"""Streaming export of entities to JSON Lines or Parquet files.
+
+Records are written as they arrive, so memory usage does not depend on
+the number of records: JSON Lines are written line by line and Parquet
+files row group by row group. Nested entities are flattened into columns
+according to a schema that maps column names to dotted paths, e.g.
+{'owner': 'owner.username', 'first_label': 'labels.Code-Review.value'}.
+
+Parquet support requires the optional 'pyarrow' package.
+"""
+
+import bz2
+import gzip
+import json
+import lzma
+import os
+import sys
+
+from gerritclient import error
+from gerritclient.common import utils
+
+JSONL = "jsonl"
+PARQUET = "parquet"
+SUPPORTED_FORMATS = (JSONL, PARQUET)
+
+COMPRESSORS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+# Default flattening schema of ChangeInfo entities
+CHANGE_SCHEMA = {
+    "id": "id",
+    "number": "_number",
+    "project": "project",
+    "branch": "branch",
+    "topic": "topic",
+    "change_id": "change_id",
+    "subject": "subject",
+    "status": "status",
+    "owner": "owner._account_id",
+    "created": "created",
+    "updated": "updated",
+    "submitted": "submitted",
+    "insertions": "insertions",
+    "deletions": "deletions",
+    "hashtags": "hashtags",
+    "work_in_progress": "work_in_progress",
+}
+
+# Parquet types of ChangeInfo fields by their paths, Gerrit omits false
+# and empty fields, so they can not be inferred from the first records
+CHANGE_TYPES = {
+    "id": "string",
+    "_number": "int64",
+    "project": "string",
+    "branch": "string",
+    "topic": "string",
+    "change_id": "string",
+    "subject": "string",
+    "status": "string",
+    "owner._account_id": "int64",
+    "created": "string",
+    "updated": "string",
+    "submitted": "string",
+    "insertions": "int64",
+    "deletions": "int64",
+    "hashtags": "string",
+    "work_in_progress": "bool",
+    "is_private": "bool",
+    "mergeable": "bool",
+    "submittable": "bool",
+    "total_comment_count": "int64",
+    "unresolved_comment_count": "int64",
+}
+
+
+def get_path(record, path, default=None):
+    """Returns the value of a nested field given by a dotted path.
+
+    Numeric path segments are used as indexes of lists.
+
+    :param record: Dict (possibly with nested dicts and lists)
+    :param path: Dotted path, e.g. 'owner.email' or 'parents.0.commit'
+    :param default: Value returned if the field does not exist
+    """
+
+    value = record
+    for key in path.split("."):
+        if isinstance(value, dict):
+            if key not in value:
+                return default
+            value = value[key]
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return default
+    return value
+
+
+def flatten(record, schema):
+    """Converts a record into a flat dict according to the schema.
+
+    :param record: Dict (possibly with nested dicts and lists)
+    :param schema: Dict of column names to dotted paths
+    """
+
+    return {column: get_path(record, path) for column, path in schema.items()}
+
+
+def get_types(schema, types=CHANGE_TYPES):
+    """Returns Parquet types of the columns of the schema with known paths.
+
+    :param schema: Dict of column names to dotted paths
+    :param types: Dict of dotted paths to pyarrow type aliases
+    """
+
+    return {column: types[path] for column, path in schema.items() if path in types}
+
+
+def load_schema(file_path):
+    """Reads a flattening schema from a JSON or YAML file.
+
+    The file contains either a mapping of column names to dotted paths,
+    or a list of paths, in which case the paths are used as column names
+    (with dots replaced by underscores).
+    """
+
+    schema = utils.read_from_file(file_path)
+    if isinstance(schema, list):
+        schema = {str(path).replace(".", "_"): str(path) for path in schema}
+    if not isinstance(schema, dict) or not schema:
+        raise error.BadDataException(
+            "Schema must be a non-empty mapping of columns to paths or a list of paths."
+        )
+    return {str(column): str(path) for column, path in schema.items()}
+
+
+def get_format(file_path):
+    """Guesses the output format by the file extension."""
+
+    return PARQUET if file_path.endswith(".parquet") else JSONL
+
+
+def get_compression(file_path):
+    """Guesses the compression by the file extension, None if not compressed."""
+
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1])
+
+
+class JsonLinesWriter:
+    """Writes records to a (possibly compressed) JSON Lines file."""
+
+    def __init__(self, file_path, compression=None):
+        """Creates JsonLinesWriter.
+
+        :param file_path: Path to the file, '-' for stdout
+        :param compression: One of COMPRESSORS keys or None
+        """
+
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Unsupported compression '{compression}'.")
+        if file_path == "-":
+            if compression is not None:
+                raise error.BadDataException(
+                    "Compressed output can not be written to stdout."
+                )
+            self._stream = sys.stdout
+        else:
+            opener = COMPRESSORS.get(compression, open)
+            self._stream = opener(file_path, "wt", encoding="utf-8")
+        self.count = 0
+
+    def write(self, record):
+        self._stream.write(json.dumps(record, sort_keys=True))
+        self._stream.write("\n")
+        self.count += 1
+
+    def close(self):
+        if self._stream is sys.stdout:
+            self._stream.flush()
+        else:
+            self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class ParquetWriter:
+    """Writes flat records to a Parquet file in row groups.
+
+    Columns are typed by the given types, types of other columns are
+    inferred from the first row group, columns without any value there
+    become strings. Nested values (lists and dicts) and other non-string
+    values of string columns are stored as JSON strings.
+    """
+
+    def __init__(self, file_path, batch_size=1000, columns=None, types=None):
+        """Creates ParquetWriter.
+
+        :param columns: Names of the columns of an empty file, written
+                        as strings unless typed if there are no records
+        :param types: Dict of column names to pyarrow type aliases, e.g.
+                      {'number': 'int64', 'work_in_progress': 'bool'}
+        """
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise error.BadDataException(
+                "Parquet export requires 'pyarrow' package, install it with "
+                "'pip install python-gerritclient[parquet]'."
+            )
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.columns = columns or ()
+        self.types = types or {}
+        self._batch = []
+        self._writer = None
+        self.count = 0
+
+    @staticmethod
+    def _prepare(record):
+        return {
+            k: json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v
+            for k, v in record.items()
+        }
+
+    def _get_field(self, name, inferred=None):
+        if name in self.types:
+            return self._pa.field(name, self._pa.type_for_alias(self.types[name]))
+        field = inferred.field(name) if inferred is not None else None
+        # Columns without any value in the first row group can not be typed
+        if field is None or self._pa.types.is_null(field.type):
+            return self._pa.field(name, self._pa.string())
+        return field
+
+    def _get_schema(self):
+        names = list(dict.fromkeys(key for record in self._batch for key in record))
+        inferred = self._pa.Table.from_pylist(
+            [{n: r.get(n) for n in names if n not in self.types} for r in self._batch]
+        ).schema
+        return self._pa.schema([self._get_field(name, inferred) for name in names])
+
+    @staticmethod
+    def _coerce(record, strings):
+        return {
+            k: json.dumps(v)
+            if k in strings and v is not None and not isinstance(v, str)
+            else v
+            for k, v in record.items()
+        }
+
+    def _flush(self):
+        if not self._batch:
+            return
+        try:
+            if self._writer is None:
+                self._writer = self._pq.ParquetWriter(
+                    self.file_path, self._get_schema()
+                )
+            schema = self._writer.schema
+            strings = {f.name for f in schema if self._pa.types.is_string(f.type)}
+            table = self._pa.Table.from_pylist(
+                [self._coerce(record, strings) for record in self._batch],
+                schema=schema,
+            )
+        except (self._pa.ArrowInvalid, self._pa.ArrowTypeError) as e:
+            raise error.BadDataException(f"Unable to write Parquet row group: {e}")
+        self._writer.write_table(table)
+        self._batch = []
+
+    def write(self, record):
+        self._batch.append(self._prepare(record))
+        self.count += 1
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        if self._writer is None:
+            schema = self._pa.schema([self._get_field(c) for c in self.columns])
+            self._writer = self._pq.ParquetWriter(self.file_path, schema)
+            self._writer.write_table(schema.empty_table())
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def get_writer(file_path, data_format=None, compression=None, columns=None, types=None):
+    """Creates a writer for the file.
+
+    :param file_path: Path to the output file, '-' for stdout (JSON Lines)
+    :param data_format: One of SUPPORTED_FORMATS, guessed by the file
+                        extension if None
+    :param compression: Compression of JSON Lines, guessed by the file
+                        extension if None
+    :param columns: Names of the columns of an empty Parquet file
+    :param types: Dict of column names to pyarrow type aliases of Parquet
+                  columns, other columns are inferred
+    """
+
+    data_format = data_format or get_format(file_path)
+    if data_format == PARQUET:
+        if compression is not None:
+            raise error.BadDataException(
+                "Parquet files are compressed internally, remove the compression."
+            )
+        return ParquetWriter(file_path, columns=columns, types=types)
+    if data_format != JSONL:
+        raise ValueError(f"Unsupported format '{data_format}'.")
+    return JsonLinesWriter(
+        file_path, compression=compression or get_compression(file_path)
+    )
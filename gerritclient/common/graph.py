@@ -0,0 +1,222 @@
+"""Helpers to work with dependency graphs of changes.
+
+A graph is represented as a dict mapping every node to the set of nodes
+it depends on (its parents). Nodes can be any hashable objects, changes
+are identified by their numbers.
+"""
+
+from gerritclient import error
+
+
+def get_children(dependencies):
+    """Inverts the graph: maps every node to the set of its dependents."""
+
+    children = {node: set() for node in dependencies}
+    for node, parents in dependencies.items():
+        for parent in parents:
+            children.setdefault(parent, set()).add(node)
+    return children
+
+
+def topological_sort(dependencies, key=None):
+    """Orders nodes so that every node goes after all of its parents.
+
+    Nodes that are ready at the same time are ordered by key, so the
+    result is deterministic.
+
+    :param dependencies: Dict of nodes to the sets of their parents,
+                         parents missing from the keys are ignored
+    :param key: Sort key for nodes, defaults to the nodes themselves
+    :raises error.BadDataException: if the graph has a cycle
+    :return: List of nodes
+    """
+
+    in_degree = {
+        node: len([p for p in parents if p in dependencies])
+        for node, parents in dependencies.items()
+    }
+    children = get_children(dependencies)
+    ready = sorted((n for n, d in in_degree.items() if d == 0), key=key)
+    order = []
+    while ready:
+        node = ready.pop(0)
+        order.append(node)
+        released = []
+        for child in children.get(node, ()):
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                released.append(child)
+        ready = sorted(ready + released, key=key)
+
+    if len(order) < len(dependencies):
+        cycle = sorted((str(n) for n, d in in_degree.items() if d > 0))
+        raise error.BadDataException(
+            "Dependency cycle detected between: {}".format(", ".join(cycle))
+        )
+    return order
+
+
+def get_descendants(children, node):
+    """Returns all nodes that directly or transitively depend on the node.
+
+    :param children: Dict of nodes to the sets of their dependents
+    """
+
+    descendants = set()
+    stack = list(children.get(node, ()))
+    while stack:
+        current = stack.pop()
+        if current not in descendants:
+            descendants.add(current)
+            stack.extend(children.get(current, ()))
+    return descendants
+
+
+def transitive_reduction(dependencies):
+    """Drops dependencies that are implied by other dependencies.
+
+    E.g. if C depends on B and A while B depends on A, the dependency of
+    C on A is redundant.
+
+    :return: New dict of nodes to the sets of their direct parents
+    """
+
+    # Descendants in the graph of parents are the ancestors
+    ancestors = {node: get_descendants(dependencies, node) for node in dependencies}
+    return {
+        node: {
+            parent
+            for parent in parents
+            if not any(parent in ancestors.get(other, ()) for other in parents)
+        }
+        for node, parents in dependencies.items()
+    }
+
+
+def get_chain_parents(related):
+    """Maps changes of a relation chain to the numbers of their parents.
+
+    :param related: RelatedChangesInfo entity
+    :return: Dict of change numbers to parent change numbers (None if the
+             parent commit is not a change of the chain)
+    """
+
+    entries = related.get("changes") or []
+    numbers = {e["commit"]["commit"]: e["_change_number"] for e in entries}
+    parents = {}
+    for entry in entries:
+        commit_parents = entry["commit"].get("parents") or [{}]
+        parents[entry["_change_number"]] = numbers.get(commit_parents[0].get("commit"))
+    return parents
+
+
+def get_nearest_ancestor(number, parents, members):
+    """Walks the relation chain up to the closest change among members."""
+
+    seen = {number}
+    parent = parents.get(number)
+    while parent is not None and parent not in seen:
+        if parent in members:
+            return parent
+        seen.add(parent)
+        parent = parents.get(parent)
+    return None
+
+
+def get_chain_dependencies(members, related_infos):
+    """Builds the dependency graph of changes from their relation chains.
+
+    Changes that are not members are skipped, so a member depends on its
+    closest ancestor among the members.
+
+    :param members: Collection of change numbers
+    :param related_infos: Iterable of RelatedChangesInfo entities
+    :return: Dict of change numbers to the sets of their parents
+    """
+
+    parents = {}
+    for related in related_infos:
+        parents.update(get_chain_parents(related))
+    dependencies = {}
+    for number in members:
+        ancestor = get_nearest_ancestor(number, parents, members)
+        dependencies[number] = set() if ancestor is None else {ancestor}
+    return dependencies
+
+
+def find_cycles(dependencies):
+    """Finds groups of nodes that depend on each other.
+
+    Uses Tarjan's algorithm for strongly connected components.
+
+    :param dependencies: Dict of nodes to the sets of their parents,
+                         parents missing from the keys are ignored
+    :return: List of sorted lists of nodes forming cycles
+    """
+
+    indexes, lowlinks = {}, {}
+    stack, on_stack = [], set()
+    cycles = []
+
+    for root in dependencies:
+        if root in indexes:
+            continue
+        # Iterative depth-first search, frames are (node, iterator of parents)
+        work = [(root, iter(dependencies[root]))]
+        indexes[root] = lowlinks[root] = len(indexes)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, parents = work[-1]
+            for parent in parents:
+                if parent not in dependencies:
+                    continue
+                if parent not in indexes:
+                    indexes[parent] = lowlinks[parent] = len(indexes)
+                    stack.append(parent)
+                    on_stack.add(parent)
+                    work.append((parent, iter(dependencies[parent])))
+                    break
+                if parent in on_stack:
+                    lowlinks[node] = min(lowlinks[node], indexes[parent])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    lowlinks[caller] = min(lowlinks[caller], lowlinks[node])
+                if lowlinks[node] == indexes[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in dependencies[node]:
+                        cycles.append(sorted(component, key=str))
+    return sorted(cycles, key=lambda c: str(c[0]))
+
+
+def to_dot(dependencies, labels=None, name="dependencies"):
+    """Renders the graph in the DOT language of Graphviz.
+
+    Edges go from nodes to their parents.
+
+    :param dependencies: Dict of nodes to the sets of their parents
+    :param labels: Dict of nodes to their labels, defaults to the nodes
+    :param name: Name of the graph
+    :return: String
+    """
+
+    def quote(value):
+        return '"{}"'.format(str(value).replace("\\", "\\\\").replace('"', '\\"'))
+
+    labels = labels or {}
+    lines = [f"digraph {quote(name)} {{", "  rankdir=BT;"]
+    for node in sorted(dependencies, key=str):
+        lines.append(f"  {quote(node)} [label={quote(labels.get(node, node))}];")
+    for node in sorted(dependencies, key=str):
+        for parent in sorted(dependencies[node], key=str):
+            lines.append(f"  {quote(node)} -> {quote(parent)};")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
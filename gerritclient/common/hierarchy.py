@@ -0,0 +1,204 @@
+"""Project inheritance hierarchy built from as few requests as possible.
+
+The whole forest is built from one listing of all projects with their
+parents (the 'tree' option of the project listing). If the server omits
+parents of some projects, children of projects are fetched concurrently
+instead, level by level, starting from the roots.
+
+The hierarchy is kept as a map of projects to their parents and a map of
+projects to their children, so ancestors and descendants of a project
+are found locally, in time proportional to their number. It can be
+cached in a JSON file and reused while it is fresh enough.
+"""
+
+import json
+import os
+import time
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+# The root of all projects, it has no parent
+ROOT_PROJECT = "All-Projects"
+
+
+class ProjectHierarchy:
+    """Forest of projects linked to their parents."""
+
+    def __init__(self, parents, created=None):
+        """Creates ProjectHierarchy.
+
+        :param parents: Dict of project names to the names of their
+                        parents (None for roots)
+        :param created: Timestamp of the data, defaults to the current time
+        """
+
+        self.parents = dict(parents)
+        self.created = time.time() if created is None else created
+        self.children = {}
+        for project, parent in self.parents.items():
+            if parent is not None:
+                self.children.setdefault(parent, []).append(project)
+        for names in self.children.values():
+            names.sort()
+
+    def __contains__(self, project):
+        return project in self.parents or project in self.children
+
+    def get_roots(self):
+        """Returns projects whose parents are unknown, sorted by name."""
+
+        roots = {p for p, parent in self.parents.items() if parent is None}
+        roots.update(
+            parent
+            for parent in self.parents.values()
+            if parent is not None and parent not in self.parents
+        )
+        return sorted(roots)
+
+    def get_ancestors(self, project):
+        """Returns parents of the project up to the root, closest first."""
+
+        ancestors = []
+        parent = self.parents.get(project)
+        while parent is not None and parent not in ancestors:
+            ancestors.append(parent)
+            parent = self.parents.get(parent)
+        return ancestors
+
+    def walk(self, project, max_depth=None):
+        """Yields (name, parent, depth) of descendants in depth-first order.
+
+        :param max_depth: Depth limit, children of the project are at depth 1
+        """
+
+        seen = {project}
+        stack = [
+            (child, project, 1) for child in reversed(self.children.get(project, ()))
+        ]
+        while stack:
+            name, parent, depth = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            yield name, parent, depth
+            if max_depth is None or depth < max_depth:
+                stack.extend(
+                    (child, name, depth + 1)
+                    for child in reversed(self.children.get(name, ()))
+                )
+
+    def get_descendants(self, project):
+        """Returns names of all projects inheriting from the project."""
+
+        return [name for name, _, _ in self.walk(project)]
+
+    def to_dict(self, project, max_depth=None):
+        """Returns the subtree of the project as nested dicts."""
+
+        nodes = {project: {"name": project, "children": []}}
+        for name, parent, _ in self.walk(project, max_depth=max_depth):
+            nodes[name] = {"name": name, "children": []}
+            nodes[parent]["children"].append(nodes[name])
+        return nodes[project]
+
+    def render(self, project, max_depth=None):
+        """Renders the subtree of the project as text, one line per project."""
+
+        lines = [project]
+        # Whether the ancestor at the given depth is the last of its siblings
+        last = []
+        for name, parent, depth in self.walk(project, max_depth=max_depth):
+            del last[depth - 1 :]
+            last.append(name == self.children[parent][-1])
+            indent = "".join("    " if is_last else "|   " for is_last in last[:-1])
+            lines.append(f"{indent}{'`-- ' if last[-1] else '|-- '}{name}")
+        return "\n".join(lines) + "\n"
+
+    def save(self, path):
+        """Writes the hierarchy to a JSON file atomically."""
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.part"
+        with open(partial, "w") as stream:
+            json.dump(
+                {"created": self.created, "parents": self.parents},
+                stream,
+                sort_keys=True,
+            )
+        os.replace(partial, path)
+
+    @classmethod
+    def load(cls, path, max_age=None):
+        """Reads the hierarchy from a JSON file.
+
+        :param max_age: Maximum age of the data in seconds
+        :return: ProjectHierarchy or None if the file does not exist or
+                 the data is too old
+        """
+
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as stream:
+                data = json.load(stream)
+        except ValueError as e:
+            raise error.BadDataException(f"Malformed cache {path}: {e}")
+        if max_age is not None and time.time() - data["created"] > max_age:
+            return None
+        return cls(data["parents"], created=data["created"])
+
+
+def fetch_children(
+    project_client, roots, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None
+):
+    """Finds parents of projects by fetching children level by level.
+
+    :param roots: Names of the projects to start from
+    :return: Dict of project names to the names of their parents
+    """
+
+    parents = dict.fromkeys(roots)
+    level = list(roots)
+    while level:
+        following = []
+        for result in bulk.run_concurrently(
+            project_client.get_children,
+            level,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+        ):
+            if result.status != bulk.OK:
+                raise error.BadDataException(
+                    f"Unable to get children of {result.item}: {result.detail}"
+                )
+            for child in result.value:
+                if child["name"] not in parents:
+                    parents[child["name"]] = result.item
+                    following.append(child["name"])
+        level = following
+    return parents
+
+
+def fetch(project_client, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+    """Builds the hierarchy of all projects visible to the caller.
+
+    Children are fetched only if the listing misses parents of projects.
+    """
+
+    projects = project_client.get_all(is_all=True, tree=True)
+    parents = {name: info.get("parent") for name, info in projects.items()}
+    if all(
+        parent is not None for name, parent in parents.items() if name != ROOT_PROJECT
+    ):
+        return ProjectHierarchy(parents)
+    if ROOT_PROJECT in parents:
+        roots = [ROOT_PROJECT]
+    else:
+        roots = sorted(name for name, parent in parents.items() if parent is None)
+    found = fetch_children(
+        project_client, roots, max_workers=max_workers, retry_policy=retry_policy
+    )
+    # Projects not reachable from the roots keep what the listing reported
+    return ProjectHierarchy({**parents, **found})
@@ -0,0 +1,453 @@
+"""Local SQLite index of changes with incremental sync and offline queries.
+
+The index keeps ChangeInfo entities of the changes matching a base query.
+The first sync fetches all of them; every following sync fetches only the
+changes updated since the most recent 'updated' timestamp seen so far.
+Changes that stop matching the base query (e.g. 'status:open' changes
+that are merged) are not returned by that query, so open changes of the
+index that were not fetched are also fetched again by their numbers and
+the ones that are no longer visible are removed.
+
+Queries are answered locally and support a subset of the Gerrit query
+language: the 'status', 'is', 'project', 'projects', 'branch', 'owner',
+'topic', 'hashtag' and 'age' operators combined with AND (implicit), OR,
+negation ('-' or NOT) and parentheses.
+"""
+
+import itertools
+import json
+import os
+import re
+import sqlite3
+import time
+
+from gerritclient import error
+from gerritclient.common import utils
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    id TEXT PRIMARY KEY,
+    number INTEGER,
+    project TEXT,
+    branch TEXT,
+    topic TEXT,
+    status TEXT,
+    owner_id INTEGER,
+    owner_username TEXT,
+    owner_email TEXT,
+    owner_name TEXT,
+    updated TEXT,
+    updated_ts REAL,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS hashtags (
+    id TEXT REFERENCES changes (id) ON DELETE CASCADE,
+    hashtag TEXT,
+    PRIMARY KEY (id, hashtag)
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE INDEX IF NOT EXISTS changes_project ON changes (project, branch);
+CREATE INDEX IF NOT EXISTS changes_status ON changes (status);
+CREATE INDEX IF NOT EXISTS changes_updated ON changes (updated_ts);
+CREATE INDEX IF NOT EXISTS hashtags_hashtag ON hashtags (hashtag);
+"""
+
+DEFAULT_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "gerritclient", "changes.sqlite"
+)
+
+# Options of the query to fetch owner details stored in the index
+SYNC_OPTIONS = ("DETAILED_ACCOUNTS",)
+
+# Number of changes fetched again by one query of their numbers
+REFRESH_BATCH_SIZE = 100
+
+STATUSES = {
+    "open": ("NEW",),
+    "new": ("NEW",),
+    "pending": ("NEW",),
+    "merged": ("MERGED",),
+    "abandoned": ("ABANDONED",),
+    "closed": ("MERGED", "ABANDONED"),
+}
+
+AGE_UNITS = {
+    "s": 1,
+    "sec": 1,
+    "second": 1,
+    "seconds": 1,
+    "m": 60,
+    "min": 60,
+    "minute": 60,
+    "minutes": 60,
+    "h": 3600,
+    "hr": 3600,
+    "hour": 3600,
+    "hours": 3600,
+    "d": 86400,
+    "day": 86400,
+    "days": 86400,
+    "w": 604800,
+    "week": 604800,
+    "weeks": 604800,
+    "mon": 2592000,
+    "month": 2592000,
+    "months": 2592000,
+    "y": 31536000,
+    "year": 31536000,
+    "years": 31536000,
+}
+
+TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<paren>[()])
+        | (?P<term>-?[\w.]+:(?:"[^"]*"|\{[^}]*\}|[^\s()]+))
+        | (?P<word>[^\s()]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+def tokenize(query):
+    """Splits the query into parentheses, 'operator:value' terms and words."""
+
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise error.BadDataException(
+                f"Unable to parse query at: {query[position:]}"
+            )
+        tokens.append(match.group(match.lastgroup))
+        position = match.end()
+    return tokens
+
+
+def parse_age(value):
+    """Converts an age like '2d' or '3weeks' into seconds."""
+
+    match = re.fullmatch(r"(\d+)\s*([a-z]+)", value.lower())
+    if not match or match.group(2) not in AGE_UNITS:
+        raise error.BadDataException(f"Unsupported age '{value}'.")
+    return int(match.group(1)) * AGE_UNITS[match.group(2)]
+
+
+def escape_like(value):
+    """Escapes wildcards of the LIKE operator."""
+
+    return re.sub(r"([\\%_])", r"\\\1", value)
+
+
+class QueryCompiler:
+    """Compiles a query into an SQL condition over the changes table."""
+
+    def __init__(self, now=None):
+        self.now = time.time() if now is None else now
+        # Conditions must never be NULL (e.g. for changes without a topic),
+        # otherwise their negation would not match anything
+        self.operators = {
+            "status": self.compile_status,
+            "is": self.compile_status,
+            "project": lambda v: ("project IS ?", [v]),
+            "projects": lambda v: (
+                "project IS NOT NULL AND project LIKE ? ESCAPE '\\'",
+                [escape_like(v) + "%"],
+            ),
+            "branch": lambda v: ("branch IS ?", [v.removeprefix("refs/heads/")]),
+            "owner": self.compile_owner,
+            "topic": lambda v: ("topic IS ?", [v]),
+            "hashtag": lambda v: (
+                "id IN (SELECT id FROM hashtags WHERE hashtag = ?)",
+                [v.lower()],
+            ),
+            "age": lambda v: (
+                "updated_ts IS NOT NULL AND updated_ts <= ?",
+                [self.now - parse_age(v)],
+            ),
+        }
+
+    @staticmethod
+    def compile_status(value):
+        statuses = STATUSES.get(value.lower())
+        if statuses is None:
+            raise error.BadDataException(f"Unsupported status '{value}'.")
+        return "status IN ({})".format(", ".join("?" * len(statuses))), list(statuses)
+
+    @staticmethod
+    def compile_owner(value):
+        if value == "self":
+            raise error.BadDataException(
+                "'owner:self' is not supported by the local index, "
+                "use the account identifier instead."
+            )
+        if value.isdigit():
+            return "owner_id IS ?", [int(value)]
+        return "owner_username IS ? OR owner_email IS ? OR owner_name IS ?", [value] * 3
+
+    def compile_term(self, term):
+        negated = term.startswith("-")
+        name, _, value = term.lstrip("-").partition(":")
+        if name not in self.operators:
+            raise error.BadDataException(
+                "Operator '{}' is not supported by the local index, "
+                "supported operators: {}.".format(
+                    name, ", ".join(sorted(self.operators))
+                )
+            )
+        if value[:1] in ('"', "{"):
+            value = value[1:-1]
+        condition, params = self.operators[name](value)
+        if negated:
+            return f"NOT ({condition})", params
+        return condition, params
+
+    def compile(self, query):
+        """Compiles the query.
+
+        :raises error.BadDataException: if the query is malformed or uses
+                                        unsupported operators
+        :return: Tuple of (SQL condition, list of parameters)
+        """
+
+        tokens = tokenize(query)
+        if not tokens:
+            raise error.BadDataException("Query must not be empty.")
+        condition, params, position = self.parse_or(tokens, 0)
+        if position != len(tokens):
+            raise error.BadDataException(f"Unexpected '{tokens[position]}' in query.")
+        return condition, params
+
+    def parse_or(self, tokens, position):
+        condition, params, position = self.parse_and(tokens, position)
+        conditions = [condition]
+        while position < len(tokens) and tokens[position] == "OR":
+            condition, more, position = self.parse_and(tokens, position + 1)
+            conditions.append(condition)
+            params += more
+        return " OR ".join(conditions), params, position
+
+    def parse_and(self, tokens, position):
+        conditions, params = [], []
+        while position < len(tokens) and tokens[position] not in ("OR", ")"):
+            if tokens[position] == "AND":
+                position += 1
+                continue
+            condition, more, position = self.parse_unary(tokens, position)
+            conditions.append(f"({condition})")
+            params += more
+        if not conditions:
+            raise error.BadDataException("Query has an empty expression.")
+        return " AND ".join(conditions), params, position
+
+    def parse_unary(self, tokens, position):
+        token = tokens[position]
+        if token in ("NOT", "-"):
+            if position + 1 >= len(tokens):
+                raise error.BadDataException("Query ends with a negation.")
+            condition, params, position = self.parse_unary(tokens, position + 1)
+            return f"NOT ({condition})", params, position
+        if token == "(":
+            condition, params, position = self.parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position] != ")":
+                raise error.BadDataException("Unbalanced parentheses in query.")
+            return condition, params, position + 1
+        if ":" not in token:
+            raise error.BadDataException(
+                f"Free text search ('{token}') is not supported by the local index."
+            )
+        condition, params = self.compile_term(token)
+        return condition, params, position + 1
+
+
+def get_row(change):
+    """Converts a ChangeInfo entity into a row of the changes table."""
+
+    owner = change.get("owner") or {}
+    return (
+        change["id"],
+        change.get("_number"),
+        change.get("project"),
+        change.get("branch"),
+        change.get("topic"),
+        change.get("status"),
+        owner.get("_account_id"),
+        owner.get("username"),
+        owner.get("email"),
+        owner.get("name"),
+        change.get("updated"),
+        utils.parse_timestamp(change["updated"]) if change.get("updated") else None,
+        json.dumps(change, sort_keys=True),
+    )
+
+
+class ChangeIndex:
+    """SQLite database of changes."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_meta(self, key):
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+        )
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+
+    def upsert(self, changes):
+        """Inserts or replaces changes, returns their number."""
+
+        count = 0
+        with self.connection:
+            for change in changes:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO changes VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    get_row(change),
+                )
+                self.connection.execute(
+                    "DELETE FROM hashtags WHERE id = ?", (change["id"],)
+                )
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO hashtags (id, hashtag) VALUES (?, ?)",
+                    [(change["id"], h.lower()) for h in change.get("hashtags") or ()],
+                )
+                count += 1
+        return count
+
+    def get_open_numbers(self):
+        rows = self.connection.execute(
+            "SELECT number FROM changes WHERE status = 'NEW' "
+            "AND number IS NOT NULL ORDER BY number"
+        )
+        return [row[0] for row in rows]
+
+    def refresh(self, change_client, numbers, batch_size=REFRESH_BATCH_SIZE):
+        """Fetches indexed changes again by their numbers.
+
+        Changes that are not returned any more (deleted or not visible to
+        the caller) are removed from the index.
+
+        :return: Number of fetched changes
+        """
+
+        count = 0
+        for position in range(0, len(numbers), batch_size):
+            batch = numbers[position : position + batch_size]
+            changes = list(
+                change_client.iter_all(
+                    " OR ".join(f"change:{number}" for number in batch),
+                    options=list(SYNC_OPTIONS),
+                    page_size=batch_size,
+                )
+            )
+            count += self.upsert(changes)
+            missing = set(batch) - {change.get("_number") for change in changes}
+            with self.connection:
+                self.connection.executemany(
+                    "DELETE FROM changes WHERE number = ?",
+                    [(number,) for number in sorted(missing)],
+                )
+        return count
+
+    def sync(self, change_client, query, full=False, page_size=500):
+        """Fetches changes updated since the last sync.
+
+        The server returns the most recently updated changes first, so the
+        'updated' timestamp of the index is moved forward only when all
+        changes have been stored: an interrupted sync is simply repeated.
+        Open changes that were indexed before and not fetched by the
+        incremental query are fetched again by their numbers.
+
+        :param change_client: ChangeClient instance
+        :param query: Base query of the changes to be indexed, e.g.
+                      'project:foo'
+        :param full: If True, fetch all changes regardless of the last sync
+        :param page_size: Number of changes fetched and stored per request
+        :raises error.BadDataException: if the index was built for
+                                        another base query
+        :return: Number of fetched changes
+        """
+
+        indexed_query = self.get_meta("query")
+        if not full and indexed_query is not None and indexed_query != query:
+            raise error.BadDataException(
+                f"Index was built for query '{indexed_query}', "
+                "run a full sync to rebuild it."
+            )
+        if full:
+            with self.connection:
+                self.connection.execute("DELETE FROM changes")
+                self.connection.execute("DELETE FROM meta")
+
+        last_updated = self.get_meta("last_updated")
+        sync_query = query
+        open_numbers = []
+        if last_updated:
+            open_numbers = self.get_open_numbers()
+            # Timestamps of the query have a precision of seconds, changes
+            # updated within the last second are fetched again
+            sync_query = f'({query}) since:"{last_updated.partition(".")[0]}"'
+
+        changes = change_client.iter_all(
+            sync_query, options=list(SYNC_OPTIONS), page_size=page_size
+        )
+        count = 0
+        fetched = set()
+        while True:
+            batch = list(itertools.islice(changes, page_size))
+            if not batch:
+                break
+            count += self.upsert(batch)
+            fetched.update(c.get("_number") for c in batch)
+            last_updated = max(
+                [last_updated or "", *(c.get("updated") or "" for c in batch)]
+            )
+        count += self.refresh(
+            change_client, [n for n in open_numbers if n not in fetched]
+        )
+
+        with self.connection:
+            self.set_meta("query", query)
+            if last_updated:
+                self.set_meta("last_updated", last_updated)
+            self.set_meta("synced", str(time.time()))
+        return count
+
+    def query(self, query, limit=None, now=None):
+        """Finds changes matching the query.
+
+        :param query: Query string, see the module documentation
+        :param limit: Maximum number of changes to return
+        :param now: Current time in seconds since the epoch, for 'age'
+        :return: List of ChangeInfo entities, most recently updated first
+        """
+
+        condition, params = QueryCompiler(now=now).compile(query)
+        sql = f"SELECT data FROM changes WHERE {condition} ORDER BY updated_ts DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self.connection.execute(sql, params)]
@@ -0,0 +1,168 @@
+"""Review latency metrics of changes and their aggregation.
+
+Per-change metrics are computed from the change metadata and its
+messages: the time from the creation of a change to the first message
+of a reviewer (anyone but the owner, ignoring autogenerated messages
+of the server and bots) and the time from creation to submission.
+
+Metrics are aggregated into percentiles by project, owner or reviewer.
+Values of every group are collected into a flat list and sorted once,
+so all percentiles of a group are read by index and summarizing many
+thousands of changes takes a fraction of a second.
+"""
+
+from gerritclient.common import bulk, utils
+
+FIRST_REVIEW = "first_review"
+MERGE = "merge"
+METRICS = (FIRST_REVIEW, MERGE)
+
+GROUP_BY = ("project", "owner", "reviewer")
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# Tags of messages posted by the server and bots start with this prefix
+AUTOGENERATED_TAG_PREFIX = "autogenerated:"
+
+UNITS = {"seconds": 1, "minutes": 60, "hours": 3600, "days": 86400}
+
+
+def is_review_message(message, owner_id):
+    """Checks whether the message was posted by a reviewer of the change."""
+
+    author = (message.get("author") or {}).get("_account_id")
+    tag = message.get("tag") or ""
+    return (
+        author is not None
+        and author != owner_id
+        and not tag.startswith(AUTOGENERATED_TAG_PREFIX)
+    )
+
+
+def get_metrics(change, messages):
+    """Computes latency metrics of a change.
+
+    :param change: ChangeInfo entity
+    :param messages: List of ChangeMessageInfo entities of the change
+    :return: Dict with the change number, project, owner, the seconds to
+             the first review and to merge (None if not happened yet) and
+             the 'reviewers' dict of account IDs to the seconds to their
+             first review
+    """
+
+    owner = (change.get("owner") or {}).get("_account_id")
+    created = utils.parse_timestamp(change["created"])
+    reviewers = {}
+    for message in sorted(messages or (), key=lambda m: m["date"]):
+        if not is_review_message(message, owner):
+            continue
+        account = message["author"]["_account_id"]
+        if account not in reviewers:
+            reviewers[account] = utils.parse_timestamp(message["date"]) - created
+
+    merge = None
+    if change.get("status") == "MERGED" and change.get("submitted"):
+        merge = utils.parse_timestamp(change["submitted"]) - created
+
+    return {
+        "number": change.get("_number"),
+        "project": change.get("project"),
+        "owner": owner,
+        FIRST_REVIEW: min(reviewers.values()) if reviewers else None,
+        MERGE: merge,
+        "reviewers": reviewers,
+    }
+
+
+def get_group_values(metrics, group_by, metric):
+    """Yields (group, value) pairs of the metric of a change.
+
+    Grouped by reviewer, the first review of every reviewer counts
+    separately, while other metrics count for every reviewer of the change.
+    """
+
+    if group_by == "reviewer":
+        for account, seconds in metrics["reviewers"].items():
+            yield account, seconds if metric == FIRST_REVIEW else metrics[metric]
+    else:
+        yield metrics[group_by], metrics[metric]
+
+
+def percentile(values, p):
+    """Returns the p-th percentile of sorted values (linear interpolation)."""
+
+    position = (len(values) - 1) * p / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def aggregate(
+    metrics_list, group_by, metric, percentiles=DEFAULT_PERCENTILES, unit="hours"
+):
+    """Summarizes a metric of many changes by groups.
+
+    :param metrics_list: Iterable of dicts returned by get_metrics()
+    :param group_by: One of GROUP_BY
+    :param metric: One of METRICS
+    :param percentiles: Percentiles to compute, numbers from 0 to 100
+    :param unit: One of UNITS keys
+    :return: List of tuples (group, count, mean, *percentiles) sorted by
+             group, changes without a value of the metric are not counted
+    """
+
+    if group_by not in GROUP_BY:
+        raise ValueError(f"Unsupported grouping '{group_by}'.")
+    if metric not in METRICS:
+        raise ValueError(f"Unsupported metric '{metric}'.")
+    scale = UNITS[unit]
+
+    groups = {}
+    for metrics in metrics_list:
+        for group, value in get_group_values(metrics, group_by, metric):
+            if value is not None:
+                groups.setdefault(group, []).append(value)
+
+    rows = []
+    for group in sorted(groups, key=str):
+        values = sorted(groups[group])
+        rows.append(
+            (
+                group,
+                len(values),
+                round(sum(values) / len(values) / scale, 2),
+                *(round(percentile(values, p) / scale, 2) for p in percentiles),
+            )
+        )
+    return rows
+
+
+class LatencyCollector:
+    """Fetches data of changes and computes their latency metrics."""
+
+    def __init__(self, change_client):
+        self.change_client = change_client
+
+    def fetch(self, change):
+        """Fetches messages (and metadata, if missing) of a change.
+
+        :param change: ChangeInfo entity or a dict with the 'id' field only
+        :return: Dict of metrics, see get_metrics()
+        """
+
+        if "created" not in change:
+            change = self.change_client.get_by_id(change["id"])
+        messages = change.get("messages")
+        if messages is None:
+            messages = self.change_client.get_messages(change["id"])
+        return get_metrics(change, messages)
+
+    def collect(self, changes, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Computes metrics of all changes concurrently.
+
+        :param changes: Iterable of ChangeInfo entities, consumed lazily
+        :return: Generator of bulk.Result entries with dicts of metrics
+        """
+
+        return bulk.run_concurrently(
+            self.fetch, changes, max_workers=max_workers, retry_policy=retry_policy
+        )
@@ -0,0 +1,162 @@
+"""Merging messages of many changes into one timestamp-ordered stream.
+
+Messages of every change are fetched concurrently and sorted by date.
+No message can be written before the messages of all changes are
+fetched, as the last change may have the oldest message, so fetched
+messages are collected into a buffer which is sorted and spilled into
+a temporary file (a run) whenever it gets full. When all changes are
+fetched, the runs are merged with a k-way heap merge (see heapq.merge),
+reading every run line by line. This way memory usage is bounded by the
+size of the buffer, not by the number of messages.
+"""
+
+import heapq
+import json
+import os
+import shutil
+import tempfile
+
+from gerritclient.common import bulk
+
+# Fields of records and their Parquet types, changes are numbers or ids
+RECORD_TYPES = {
+    "date": "string",
+    "change": "string",
+    "project": "string",
+    "id": "string",
+    "author": "int64",
+    "real_author": "int64",
+    "tag": "string",
+    "revision_number": "int64",
+    "message": "string",
+}
+RECORD_FIELDS = tuple(RECORD_TYPES)
+
+# Number of messages kept in memory before they are spilled to disk
+DEFAULT_RUN_SIZE = 100000
+
+
+def get_records(change, messages):
+    """Converts messages of a change into flat records sorted by date.
+
+    :param change: ChangeInfo entity or a dict with the 'id' field only
+    :param messages: List of ChangeMessageInfo entities
+    :return: List of dicts with RECORD_FIELDS keys
+    """
+
+    records = []
+    for message in messages or ():
+        author = message.get("author") or {}
+        real_author = message.get("real_author") or author
+        records.append(
+            {
+                "date": message.get("date"),
+                "change": change.get("_number") or change["id"],
+                "project": change.get("project"),
+                "id": message.get("id"),
+                "author": author.get("_account_id"),
+                "real_author": real_author.get("_account_id"),
+                "tag": message.get("tag"),
+                "revision_number": message.get("_revision_number"),
+                "message": message.get("message"),
+            }
+        )
+    return sorted(records, key=get_sort_key)
+
+
+def get_sort_key(record):
+    """Orders records by date, then by change and message.
+
+    Gerrit timestamps have a fixed width, so they are compared as strings.
+    """
+
+    return record["date"] or "", str(record["change"]), record["id"] or ""
+
+
+def read_run(path):
+    """Yields records of a run file one by one."""
+
+    with open(path, "r", encoding="utf-8") as stream:
+        for line in stream:
+            yield json.loads(line)
+
+
+class MessageStream:
+    """Fetches messages of changes and merges them by date."""
+
+    def __init__(self, change_client, run_size=DEFAULT_RUN_SIZE):
+        if run_size <= 0:
+            raise ValueError("Run size must be greater than 0.")
+        self.change_client = change_client
+        self.run_size = run_size
+        self.buffer = []
+        # Paths to the run files in a temporary directory
+        self.runs = []
+        self.count = 0
+        self._directory = None
+
+    def fetch(self, change):
+        """Returns messages of the change as a list of flat records.
+
+        :param change: ChangeInfo entity or a dict with the 'id' field only
+        """
+
+        messages = change.get("messages")
+        if messages is None:
+            messages = self.change_client.get_messages(change["id"])
+        return get_records(change, messages)
+
+    def spill(self):
+        """Writes the sorted buffer into a new run."""
+
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="gerrit-messages-")
+        path = os.path.join(self._directory, f"{len(self.runs)}.jsonl")
+        self.buffer.sort(key=get_sort_key)
+        with open(path, "w", encoding="utf-8") as stream:
+            for record in self.buffer:
+                stream.write(json.dumps(record))
+                stream.write("\n")
+        self.runs.append(path)
+        self.buffer = []
+
+    def collect(self, changes, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Fetches messages of all changes concurrently.
+
+        Messages are kept until merged, consume the results before
+        calling merge().
+
+        :param changes: Iterable of ChangeInfo entities, consumed lazily
+        :return: Generator of bulk.Result entries with lists of records
+        """
+
+        for result in bulk.run_concurrently(
+            self.fetch, changes, max_workers=max_workers, retry_policy=retry_policy
+        ):
+            if result.status == bulk.OK:
+                self.buffer.extend(result.value)
+                self.count += len(result.value)
+                if len(self.buffer) >= self.run_size:
+                    self.spill()
+            yield result
+
+    def merge(self):
+        """Returns a generator of all collected records ordered by date."""
+
+        self.buffer.sort(key=get_sort_key)
+        runs = [read_run(path) for path in self.runs]
+        return heapq.merge(*runs, self.buffer, key=get_sort_key)
+
+    def close(self):
+        """Removes the runs."""
+
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+        self.runs = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,263 @@
+"""Downloading formatted patches of many changes to disk.
+
+Patches are decoded while they are downloaded and written straight to
+disk: into separate '.patch' files of a directory, or into one mbox file
+or tar archive. Workers can not write into one archive at the same time,
+so every patch is spooled into a temporary file first and appended to
+the archive under a lock, which keeps memory usage independent of the
+size and number of patches.
+"""
+
+import abc
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+
+from gerritclient import error
+from gerritclient.common import bulk, export, utils
+
+DIRECTORY = "dir"
+MBOX = "mbox"
+TAR = "tar"
+ARCHIVE_FORMATS = (DIRECTORY, MBOX, TAR)
+
+TAR_MODES = {
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+
+
+def get_archive_format(path):
+    """Guesses the archive format by the extension, directory by default."""
+
+    name = os.path.basename(path.rstrip(os.sep)).lower()
+    if any(name.endswith(extension) for extension in TAR_MODES):
+        return TAR
+    root, extension = os.path.splitext(name)
+    if extension == ".mbox" or (
+        extension in export.COMPRESSION_EXTENSIONS and root.endswith(".mbox")
+    ):
+        return MBOX
+    return DIRECTORY
+
+
+def get_patch_name(change, revision="current"):
+    """Returns the name of the patch file of a change revision.
+
+    :param change: ChangeInfo entity (with the current revision, if the
+                   revision is 'current') or a dict with the 'id' only
+    :param revision: Revision identifier
+    :return: Name like '12345-3.patch' (change and patch set numbers)
+    """
+
+    name = change.get("_number") or utils.normalize(change["id"])
+    current = change.get("current_revision")
+    if revision == "current" and current in (change.get("revisions") or {}):
+        revision = change["revisions"][current].get("_number", revision)
+    return f"{name}-{revision}.patch"
+
+
+def write_chunks(chunks, stream):
+    """Writes chunks of bytes to the stream, returns the number of bytes."""
+
+    size = 0
+    for chunk in chunks:
+        stream.write(chunk)
+        size += len(chunk)
+    return size
+
+
+class PatchDirectory:
+    """Writes every patch to a separate file of a directory."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.path, name))
+
+    def add(self, name, chunks):
+        """Writes the patch, replacing the file only when it is complete."""
+
+        target = os.path.join(self.path, name)
+        partial = f"{target}.part"
+        try:
+            with open(partial, "wb") as stream:
+                size = write_chunks(chunks, stream)
+            os.replace(partial, target)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return size
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class SpooledArchive(abc.ABC):
+    """Base class of archives to which patches are appended one by one."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def exists(self, name):
+        # Archives are always written from scratch
+        return False
+
+    @abc.abstractmethod
+    def append(self, name, spool, size):
+        """Appends the patch from the spool file, called under the lock."""
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+    def add(self, name, chunks):
+        """Downloads the patch to a temporary file and appends it."""
+
+        with tempfile.TemporaryFile() as spool:
+            size = write_chunks(chunks, spool)
+            spool.seek(0)
+            with self._lock:
+                self.append(name, spool, size)
+        return size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PatchMbox(SpooledArchive):
+    """Concatenates patches into one (possibly compressed) mbox file.
+
+    Patches in git format-patch format start with a 'From <sha1>' line,
+    so the concatenation of them is a valid mbox file.
+    """
+
+    def __init__(self, path, compression=None):
+        super().__init__(path)
+        compression = compression or export.get_compression(path)
+        if compression is not None and compression not in export.COMPRESSORS:
+            raise ValueError(f"Unsupported compression '{compression}'.")
+        opener = export.COMPRESSORS.get(compression, open)
+        self._stream = opener(path, "wb")
+
+    def append(self, name, spool, size):
+        shutil.copyfileobj(spool, self._stream)
+        if size:
+            spool.seek(-1, os.SEEK_END)
+            if spool.read(1) != b"\n":
+                self._stream.write(b"\n")
+
+    def close(self):
+        self._stream.close()
+
+
+class PatchTar(SpooledArchive):
+    """Stores patches as members of a (possibly compressed) tar archive."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        name = os.path.basename(path).lower()
+        mode = next(
+            (m for extension, m in TAR_MODES.items() if name.endswith(extension)),
+            "w",
+        )
+        self._tar = tarfile.TarFile.open(path, mode)
+
+    def append(self, name, spool, size):
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mode = 0o644
+        self._tar.addfile(info, spool)
+
+    def close(self):
+        self._tar.close()
+
+
+def get_archive(path, archive_format=None, compression=None):
+    """Creates an archive for patches.
+
+    :param path: Path to the directory or the archive file
+    :param archive_format: One of ARCHIVE_FORMATS, guessed by the extension
+                           if None
+    :param compression: Compression of an mbox file, guessed by the
+                        extension if None
+    """
+
+    archive_format = archive_format or get_archive_format(path)
+    if compression is not None and archive_format != MBOX:
+        raise error.BadDataException(
+            "Compression can be set for mbox files only, tar archives are "
+            "compressed according to the extension."
+        )
+    if archive_format == DIRECTORY:
+        return PatchDirectory(path)
+    if archive_format == MBOX:
+        return PatchMbox(path, compression=compression)
+    if archive_format == TAR:
+        return PatchTar(path)
+    raise ValueError(f"Unsupported archive format '{archive_format}'.")
+
+
+class PatchDownloader:
+    """Downloads patches of change revisions into an archive."""
+
+    def __init__(self, change_client, archive, revision="current", skip_existing=False):
+        self.change_client = change_client
+        self.archive = archive
+        self.revision = revision
+        self.skip_existing = skip_existing
+
+    def download(self, change):
+        """Downloads the patch of the change.
+
+        :param change: ChangeInfo entity or a dict with the 'id' only
+        :raises bulk.SkipItem: if the patch file already exists and
+                               existing files are skipped
+        :return: Tuple of (name of the patch, size in bytes)
+        """
+
+        revision = self.revision
+        if revision == "current":
+            # The patch set number of the current revision names the file
+            if change.get("current_revision") not in (change.get("revisions") or {}):
+                change = dict(
+                    self.change_client.get_by_id(
+                        change["id"], options=["CURRENT_REVISION"]
+                    ),
+                    id=change["id"],
+                )
+            # Download the revision the file is named after, even if a new
+            # patch set is uploaded in the meantime
+            revision = change["current_revision"]
+        name = get_patch_name(change, self.revision)
+        if self.skip_existing and self.archive.exists(name):
+            raise bulk.SkipItem(f"{name} already exists.")
+        chunks = self.change_client.iter_patch(change["id"], revision_id=revision)
+        return name, self.archive.add(name, chunks)
+
+    def run(self, changes, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Downloads patches of all changes concurrently.
+
+        :return: Generator of bulk.Result entries
+        """
+
+        return bulk.run_concurrently(
+            self.download, changes, max_workers=max_workers, retry_policy=retry_policy
+        )
@@ -0,0 +1,104 @@
+"""Rebasing many changes with respect to their relation chains.
+
+Changes are grouped into relation chains and every chain is rebased from
+its root to its tip: the server rebases a change onto the current patch
+set of its parent, so the parent has to be rebased first. Independent
+chains are rebased concurrently. A conflict stops the rest of its chain
+only, the changes depending on it are reported as blocked.
+"""
+
+import operator
+
+from gerritclient import error
+from gerritclient.common import bulk, graph
+
+
+def is_up_to_date_error(exc):
+    """Checks whether the server refused the rebase as a no-op."""
+
+    return exc.status_code == 409 and "up to date" in str(exc).lower()
+
+
+class ChainRebaser:
+    """Plans and rebases a set of changes, chain roots first."""
+
+    def __init__(self, change_client):
+        self.change_client = change_client
+        # Change number -> ChangeInfo of all changes to be rebased
+        self.changes = {}
+        # Change number -> numbers of the changes it has to be rebased after
+        self.dependencies = {}
+
+    def fetch(self, change):
+        """Fetches the change (if needed) and its relation chain.
+
+        :return: Tuple of (ChangeInfo, RelatedChangesInfo)
+        """
+
+        if "_number" not in change:
+            change = self.change_client.get_by_id(change["id"])
+        return change, self.change_client.get_related_changes(change["id"])
+
+    def plan(self, changes, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Builds the dependency graph of changes from relation chains.
+
+        :param changes: List of ChangeInfo entities or dicts with 'id'
+        :raises error.BadDataException: if the data of any change can not
+                                        be fetched
+        :return: Dict of change numbers to the sets of their parents
+        """
+
+        try:
+            fetched = bulk.run_all(
+                self.fetch,
+                changes,
+                max_workers=max_workers,
+                retry_policy=retry_policy,
+                get_id=operator.itemgetter("id"),
+            )
+        except error.BadDataException as e:
+            raise error.BadDataException(f"Unable to plan the rebase: {e}")
+
+        self.changes = {change["_number"]: change for change, _ in fetched}
+        self.dependencies = graph.get_chain_dependencies(
+            self.changes, (related for _, related in fetched)
+        )
+        return self.dependencies
+
+    def get_chain_root(self, number):
+        """Returns the number of the root change of the change's chain."""
+
+        # Every change depends on one parent at most
+        while self.dependencies[number]:
+            (number,) = self.dependencies[number]
+        return number
+
+    def rebase(self, number):
+        """Rebases the change onto its parent or the target branch.
+
+        :raises bulk.SkipItem: if the change is not open or up to date
+        :return: ChangeInfo entity of the rebased change
+        """
+
+        change = self.changes[number]
+        if change.get("status", "NEW") != "NEW":
+            raise bulk.SkipItem(f"Change status is {change['status']}.")
+        try:
+            return self.change_client.rebase(change["id"])
+        except error.HTTPError as e:
+            if is_up_to_date_error(e):
+                raise bulk.SkipItem("Change is already up to date.")
+            raise
+
+    def run(self, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Rebases all planned changes in dependency order.
+
+        :return: Generator of bulk.Result entries
+        """
+
+        return bulk.run_dependent(
+            self.rebase,
+            self.dependencies,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+        )
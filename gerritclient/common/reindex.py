@@ -0,0 +1,51 @@
+"""Reindexing large numbers of changes.
+
+Change identifiers come from a query or a file and are streamed, so
+memory usage does not depend on the number of changes. Successfully
+reindexed changes are recorded in a journal file, which allows an
+interrupted run to be resumed without indexing the same changes again.
+"""
+
+import os
+import threading
+
+
+def read_change_ids(file_path):
+    """Reads change identifiers from a file, one per line.
+
+    Empty lines and lines starting with '#' are ignored.
+
+    :param file_path: Path to the file
+    :return: Generator of change identifiers
+    """
+
+    with open(file_path, "r") as stream:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+class ResumeJournal:
+    """Records processed change identifiers in a file (one per line)."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Returns the set of identifiers recorded by previous runs."""
+
+        if not os.path.exists(self.file_path):
+            return set()
+        return set(read_change_ids(self.file_path))
+
+    def record(self, change_id):
+        """Appends the identifier to the journal, safe to call concurrently.
+
+        The file is reopened for every record, so the journal stays usable
+        if the process is killed.
+        """
+
+        with self._lock, open(self.file_path, "a") as stream:
+            stream.write(f"{change_id}\n")
@@ -0,0 +1,210 @@
+"""Crawling dependency graphs of changes from a set of seed changes.
+
+Relations of every change (its relation chain and the changes that would
+be submitted together with it) are fetched concurrently, wave by wave,
+and the related changes not visited yet form the next wave. Visiting a
+change costs three requests: the change itself, its relation chain and
+the changes submitted together with it. The chain of a revision reports
+the parents of all of its members, so a whole stack is discovered by the
+first wave after any of its members, but every member is still visited,
+since the chain of a member may differ from the chains of the others
+(e.g. for siblings in a branching stack).
+
+Relations are cached by revision SHA-1: a cache kept on disk between
+runs saves all but one request per change whose current revision did not
+change. Note that the cached relations of a revision do not reflect
+changes uploaded on top of it later.
+"""
+
+import json
+import os
+import threading
+
+from gerritclient import error
+from gerritclient.common import bulk, graph
+
+NODE_FIELDS = ("id", "project", "branch", "subject", "status")
+
+
+class EdgeCache:
+    """Thread-safe cache of relations keyed by revision SHA-1."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r") as stream:
+                    self._entries = json.load(stream)
+            except ValueError as e:
+                raise error.BadDataException(f"Malformed cache {path}: {e}")
+
+    def get(self, revision):
+        with self._lock:
+            return self._entries.get(revision)
+
+    def set(self, revision, entry):
+        with self._lock:
+            self._entries[revision] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self):
+        """Writes the cache atomically, if it is kept on disk."""
+
+        if not self.path:
+            return
+        partial = f"{self.path}.part"
+        with self._lock, open(partial, "w") as stream:
+            json.dump(self._entries, stream, sort_keys=True)
+        os.replace(partial, self.path)
+
+
+class RelationCrawler:
+    """Builds the dependency graph of changes related to seed changes."""
+
+    def __init__(self, change_client, cache=None, max_changes=None):
+        self.change_client = change_client
+        self.cache = cache if cache is not None else EdgeCache()
+        self.max_changes = max_changes
+        # Change number -> node attributes (see NODE_FIELDS)
+        self.nodes = {}
+        # Change number -> parent change number (None if not a change)
+        self.parents = {}
+        # Change number -> numbers of the changes submitted together with it
+        self.together = {}
+        # Change identifier -> reason, for changes that could not be visited
+        self.failures = {}
+
+    def fetch_relations(self, change, revision):
+        """Returns relations of the revision, from the cache if possible."""
+
+        entry = self.cache.get(revision)
+        if entry is None:
+            related = self.change_client.get_related_changes(
+                change["id"], revision_id=revision
+            )
+            together = self.change_client.get_submitted_together(change["id"])
+            # With some options the server returns SubmittedTogetherInfo
+            if isinstance(together, dict):
+                together = together.get("changes") or []
+            entry = {
+                "chain": {
+                    str(number): parent
+                    for number, parent in graph.get_chain_parents(related).items()
+                },
+                "together": sorted(c["_number"] for c in together),
+            }
+            self.cache.set(revision, entry)
+        return entry
+
+    def visit(self, change_id):
+        """Fetches a change and its relations.
+
+        :return: Tuple of (ChangeInfo, relations entry of the cache)
+        """
+
+        change = self.change_client.get_by_id(
+            str(change_id), options=["CURRENT_REVISION"]
+        )
+        return change, self.fetch_relations(change, change["current_revision"])
+
+    def crawl(self, seeds, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Visits the seed changes and all changes related to them.
+
+        :param seeds: Iterable of change identifiers
+        :return: Dict of change numbers to the sets of numbers of the
+                 changes they depend on, see get_dependencies()
+        """
+
+        wave = list(dict.fromkeys(str(s) for s in seeds))
+        while wave:
+            if self.max_changes is not None:
+                wave = wave[: max(self.max_changes - len(self.nodes), 0)]
+            neighbors = set()
+            for result in bulk.run_concurrently(
+                self.visit, wave, max_workers=max_workers, retry_policy=retry_policy
+            ):
+                if result.status != bulk.OK:
+                    self.failures[result.item] = result.detail
+                    continue
+                change, entry = result.value
+                number = change["_number"]
+                if number in self.nodes:
+                    # A seed given by another identifier of a visited change
+                    continue
+                self.nodes[number] = {k: change.get(k) for k in NODE_FIELDS}
+                self.nodes[number]["revision"] = change["current_revision"]
+                for member, parent in entry["chain"].items():
+                    self.parents[int(member)] = parent
+                self.together[number] = set(entry["together"]) - {number}
+                neighbors.update(int(member) for member in entry["chain"])
+                neighbors.update(entry["together"])
+            wave = sorted(n for n in neighbors if n not in self.nodes)
+            wave = [str(n) for n in wave if str(n) not in self.failures]
+        return self.get_dependencies()
+
+    def get_dependencies(self):
+        """Builds the graph of the visited changes.
+
+        A change depends on its closest ancestor among the visited changes
+        and on the changes submitted together with it that would not be
+        submitted together with the change itself (e.g. its ancestors).
+        Redundant (transitive) dependencies are dropped.
+
+        :return: Dict of change numbers to the sets of their parents
+        """
+
+        dependencies = {}
+        for number in self.nodes:
+            ancestor = graph.get_nearest_ancestor(number, self.parents, self.nodes)
+            dependencies[number] = set() if ancestor is None else {ancestor}
+            for other in self.together.get(number, ()):
+                if other in self.nodes and number not in self.together.get(other, ()):
+                    dependencies[number].add(other)
+        if graph.find_cycles(dependencies):
+            return dependencies
+        return graph.transitive_reduction(dependencies)
+
+    def get_groups(self):
+        """Returns groups of visited changes that are submitted together."""
+
+        groups = {}
+        for number, others in self.together.items():
+            group = {number} | {o for o in others if number in self.together.get(o, ())}
+            if len(group) > 1:
+                groups[min(group)] = sorted(group)
+        return [groups[key] for key in sorted(groups)]
+
+    def to_json(self, dependencies):
+        """Returns the graph as a JSON-serializable dict.
+
+        The 'order' is the topological order of changes (parents first),
+        None if there are cycles, which are listed in 'cycles'.
+        """
+
+        cycles = graph.find_cycles(dependencies)
+        return {
+            "nodes": [
+                {"number": number, **self.nodes[number]}
+                for number in sorted(self.nodes)
+            ],
+            "edges": [
+                [number, parent]
+                for number in sorted(dependencies)
+                for parent in sorted(dependencies[number])
+            ],
+            "groups": self.get_groups(),
+            "order": None if cycles else graph.topological_sort(dependencies),
+            "cycles": cycles,
+            "failures": self.failures,
+        }
+
+    def to_dot(self, dependencies):
+        labels = {
+            number: f"{number}: {node.get('subject') or ''}"
+            for number, node in self.nodes.items()
+        }
+        return graph.to_dot(dependencies, labels=labels)
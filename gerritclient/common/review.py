@@ -0,0 +1,139 @@
+"""Posting reviews (votes and messages) on many changes at once.
+
+A review entry is a dictionary with the 'change' identifier, an optional
+'revision' (defaults to 'current') and any fields of the ReviewInput
+entity ('labels', 'message', 'tag', 'notify', ...). Reviews whose votes
+already match the current label state of the change are skipped, unless
+they also post a message, comments or change the work-in-progress state.
+"""
+
+import json
+import os
+import threading
+
+from gerritclient import error
+from gerritclient.common import bulk, utils
+
+REVIEW_FIELDS = (
+    "message",
+    "labels",
+    "comments",
+    "tag",
+    "notify",
+    "on_behalf_of",
+    "ready",
+    "work_in_progress",
+)
+
+# Fields which are posted even if the votes are already in place
+CONTENT_FIELDS = ("message", "comments", "ready", "work_in_progress")
+
+
+def load_manifest(file_path):
+    """Reads review entries from a JSON Lines, JSON or YAML file.
+
+    :param file_path: Path to the file, the format is defined by extension
+                      ('.jsonl' for JSON Lines)
+    :return: List of review entries
+    """
+
+    if os.path.splitext(file_path)[1] == ".jsonl":
+        entries = []
+        with open(file_path, "r") as stream:
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError as e:
+                    raise error.BadDataException(f"{file_path}:{line_number}: {e}")
+    else:
+        entries = utils.read_from_file(file_path)
+
+    if not isinstance(entries, list):
+        raise error.BadDataException("Manifest must contain a list of reviews.")
+    for entry in entries:
+        if not isinstance(entry, dict) or "change" not in entry:
+            raise error.BadDataException(
+                f"Every review must define the 'change' identifier: {entry}"
+            )
+        # Numeric change identifiers are allowed in the manifest
+        entry["change"] = str(entry["change"])
+    return entries
+
+
+def get_votes(change, account_id):
+    """Returns votes of the account on the current revision of the change.
+
+    :param change: ChangeInfo entity fetched with DETAILED_LABELS option
+    :param account_id: Numeric account identifier
+    :return: A dict of label names to voting values
+    """
+
+    votes = {}
+    for label, label_info in (change.get("labels") or {}).items():
+        for approval in label_info.get("all", ()):
+            if approval.get("_account_id") == account_id:
+                votes[label] = approval.get("value", 0)
+    return votes
+
+
+def is_redundant(labels, votes):
+    """Checks whether all requested votes are already in place."""
+
+    return bool(labels) and all(
+        votes.get(label, 0) == value for label, value in labels.items()
+    )
+
+
+class BulkReviewer:
+    """Posts reviews, skipping those whose votes are already in place."""
+
+    def __init__(self, change_client, account_client, deduplicate=True):
+        self.change_client = change_client
+        self.account_client = account_client
+        self.deduplicate = deduplicate
+        self._account_ids = {}
+        self._lock = threading.Lock()
+
+    def get_account_id(self, account="self"):
+        """Resolves (and caches) numeric identifier of the account."""
+
+        with self._lock:
+            if account not in self._account_ids:
+                info = self.account_client.get_by_id(account)
+                self._account_ids[account] = info["_account_id"]
+            return self._account_ids[account]
+
+    def post(self, entry, change=None):
+        """Posts a review entry.
+
+        :param entry: Review entry
+        :param change: ChangeInfo entity with detailed labels, if it is
+                       already known. Otherwise it is fetched when needed.
+        :raises bulk.SkipItem: if the votes are already in place and
+                               there is nothing else to post
+        :return: A ReviewResult entity
+        """
+
+        revision = entry.get("revision", "current")
+        labels = entry.get("labels")
+        # Labels of a change reflect the current revision only
+        if (
+            self.deduplicate
+            and labels
+            and revision == "current"
+            and not any(entry.get(k) for k in CONTENT_FIELDS)
+        ):
+            if change is None:
+                change = self.change_client.get_by_id(
+                    entry["change"], options=["DETAILED_LABELS"]
+                )
+            account_id = self.get_account_id(entry.get("on_behalf_of") or "self")
+            if is_redundant(labels, get_votes(change, account_id)):
+                raise bulk.SkipItem("Votes are already in place.")
+
+        review = {k: entry[k] for k in REVIEW_FIELDS if k in entry}
+        return self.change_client.set_review(
+            entry["change"], revision_id=revision, **review
+        )
@@ -0,0 +1,139 @@
+"""Adding reviewers to many changes, skipping those already present.
+
+Gerrit adds members of a group instead of the group itself, so a group
+counts as present when all its members are on the change. Members of a
+group are fetched once and reused for all changes.
+"""
+
+import threading
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+
+def account_matches(account, reviewer):
+    """Checks whether the account is identified by the reviewer string.
+
+    :param account: AccountInfo entity
+    :param reviewer: Account ID, username, email or full name
+    """
+
+    identifiers = (
+        str(account.get("_account_id")),
+        account.get("username"),
+        account.get("email"),
+        account.get("name"),
+    )
+    return str(reviewer) in identifiers
+
+
+def get_present_accounts(change, state="REVIEWER"):
+    """Returns accounts that are already on the change in the given state.
+
+    Reviewers also count as present when a CC is requested.
+
+    :param change: ChangeInfo entity fetched with DETAILED_LABELS option
+    :param state: Requested reviewer state ('REVIEWER'|'CC')
+    :return: List of AccountInfo entities
+    """
+
+    states = ("REVIEWER",) if state == "REVIEWER" else ("REVIEWER", "CC")
+    reviewers = change.get("reviewers") or {}
+    return [account for s in states for account in reviewers.get(s, ())]
+
+
+class ReviewerAssigner:
+    """Adds a set of reviewers (accounts or groups) to changes."""
+
+    def __init__(
+        self,
+        change_client,
+        reviewers,
+        state="REVIEWER",
+        notify="NONE",
+        confirmed=None,
+        group_client=None,
+    ):
+        """Creates ReviewerAssigner.
+
+        :param group_client: Client to fetch members of groups. If it is
+                             not given, groups are always added.
+        """
+
+        self.change_client = change_client
+        self.reviewers = reviewers
+        self.state = state
+        self.notify = notify
+        self.confirmed = confirmed
+        self.group_client = group_client
+        self._members = {}
+        self._lock = threading.Lock()
+
+    def get_members(self, reviewer):
+        """Resolves (and caches) members of the group.
+
+        :return: List of AccountInfo entities or None if the reviewer is
+                 not a group
+        """
+
+        with self._lock:
+            if reviewer not in self._members:
+                try:
+                    members = self.group_client.get_members(reviewer)
+                except error.HTTPError as e:
+                    if e.status_code != 404:
+                        raise
+                    members = None
+                self._members[reviewer] = members
+            return self._members[reviewer]
+
+    def is_present(self, reviewer, present):
+        if any(account_matches(account, reviewer) for account in present):
+            return True
+        if self.group_client is None:
+            return False
+        members = self.get_members(reviewer)
+        return bool(members) and all(
+            any(a.get("_account_id") == m.get("_account_id") for a in present)
+            for m in members
+        )
+
+    def get_missing(self, change):
+        """Returns reviewers that are not on the change yet.
+
+        :param change: ChangeInfo entity. If it has no 'reviewers' field
+                       (no detailed labels), it is fetched again with them.
+        """
+
+        if "reviewers" not in change:
+            change = self.change_client.get_by_id(
+                change["id"], options=["DETAILED_LABELS", "DETAILED_ACCOUNTS"]
+            )
+        present = get_present_accounts(change, self.state)
+        return [r for r in self.reviewers if not self.is_present(r, present)]
+
+    def assign(self, change):
+        """Adds missing reviewers to the change.
+
+        :raises bulk.SkipItem: if all reviewers are already present
+        :return: List of added reviewers
+        """
+
+        missing = self.get_missing(change)
+        if not missing:
+            raise bulk.SkipItem("All reviewers are already present.")
+
+        errors = []
+        for reviewer in missing:
+            result = self.change_client.add_reviewer(
+                change["id"],
+                reviewer,
+                state=self.state,
+                confirmed=self.confirmed,
+                notify=self.notify,
+            )
+            if result.get("error"):
+                errors.append(f"{reviewer}: {result['error']}")
+        if errors:
+            raise error.BadDataException("; ".join(errors))
+        return missing
@@ -0,0 +1,302 @@
+"""Downloading files of a revision into a directory tree.
+
+The whole tree of a revision is extracted from its archive, which is
+streamed by one request and never held in memory or on disk as a whole.
+Alternatively only the files modified by the revision (relative to its
+parent or the given base) are listed by one request and their contents
+are fetched concurrently. Either way files are written to temporary
+files that replace the targets only when complete, and modes of
+executable files and symbolic links are preserved.
+
+The size and SHA-256 hash of every written file are stored in a manifest
+in the destination directory, so an interrupted snapshot can be resumed:
+files whose size and hash still match are not written again. The
+manifest is bound to the revision, so 'current' should be resolved to
+the commit first.
+"""
+
+import hashlib
+import io
+import json
+import os
+import stat
+import tarfile
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+MANIFEST_NAME = ".gerrit-snapshot.json"
+
+# Git file modes of symbolic links and submodules
+SYMLINK_MODE = 0o120000
+GITLINK_MODE = 0o160000
+
+# Status of FileInfo entities of deleted files
+DELETED = "D"
+
+
+def parse_mode(value):
+    """Converts a git file mode into an integer.
+
+    Servers report modes either as integers or in octal representation
+    (e.g. 100644), the latter is recognized by its magnitude and digits.
+
+    :return: Integer mode or None if the mode is unknown
+    """
+
+    if value is None:
+        return None
+    digits = str(value)
+    if int(value) >= 100000 and set(digits) <= set("01234567"):
+        return int(digits, 8)
+    return int(value)
+
+
+def get_file_hash(path, chunk_size=64 * 1024):
+    """Returns the SHA-256 hex digest of a file's content."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_target(destination, file_path):
+    """Resolves the file path within the destination directory.
+
+    :raises error.BadDataException: if the path points outside of it or
+                                    leads through a symbolic link (e.g.
+                                    one written by an earlier file)
+    """
+
+    root = os.path.realpath(destination)
+    target = os.path.normpath(os.path.join(root, file_path))
+    if (
+        os.path.isabs(file_path)
+        or target == root
+        or os.path.commonpath([root, target]) != root
+    ):
+        raise error.BadDataException(f"Unsafe file path '{file_path}'.")
+    parent = os.path.dirname(target)
+    if os.path.realpath(parent) != parent:
+        raise error.BadDataException(
+            f"Unsafe file path '{file_path}', it leads through a symbolic link."
+        )
+    return target
+
+
+def select_files(files):
+    """Leaves out deleted files and magic files like '/COMMIT_MSG'.
+
+    :param files: Dict of file paths to FileInfo entities
+    :return: List of (path, FileInfo) tuples sorted by path
+    """
+
+    return [
+        (file_path, info)
+        for file_path, info in sorted((files or {}).items())
+        if not file_path.startswith("/") and info.get("status") != DELETED
+    ]
+
+
+class ChunkReader(io.RawIOBase):
+    """File-like object reading bytes from an iterable of chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._buffer:
+            self._buffer = next(self._chunks, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class Snapshot:
+    """Downloads files of a revision into a destination directory."""
+
+    def __init__(self, change_client, change_id, destination, revision):
+        self.change_client = change_client
+        self.change_id = change_id
+        self.destination = destination
+        self.revision = revision
+        self.manifest_path = os.path.join(destination, MANIFEST_NAME)
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self):
+        """Reads sizes and hashes of the files written before.
+
+        Entries written for another revision are discarded, since files of
+        the same size may still differ.
+        """
+
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as stream:
+                manifest = json.load(stream)
+        except ValueError as e:
+            raise error.BadDataException(
+                f"Malformed snapshot manifest {self.manifest_path}: {e}"
+            )
+        if (manifest.get("change"), manifest.get("revision")) != (
+            self.change_id,
+            str(self.revision),
+        ):
+            return {}
+        return manifest.get("files") or {}
+
+    def save_manifest(self):
+        """Writes the manifest atomically."""
+
+        os.makedirs(self.destination, exist_ok=True)
+        manifest = {
+            "change": self.change_id,
+            "revision": str(self.revision),
+            "files": self.manifest,
+        }
+        partial = f"{self.manifest_path}.part"
+        with open(partial, "w") as stream:
+            json.dump(manifest, stream, indent=2, sort_keys=True)
+        os.replace(partial, self.manifest_path)
+
+    def is_present(self, file_path, info):
+        """Checks whether the file was already written with the same content."""
+
+        entry = self.manifest.get(file_path)
+        target = get_target(self.destination, file_path)
+        if not entry or not os.path.lexists(target):
+            return False
+        if os.path.islink(target):
+            return entry.get("link") == os.readlink(target)
+        size = info.get("size", entry.get("size"))
+        if entry.get("size") != size or os.path.getsize(target) != size:
+            return False
+        return get_file_hash(target) == entry.get("sha256")
+
+    def write_file(self, target, chunks, mode):
+        partial = f"{target}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(partial, "wb") as stream:
+                for chunk in chunks:
+                    stream.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            if mode is not None:
+                os.chmod(partial, mode & 0o777)
+            os.replace(partial, target)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return {"size": size, "sha256": digest.hexdigest()}
+
+    def download(self, entry):
+        """Downloads the file into the destination directory.
+
+        :param entry: Tuple of (path, FileInfo)
+        :raises bulk.SkipItem: if the file is up to date or is a submodule
+        :return: Manifest entry of the file
+        """
+
+        file_path, info = entry
+        mode = parse_mode(info.get("new_mode"))
+        file_type = None if mode is None else stat.S_IFMT(mode)
+        if file_type == GITLINK_MODE:
+            raise bulk.SkipItem("Submodules are not downloaded.")
+        if self.is_present(file_path, info):
+            raise bulk.SkipItem("File is up to date.")
+
+        target = get_target(self.destination, file_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        chunks = self.change_client.iter_file_content(
+            self.change_id, file_path, revision_id=self.revision
+        )
+        if file_type == SYMLINK_MODE:
+            link = b"".join(chunks).decode("utf-8")
+            if os.path.lexists(target):
+                os.remove(target)
+            os.symlink(link, target)
+            return {"link": link}
+        return self.write_file(target, chunks, mode)
+
+    def extract_member(self, archive, member):
+        """Writes a member of the archive into the destination directory.
+
+        :raises bulk.SkipItem: if the file is up to date
+        :return: Manifest entry of the file
+        """
+
+        if self.is_present(member.name, {"size": member.size}):
+            raise bulk.SkipItem("File is up to date.")
+        target = get_target(self.destination, member.name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if member.issym():
+            if os.path.lexists(target):
+                os.remove(target)
+            os.symlink(member.linkname, target)
+            return {"link": member.linkname}
+        stream = archive.extractfile(member)
+        chunks = iter(lambda: stream.read(64 * 1024), b"")
+        return self.write_file(target, chunks, stat.S_IFREG | member.mode)
+
+    def extract(self, chunks):
+        """Extracts the whole tree from the archive of the revision.
+
+        Members are written one by one as the archive is read, the
+        manifest is updated as in run().
+
+        :param chunks: Iterable of bytes of a (possibly compressed) tar
+                       archive, e.g. returned by iter_archive()
+        :return: Generator of bulk.Result entries, items are the paths
+        """
+
+        with tarfile.open(fileobj=ChunkReader(chunks), mode="r|*") as archive:
+            index = 0
+            for member in archive:
+                # Directories are created for files, submodules are skipped
+                if not (member.isfile() or member.issym()):
+                    continue
+                try:
+                    value = self.extract_member(archive, member)
+                except bulk.SkipItem as e:
+                    result = bulk.Result(
+                        index, member.name, bulk.SKIPPED, None, str(e), 1
+                    )
+                except (error.BadDataException, OSError) as e:
+                    result = bulk.Result(
+                        index, member.name, bulk.FAILED, None, str(e), 1
+                    )
+                else:
+                    self.manifest[member.name] = value
+                    result = bulk.Result(index, member.name, bulk.OK, value, None, 1)
+                index += 1
+                yield result
+
+    def run(self, files, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Downloads files concurrently, recording them in the manifest.
+
+        The manifest is updated by the consumer of the results, save it
+        with save_manifest() when done (or interrupted).
+
+        :param files: List of (path, FileInfo) tuples
+        :return: Generator of bulk.Result entries
+        """
+
+        for result in bulk.run_concurrently(
+            self.download, files, max_workers=max_workers, retry_policy=retry_policy
+        ):
+            if result.status == bulk.OK:
+                self.manifest[result.item[0]] = result.value
+            yield result
@@ -0,0 +1,163 @@
+"""Submitting sets of dependent changes in dependency order.
+
+The dependency graph is built from related changes (the parent commits
+of every change) and from the changes that would be submitted together.
+Changes that are always submitted together (e.g. due to a shared topic)
+form a group which is submitted by one call. Independent chains are
+submitted concurrently, dependent changes one after another, and nothing
+depending on a failed submit is attempted.
+
+A submit is not idempotent: a request that failed (e.g. timed out) may
+still have merged the change, and repeating it is then rejected. So the
+change is fetched again before a retry and when a submit is rejected,
+and a merged change counts as submitted.
+"""
+
+import operator
+
+from gerritclient import error
+from gerritclient.common import bulk, graph
+
+
+class SubmitTrain:
+    """Plans and submits a set of changes in dependency order."""
+
+    def __init__(self, change_client, on_behalf_of=None, notify=None):
+        self.change_client = change_client
+        self.on_behalf_of = on_behalf_of
+        self.notify = notify
+        # Change number -> ChangeInfo of all changes of the train
+        self.changes = {}
+        # Group representative -> numbers of all changes of the group
+        self.groups = {}
+        # Group representative -> representatives of groups it depends on
+        self.dependencies = {}
+        # Numbers of the changes submit was attempted for
+        self.attempted = set()
+
+    def fetch(self, change):
+        """Fetches the data needed to plan the submission of a change.
+
+        :param change: ChangeInfo entity (with the current revision) or a
+                       dict with the 'id' field only
+        :return: Tuple of (ChangeInfo, RelatedChangesInfo, set of numbers
+                 of the changes submitted together with it)
+        """
+
+        if "_number" not in change or "current_revision" not in change:
+            change = self.change_client.get_by_id(
+                change["id"], options=["CURRENT_REVISION"]
+            )
+        related = self.change_client.get_related_changes(change["id"])
+        together = self.change_client.get_submitted_together(change["id"])
+        # With some options the server returns SubmittedTogetherInfo
+        if isinstance(together, dict):
+            together = together.get("changes") or []
+        return change, related, {c["_number"] for c in together}
+
+    def plan(self, changes, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Builds the dependency graph of changes.
+
+        :param changes: List of ChangeInfo entities or dicts with 'id'
+        :raises error.BadDataException: if the data of any change can not
+                                        be fetched or there is a cycle
+        :return: Dict of group representatives to the sets of
+                 representatives of the groups they depend on
+        """
+
+        try:
+            fetched = bulk.run_all(
+                self.fetch,
+                changes,
+                max_workers=max_workers,
+                retry_policy=retry_policy,
+                get_id=operator.itemgetter("id"),
+            )
+        except error.BadDataException as e:
+            raise error.BadDataException(f"Unable to plan the submission: {e}")
+
+        self.changes = {change["_number"]: change for change, _, _ in fetched}
+        depends_on = graph.get_chain_dependencies(
+            self.changes, (related for _, related, _ in fetched)
+        )
+
+        representative = {number: number for number in self.changes}
+
+        def find(number):
+            while representative[number] != number:
+                number = representative[number]
+            return number
+
+        together = {
+            change["_number"]: numbers & self.changes.keys() - {change["_number"]}
+            for change, _, numbers in fetched
+        }
+        for number in self.changes:
+            for other in together[number]:
+                if number in together[other]:
+                    # Submitting any of them submits both
+                    a, b = sorted((find(number), find(other)))
+                    representative[b] = a
+                else:
+                    depends_on[number].add(other)
+
+        self.groups = {}
+        for number in sorted(self.changes):
+            self.groups.setdefault(find(number), []).append(number)
+        self.dependencies = {rep: set() for rep in self.groups}
+        for number, numbers in depends_on.items():
+            rep = find(number)
+            self.dependencies[rep].update(find(n) for n in numbers)
+            self.dependencies[rep].discard(rep)
+        # Changes submitted together with a change include all of its
+        # ancestors, keep the direct dependencies only
+        self.dependencies = graph.transitive_reduction(self.dependencies)
+        return self.dependencies
+
+    def submit(self, number):
+        """Submits the group of changes represented by the change number.
+
+        :raises bulk.SkipItem: if the change is already merged
+        :raises error.BadDataException: if the change can not be submitted
+        :return: ChangeInfo entity of the submitted change
+        """
+
+        status = self.changes[number].get("status")
+        if status == "MERGED":
+            raise bulk.SkipItem("Change is already merged.")
+        if status != "NEW":
+            raise error.BadDataException(f"Change status is {status}.")
+        change_id = self.changes[number]["id"]
+        if number in self.attempted:
+            merged = self.get_merged(change_id)
+            if merged:
+                return merged
+        self.attempted.add(number)
+        try:
+            return self.change_client.submit(
+                change_id, on_behalf_of=self.on_behalf_of, notify=self.notify
+            )
+        except error.HTTPError as e:
+            merged = self.get_merged(change_id) if e.status_code == 409 else None
+            if merged:
+                return merged
+            raise
+
+    def get_merged(self, change_id):
+        """Returns ChangeInfo of the change if it is merged, None otherwise."""
+
+        change = self.change_client.get_by_id(change_id)
+        return change if change.get("status") == "MERGED" else None
+
+    def run(self, max_workers=bulk.DEFAULT_WORKERS, retry_policy=None):
+        """Submits all planned groups in dependency order.
+
+        :return: Generator of bulk.Result entries for group representatives
+        """
+
+        return bulk.run_dependent(
+            self.submit,
+            self.dependencies,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+        )
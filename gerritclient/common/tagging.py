@@ -0,0 +1,93 @@
+"""Setting topics and hashtags on many changes, skipping no-op writes.
+
+The current state is taken from ChangeInfo entities returned by a query
+or, for changes given only by identifier, fetched before the update.
+"""
+
+from gerritclient.common import bulk
+
+
+def is_change_info(change):
+    """Checks whether the change is a full ChangeInfo entity.
+
+    Optional fields like 'topic' are omitted by the server when unset, so
+    their absence is meaningful only for entities returned by the server.
+    """
+
+    return "_number" in change
+
+
+def diff_hashtags(current, add=None, remove=None):
+    """Returns hashtags that actually need to be added and removed.
+
+    :param current: Hashtags currently set on the change
+    :param add: Hashtags to be added
+    :param remove: Hashtags to be removed
+    :return: Tuple of (add, remove) sorted lists
+    """
+
+    current = set(current or ())
+    return (
+        sorted(set(add or ()) - current),
+        sorted(set(remove or ()) & current),
+    )
+
+
+class TopicUpdater:
+    """Sets (or deletes, if topic is empty) the topic of changes."""
+
+    def __init__(self, change_client, topic=None):
+        self.change_client = change_client
+        self.topic = topic or ""
+
+    def get_topic(self, change):
+        if is_change_info(change):
+            return change.get("topic") or ""
+        return self.change_client.get_topic(change["id"]) or ""
+
+    def apply(self, change):
+        """Updates topic of the change.
+
+        :raises bulk.SkipItem: if the change already has the topic
+        :return: The previous topic of the change
+        """
+
+        current = self.get_topic(change)
+        if current == self.topic:
+            raise bulk.SkipItem(
+                f"Topic is already '{self.topic}'." if self.topic else "No topic set."
+            )
+        if self.topic:
+            self.change_client.set_topic(change["id"], self.topic)
+        else:
+            self.change_client.delete_topic(change["id"])
+        return current
+
+
+class HashtagsUpdater:
+    """Adds and removes hashtags of changes."""
+
+    def __init__(self, change_client, add=None, remove=None):
+        self.change_client = change_client
+        self.add = add or []
+        self.remove = remove or []
+
+    def get_hashtags(self, change):
+        if is_change_info(change):
+            return change.get("hashtags") or []
+        return self.change_client.get_hashtags(change["id"])
+
+    def apply(self, change):
+        """Updates hashtags of the change.
+
+        :raises bulk.SkipItem: if nothing has to be changed
+        :return: Tuple of (added, removed) hashtags
+        """
+
+        add, remove = diff_hashtags(self.get_hashtags(change), self.add, self.remove)
+        if not add and not remove:
+            raise bulk.SkipItem("Hashtags are already up to date.")
+        self.change_client.set_hashtags(
+            change["id"], add=add or None, remove=remove or None
+        )
+        return add, remove
@@ -1,7 +1,11 @@
+import base64
+import binascii
+import calendar
 import functools
 import json
 import os
 import re
+import time
 
 import yaml
 
@@ -132,3 +136,46 @@ def normalize(string, replacer="_"):
     """Replaces special characters from string."""
 
     return re.sub("[^a-zA-Z0-9.]", replacer, string)
+
+
+def decode_base64_chunks(chunks):
+    """Decodes base64 data arriving in chunks of arbitrary size.
+
+    Whitespace between chunks (e.g. line breaks) is ignored.
+
+    :param chunks: Iterable of bytes (or str) of base64 encoded data
+    :raises error.BadDataException: if the data is not valid base64
+    :return: Generator of decoded bytes
+    """
+
+    remainder = b""
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii")
+        data = remainder + b"".join(chunk.split())
+        # Only complete quanta of 4 characters can be decoded
+        size = len(data) - len(data) % 4
+        remainder = data[size:]
+        if size:
+            try:
+                yield base64.b64decode(data[:size], validate=True)
+            except binascii.Error as e:
+                raise error.BadDataException(f"Malformed base64 data: {e}")
+    if remainder:
+        raise error.BadDataException("Malformed base64 data: truncated input.")
+
+
+def parse_timestamp(value):
+    """Converts a Gerrit timestamp into seconds since the epoch.
+
+    :param value: Timestamp in UTC, e.g. '2013-02-01 09:59:32.126000000'
+    :raises error.BadDataException: if the timestamp is malformed
+    :return: Float number of seconds
+    """
+
+    date, _, fraction = value.partition(".")
+    try:
+        parsed = time.strptime(date, "%Y-%m-%d %H:%M:%S")
+        return calendar.timegm(parsed) + (float(f"0.{fraction}") if fraction else 0)
+    except ValueError:
+        raise error.BadDataException(f"Malformed timestamp '{value}'.")
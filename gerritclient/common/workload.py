@@ -0,0 +1,178 @@
+"""Review workload of reviewers aggregated from open changes.
+
+Changes are consumed one by one as they are fetched page by page, and
+only a few counters are kept for every account, so memory usage depends
+on the number of reviewers, not on the number of changes.
+
+A review is pending while the reviewer has not voted on the current
+revision of the change. It has been pending since the reviewer was added
+to the attention set, if the reviewer is in it, otherwise since the
+change was created. Accounts in the attention set are counted even if
+they are not reviewers of the change (e.g. owners who have to reply).
+"""
+
+import time
+
+from gerritclient.common import attention, latency, utils
+
+# Options needed to get the reviewers, votes and accounts of changes
+QUERY_OPTIONS = ("DETAILED_ACCOUNTS", "DETAILED_LABELS")
+
+COLUMNS = (
+    "account_id",
+    "name",
+    "changes",
+    "pending",
+    "attention",
+    "voted",
+    "oldest_pending",
+    "mean_vote_age",
+    "oldest_vote",
+)
+
+
+def get_account_name(account):
+    """Returns the most readable identifier of the account."""
+
+    for field in ("username", "name", "email"):
+        if account.get(field):
+            return account[field]
+    return str(account.get("_account_id"))
+
+
+def get_last_votes(change):
+    """Returns the dates of the latest votes of every account.
+
+    Only non-zero votes on the current revision are taken into account.
+
+    :param change: ChangeInfo entity fetched with DETAILED_LABELS option
+    :return: Dict of account IDs to the timestamps of their latest votes
+    """
+
+    votes = {}
+    for label_info in (change.get("labels") or {}).values():
+        for approval in label_info.get("all", ()):
+            if not approval.get("value") or not approval.get("date"):
+                continue
+            account = approval.get("_account_id")
+            voted = utils.parse_timestamp(approval["date"])
+            votes[account] = max(votes.get(account, voted), voted)
+    return votes
+
+
+class ReviewerLoad:
+    """Counters of the review workload of one account."""
+
+    def __init__(self, account):
+        self.account = account
+        self.changes = 0
+        self.pending = 0
+        self.attention = 0
+        self.voted = 0
+        # Ages are in seconds
+        self.oldest_pending = None
+        self.vote_age_total = 0
+        self.oldest_vote = None
+
+    def add_pending(self, age):
+        self.pending += 1
+        self.oldest_pending = max(age, self.oldest_pending or age)
+
+    def add_vote(self, age):
+        self.voted += 1
+        self.vote_age_total += age
+        self.oldest_vote = max(age, self.oldest_vote or age)
+
+    def get_row(self, unit="days"):
+        """Returns values of the COLUMNS, ages are in the given unit."""
+
+        scale = latency.UNITS[unit]
+
+        def convert(seconds):
+            return None if seconds is None else round(seconds / scale, 2)
+
+        mean_vote_age = self.vote_age_total / self.voted if self.voted else None
+        return (
+            self.account.get("_account_id"),
+            get_account_name(self.account),
+            self.changes,
+            self.pending,
+            self.attention,
+            self.voted,
+            convert(self.oldest_pending),
+            convert(mean_vote_age),
+            convert(self.oldest_vote),
+        )
+
+
+class WorkloadReport:
+    """Aggregates the review workload of accounts in a single pass."""
+
+    def __init__(self, now=None, include_cc=False):
+        """Creates WorkloadReport.
+
+        :param now: Timestamp (seconds since the epoch) ages are counted to,
+                    defaults to the current time
+        :param include_cc: If True, accounts in CC count as reviewers
+        """
+
+        self.now = time.time() if now is None else now
+        self.states = ("REVIEWER", "CC") if include_cc else ("REVIEWER",)
+        self.loads = {}
+        self.count = 0
+
+    def get_load(self, account):
+        account_id = account.get("_account_id")
+        if account_id not in self.loads:
+            self.loads[account_id] = ReviewerLoad(account)
+        return self.loads[account_id]
+
+    def add(self, change):
+        """Adds the workload of a change.
+
+        :param change: ChangeInfo entity fetched with QUERY_OPTIONS
+        """
+
+        self.count += 1
+        owner = (change.get("owner") or {}).get("_account_id")
+        created = utils.parse_timestamp(change["created"])
+        votes = get_last_votes(change)
+        attention_set = change.get("attention_set") or {}
+        if isinstance(attention_set, dict):
+            attention_set = attention_set.values()
+        attention_since = {
+            entry["account"].get("_account_id"): entry.get("last_update")
+            for entry in attention_set
+        }
+
+        reviewers = change.get("reviewers") or {}
+        seen = set()
+        for account in (a for state in self.states for a in reviewers.get(state, ())):
+            account_id = account.get("_account_id")
+            if account_id == owner or account_id in seen:
+                continue
+            seen.add(account_id)
+            load = self.get_load(account)
+            load.changes += 1
+            if account_id in votes:
+                load.add_vote(self.now - votes[account_id])
+                continue
+            since = attention_since.get(account_id)
+            since = utils.parse_timestamp(since) if since else created
+            load.add_pending(self.now - since)
+
+        for account in attention.get_attention_accounts(attention_set):
+            self.get_load(account).attention += 1
+
+    def collect(self, changes):
+        """Adds the workload of all changes, consuming them lazily."""
+
+        for change in changes:
+            self.add(change)
+        return self
+
+    def get_rows(self, unit="days"):
+        """Returns rows of the COLUMNS, the most loaded accounts first."""
+
+        rows = [load.get_row(unit) for load in self.loads.values()]
+        return sorted(rows, key=lambda row: (-row[3], -row[4], -row[2], row[1]))
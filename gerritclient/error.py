@@ -24,8 +24,14 @@ class ConfigNotFoundException(GerritClientException):
     """Should be raised if configuration for gerritclient was not specified."""
 
 
+class UnsupportedFeatureException(GerritClientException):
+    """Should be raised if a feature is not supported by the Gerrit server."""
+
+
 class HTTPError(GerritClientException):
-    pass
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 def get_error_body(error):
@@ -4,6 +4,8 @@ import sys
 from cliff import app
 from cliff.commandmanager import CommandManager
 
+from gerritclient import client
+
 LOG = logging.getLogger(__name__)
 
 
@@ -14,7 +16,11 @@ class GerritClient(app.App):
     """
 
     def run(self, argv):
-        return super().run(argv)
+        try:
+            return super().run(argv)
+        finally:
+            # Release pooled connections shared by all executed commands
+            client.close()
 
 
 def main(argv=sys.argv[1:]):
@@ -1,8 +1,13 @@
+import gzip
+import io
 import json
+import tarfile
 from unittest import mock
 
 import pytest
+import requests
 
+from gerritclient import error
 from gerritclient.tests.unit.cli import clibase
 from gerritclient.tests.utils import fake_account, fake_change, fake_comment
 
@@ -237,6 +242,62 @@ class TestChangeCommand(clibase.BaseCLITest):
             change_id, on_behalf_of=username, notify=notify
         )
 
+    def test_change_abandon_w_query(self):
+        query = "status:open age:1y"
+        args = f"change abandon --query '{query}'"
+        changes = [
+            fake_change.get_fake_change(identifier="p~master~I1"),
+            fake_change.get_fake_change(identifier="p~master~I2", status="ABANDONED"),
+            fake_change.get_fake_change(identifier="p~master~I3"),
+        ]
+        self.m_client.iter_all.return_value = iter(changes)
+        result = self.exec_command(args)
+
+        assert result == 0
+        self.m_get_client.assert_called_once_with("change", mock.ANY)
+        self.m_client.iter_all.assert_called_once_with(query)
+        self.m_client.abandon.assert_has_calls(
+            [mock.call("p~master~I1"), mock.call("p~master~I3")], any_order=True
+        )
+        assert self.m_client.abandon.call_count == 2
+
+    def test_change_submit_w_query_and_parameters(self):
+        query = "topic:release-1.0"
+        args = f"change submit --query {query} --notify NONE --parallel 2"
+        self.m_client.iter_all.return_value = iter(
+            [fake_change.get_fake_change(identifier="p~master~I1")]
+        )
+        self.exec_command(args)
+
+        self.m_client.submit.assert_called_once_with(
+            "p~master~I1", on_behalf_of=None, notify="NONE"
+        )
+
+    @mock.patch("sys.stderr")
+    def test_change_abandon_w_query_fail(self, mocked_stderr):
+        args = "change abandon --query status:open --retries 3"
+        self.m_client.iter_all.return_value = iter(
+            [fake_change.get_fake_change(identifier="p~master~I1")]
+        )
+        self.m_client.abandon.side_effect = error.HTTPError(
+            "409 Conflict", status_code=409
+        )
+        self.exec_command(args)
+
+        # Conflicts are not transient, so the request is not retried
+        self.m_client.abandon.assert_called_once_with("p~master~I1")
+
+    @mock.patch("sys.stderr")
+    def test_change_abandon_w_query_and_identifier_fail(self, mocked_stderr):
+        args = "change abandon I8473b95934b5732ac55d26311a706c9c2bde9940 --query x"
+        assert self.exec_command(args) == 1
+        self.m_client.abandon.assert_not_called()
+
+    @mock.patch("sys.stderr")
+    def test_change_abandon_wo_identifier_fail(self, mocked_stderr):
+        assert self.exec_command("change abandon") == 1
+        self.m_client.abandon.assert_not_called()
+
     def test_change_topic_show(self):
         change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
         args = f"change topic show {change_id}"
@@ -265,6 +326,525 @@ class TestChangeCommand(clibase.BaseCLITest):
         self.m_get_client.assert_called_once_with("change", mock.ANY)
         self.m_client.delete_topic.assert_called_once_with(change_id)
 
+    def test_change_bulk_submit_w_ids(self):
+        args = "change bulk submit 2 1 --notify NONE"
+        self.m_client.get_by_id.side_effect = lambda change_id, options: {
+            "id": f"p~master~I{change_id}",
+            "_number": int(change_id),
+            "current_revision": f"sha{change_id}",
+            "status": "NEW",
+        }
+        self.m_client.get_related_changes.return_value = {
+            "changes": [
+                {
+                    "_change_number": 2,
+                    "commit": {"commit": "sha2", "parents": [{"commit": "sha1"}]},
+                },
+                {
+                    "_change_number": 1,
+                    "commit": {"commit": "sha1", "parents": [{"commit": "base"}]},
+                },
+            ]
+        }
+        self.m_client.get_submitted_together.return_value = []
+        self.m_client.submit.return_value = {"status": "MERGED"}
+        self.exec_command(args)
+
+        self.m_client.submit.assert_has_calls(
+            [
+                mock.call("p~master~I1", on_behalf_of=None, notify="NONE"),
+                mock.call("p~master~I2", on_behalf_of=None, notify="NONE"),
+            ]
+        )
+
+    def test_change_bulk_submit_dry_run(self):
+        args = "change bulk submit --query status:open --dry-run"
+        self.m_client.iter_all.return_value = iter(
+            [
+                {"id": "I1", "_number": 1, "current_revision": "a", "status": "NEW"},
+                {"id": "I2", "_number": 2, "current_revision": "b", "status": "NEW"},
+            ]
+        )
+        self.m_client.get_related_changes.return_value = {"changes": []}
+        self.m_client.get_submitted_together.return_value = [
+            {"_number": 1},
+            {"_number": 2},
+        ]
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with(
+            "status:open", options=("CURRENT_REVISION",)
+        )
+        self.m_client.submit.assert_not_called()
+
+    def test_change_bulk_rebase_w_ids(self):
+        args = "change bulk rebase 2 1 --parallel 4"
+        self.m_client.get_by_id.side_effect = lambda change_id: {
+            "id": f"I{change_id}",
+            "_number": int(change_id),
+            "status": "NEW",
+        }
+        self.m_client.get_related_changes.return_value = (
+            fake_change.get_fake_related_changes(1, 2)
+        )
+        self.m_client.rebase.return_value = {}
+        self.exec_command(args)
+
+        self.m_client.rebase.assert_has_calls([mock.call("I1"), mock.call("I2")])
+
+    def test_change_bulk_rebase_dry_run(self):
+        args = "change bulk rebase --query status:open --dry-run"
+        self.m_client.iter_all.return_value = iter(
+            [{"id": "I1", "_number": 1, "status": "NEW"}]
+        )
+        self.m_client.get_related_changes.return_value = {"changes": []}
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with("status:open", options=None)
+        self.m_client.rebase.assert_not_called()
+
+    def test_change_bulk_rebase_dry_run_shows_parents(self, capsys):
+        args = "change bulk rebase 1 2 --dry-run -f json"
+        self.m_client.get_by_id.side_effect = lambda change_id: {
+            "id": f"I{change_id}",
+            "_number": int(change_id),
+            "status": "NEW",
+        }
+        self.m_client.get_related_changes.return_value = (
+            fake_change.get_fake_related_changes(1, 2)
+        )
+        self.exec_command(args)
+
+        data = json.loads(capsys.readouterr().out)
+        assert [(r["id"], r["detail"]) for r in data] == [(1, None), (2, "After: 1")]
+        self.m_client.rebase.assert_not_called()
+
+    def test_change_bulk_cherry_pick(self):
+        args = "change bulk cherry-pick I1 -d stable-1 -d stable-2 --topic backport"
+        self.m_client.get_included.return_value = {"branches": ["stable-1"]}
+        self.m_client.cherry_pick.return_value = {"id": "p~stable-2~I1", "_number": 7}
+        self.exec_command(args)
+
+        self.m_client.get_included.assert_called_once_with("I1")
+        self.m_client.cherry_pick.assert_called_once_with(
+            "I1",
+            revision_id="current",
+            destination="stable-2",
+            message=None,
+            notify=None,
+            keep_reviewers=None,
+            allow_conflicts=None,
+        )
+        self.m_client.set_topic.assert_called_once_with("p~stable-2~I1", "backport")
+
+    @mock.patch("time.sleep", mock.Mock())
+    def test_change_bulk_cherry_pick_tagging_connection_error(self, capsys):
+        args = (
+            "change bulk cherry-pick I1 -d stable-1 --topic backport --force "
+            "--retries 2"
+        )
+        self.m_client.cherry_pick.return_value = {"id": "p~stable-1~I1", "_number": 7}
+        self.m_client.set_topic.side_effect = requests.exceptions.ConnectionError(
+            "Connection reset"
+        )
+        self.exec_command(args)
+
+        self.m_client.cherry_pick.assert_called_once()
+        self.m_client.set_topic.assert_called_once()
+        assert "Change 7 was created" in capsys.readouterr().out
+
+    def test_change_bulk_cherry_pick_force(self):
+        args = "change bulk cherry-pick I1 I2 -d stable-1 --force"
+        self.m_client.cherry_pick.return_value = {"id": "x", "_number": 7}
+        self.exec_command(args)
+
+        self.m_client.get_included.assert_not_called()
+        assert self.m_client.cherry_pick.call_count == 2
+
+    def test_change_bulk_index_w_query(self):
+        args = "change bulk index --query status:open --parallel 2"
+        self.m_client.iter_all.return_value = iter(
+            [{"id": "p~master~I1"}, {"id": "p~master~I2"}]
+        )
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with("status:open")
+        self.m_client.index.assert_has_calls(
+            [mock.call("p~master~I1"), mock.call("p~master~I2")], any_order=True
+        )
+
+    def test_change_bulk_index_w_file_and_resume(self, tmp_path):
+        ids_file = tmp_path / "changes.txt"
+        ids_file.write_text("I1\nI2\nI3\n")
+        journal = tmp_path / "journal.txt"
+        journal.write_text("I1\n")
+        args = f"change bulk index --file {ids_file} --resume {journal}"
+        self.exec_command(args)
+
+        assert sorted(c.args[0] for c in self.m_client.index.call_args_list) == [
+            "I2",
+            "I3",
+        ]
+        assert sorted(journal.read_text().split()) == ["I1", "I2", "I3"]
+
+    @mock.patch("sys.stderr")
+    def test_change_bulk_index_w_many_sources_fail(self, mocked_stderr):
+        args = "change bulk index I1 --query status:open"
+        assert self.exec_command(args) == 1
+        self.m_client.index.assert_not_called()
+
+    def test_change_bulk_check_summary(self):
+        args = "change bulk check --query status:merged"
+        self.m_client.iter_all.return_value = iter([{"id": "I1"}, {"id": "I2"}])
+        self.m_client.check_consistency.side_effect = lambda change_id: (
+            {"problems": [{"message": "Patch set 1 is missing"}]}
+            if change_id == "I2"
+            else {}
+        )
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with("status:merged", options=None)
+        assert self.m_client.check_consistency.call_count == 2
+        self.m_client.fix_consistency.assert_not_called()
+
+    def test_change_bulk_check_fix_affected_only(self):
+        args = "change bulk check I1 I2 I3 --fix --delete-patchset --yes"
+        self.m_client.check_consistency.side_effect = lambda change_id: (
+            {} if change_id == "I1" else {"problems": [{"message": "broken"}]}
+        )
+        self.m_client.fix_consistency.return_value = {
+            "problems": [{"message": "broken", "status": "FIXED"}]
+        }
+        self.exec_command(args)
+
+        self.m_client.fix_consistency.assert_has_calls(
+            [
+                mock.call("I2", is_delete=True, expect_merged_as=False),
+                mock.call("I3", is_delete=True, expect_merged_as=False),
+            ],
+            any_order=True,
+        )
+        assert self.m_client.fix_consistency.call_count == 2
+
+    def test_change_bulk_check_summary_groups_failures(self, capsys):
+        args = "change bulk check I1 I2 I3 -f json"
+        self.m_client.check_consistency.side_effect = error.HTTPError(
+            "Connection aborted.", 500
+        )
+        self.exec_command(args)
+
+        data = json.loads(capsys.readouterr().out)
+        assert len(data) == 1
+        assert data[0]["count"] == 3
+        assert data[0]["changes"] == "I1, I2, I3"
+
+    @mock.patch("sys.stdin")
+    @mock.patch("sys.stderr")
+    def test_change_bulk_check_fix_cancelled(self, mocked_stderr, mocked_stdin):
+        args = "change bulk check I1 --fix"
+        mocked_stdin.readline.return_value = "n\n"
+        self.m_client.check_consistency.return_value = {
+            "problems": [{"message": "broken"}]
+        }
+
+        assert self.exec_command(args) == 1
+        self.m_client.fix_consistency.assert_not_called()
+
+    @mock.patch("sys.stdin")
+    def test_change_bulk_check_fix_confirmed(self, mocked_stdin):
+        args = "change bulk check I1 --fix"
+        mocked_stdin.readline.return_value = "y\n"
+        self.m_client.check_consistency.return_value = {
+            "problems": [{"message": "broken"}]
+        }
+        self.m_client.fix_consistency.return_value = {"problems": []}
+        self.exec_command(args)
+
+        self.m_client.fix_consistency.assert_called_once_with(
+            "I1", is_delete=False, expect_merged_as=False
+        )
+
+    def test_change_export(self, tmp_path):
+        output = tmp_path / "changes.jsonl"
+        args = f"change export status:merged --output {output} -o LABELS --limit 2"
+        self.m_client.iter_all.return_value = iter(
+            fake_change.get_fake_changes(2, topic="release")
+        )
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with(
+            "status:merged", options=["LABELS"], limit=2, page_size=500
+        )
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert len(rows) == 2
+        assert rows[0]["topic"] == "release"
+        assert rows[0]["owner"] == 1000096
+
+    @mock.patch("sys.stderr")
+    def test_change_export_raw_parquet_fail(self, mocked_stderr):
+        args = "change export status:open --output changes.parquet --raw"
+        assert self.exec_command(args) == 1
+        self.m_client.iter_all.assert_not_called()
+
+    def test_change_bulk_comment_export(self, tmp_path):
+        output = tmp_path / "comments.jsonl"
+        args = (
+            f"change bulk comment export --query status:open --output {output} "
+            "-t published -t drafts"
+        )
+        self.m_client.iter_all.return_value = iter([{"id": "I1"}, {"id": "I2"}])
+        self.m_client.get_comments.side_effect = lambda change_id, comment_type: {
+            "a.py": [{"id": "c1", "line": 1, "patch_set": 1, "message": "nit"}]
+        }
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with("status:open", options=None)
+        assert self.m_client.get_comments.call_count == 4
+        rows = [json.loads(line) for line in output.read_text().splitlines()]
+        assert len(rows) == 4
+        assert {(r["change"], r["type"]) for r in rows} == {
+            ("I1", "published"),
+            ("I1", "drafts"),
+            ("I2", "published"),
+            ("I2", "drafts"),
+        }
+
+    def test_change_bulk_comment_export_to_stdout(self, capsys):
+        args = "change bulk comment export I1 I2 --output - -f json"
+
+        def get_comments(change_id, comment_type):
+            if change_id == "I2":
+                raise error.HTTPError("Not found", 404)
+            return {"a.py": [{"id": "c1", "line": 1, "message": "nit"}]}
+
+        self.m_client.get_comments.side_effect = get_comments
+        self.exec_command(args)
+
+        captured = capsys.readouterr()
+        rows = [json.loads(line) for line in captured.out.splitlines()]
+        assert [r["change"] for r in rows] == ["I1"]
+        assert '"id": "I2 (published)"' in captured.err
+
+    def test_change_latency_report(self, capsys):
+        args = (
+            "change latency report --query status:merged -m first_review -p 50 -f json"
+        )
+        self.m_client.iter_all.return_value = iter(
+            [
+                {
+                    "id": f"I{i}",
+                    "_number": i,
+                    "project": "gerrit",
+                    "owner": {"_account_id": 1000},
+                    "created": "2024-01-01 00:00:00.000000000",
+                }
+                for i in range(3)
+            ]
+        )
+        self.m_client.get_messages.return_value = [
+            {"author": {"_account_id": 1001}, "date": "2024-01-01 02:00:00.000"}
+        ]
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with("status:merged", options=None)
+        assert self.m_client.get_messages.call_count == 3
+        assert json.loads(capsys.readouterr().out) == [
+            {
+                "project": "gerrit",
+                "metric": "first_review",
+                "count": 3,
+                "mean": 2.0,
+                "p50": 2.0,
+            }
+        ]
+
+    @mock.patch("sys.stderr")
+    def test_change_latency_report_bad_percentile_fail(self, mocked_stderr):
+        args = "change latency report I1 -p 150"
+        assert self.exec_command(args) == 1
+        self.m_client.get_messages.assert_not_called()
+
+    @mock.patch("sys.stderr")
+    def test_change_dependency_graph(self, mocked_stderr, tmp_path, capsys):
+        output = tmp_path / "graph.dot"
+        args = f"change dependency-graph 2 --output {output} -f json"
+        self.m_client.get_by_id.side_effect = lambda change_id, options: {
+            "id": f"I{change_id}",
+            "_number": int(change_id),
+            "project": "gerrit",
+            "current_revision": f"sha{change_id}",
+        }
+        self.m_client.get_related_changes.return_value = (
+            fake_change.get_fake_related_changes(1, 2)
+        )
+        self.m_client.get_submitted_together.return_value = []
+        self.exec_command(args)
+
+        assert self.m_client.get_by_id.call_count == 2
+        assert '"2" -> "1";' in output.read_text()
+        data = json.loads(capsys.readouterr().out)
+        assert [(c["order"], c["number"], c["depends_on"]) for c in data] == [
+            (1, 1, ""),
+            (2, 2, "1"),
+        ]
+
+    def test_change_dependency_graph_to_stdout(self, capsys):
+        args = "change dependency-graph 1 --output - --output-format dot -f json"
+        self.m_client.get_by_id.return_value = {
+            "id": "I1",
+            "_number": 1,
+            "current_revision": "sha1",
+        }
+        self.m_client.get_related_changes.return_value = {"changes": []}
+        self.m_client.get_submitted_together.return_value = []
+        self.exec_command(args)
+
+        captured = capsys.readouterr()
+        assert captured.out.startswith("digraph")
+        assert '"number": 1' in captured.err
+
+    def test_change_revision_diff_bundle(self, tmp_path):
+        output = tmp_path / "diffs.jsonl.gz"
+        change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
+        args = (
+            f"change revision diff-bundle {change_id} -r 3 --base 1 "
+            f"--skip-binary --output {output} --parallel 4"
+        )
+        self.m_client.get_revision_diff_bundle.return_value = iter(
+            [{"path": "a.py", "diff": {}}, {"path": "b.py", "diff": {}}]
+        )
+        self.exec_command(args)
+
+        self.m_client.get_revision_diff_bundle.assert_called_once_with(
+            change_id,
+            revision_id="3",
+            base=1,
+            parent=None,
+            skip_binary=True,
+            skip_generated=False,
+            generated_patterns=None,
+            max_workers=4,
+            retry_policy=mock.ANY,
+            context=None,
+            intraline=None,
+            whitespace=None,
+        )
+        with gzip.open(output, "rt") as stream:
+            assert [json.loads(line)["path"] for line in stream] == ["a.py", "b.py"]
+
+    def test_change_bulk_patch_download(self, tmp_path):
+        output = tmp_path / "patches.tar"
+        args = f"change bulk patch download --query status:merged --output {output}"
+        self.m_client.iter_all.return_value = iter(
+            [
+                {
+                    "id": f"I{number}",
+                    "_number": number,
+                    "current_revision": "abc",
+                    "revisions": {"abc": {"_number": 2}},
+                }
+                for number in (1, 2)
+            ]
+        )
+        self.m_client.iter_patch.side_effect = lambda change_id, revision_id: iter(
+            [b"From ", change_id.encode()]
+        )
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with(
+            "status:merged", options=("CURRENT_REVISION",)
+        )
+        self.m_client.get_patch.assert_not_called()
+        self.m_client.get_by_id.assert_not_called()
+        with tarfile.open(output) as tar:
+            assert sorted(tar.getnames()) == ["1-2.patch", "2-2.patch"]
+
+    def test_change_revision_snapshot(self, tmp_path):
+        change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
+        args = f"change revision snapshot {change_id} -r abc -d {tmp_path}"
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            info = tarfile.TarInfo("src/app.py")
+            info.size = 5
+            tar.addfile(info, io.BytesIO(b"print"))
+        self.m_client.iter_archive.return_value = iter([buffer.getvalue()])
+        self.exec_command(args)
+
+        self.m_client.get_by_id.assert_not_called()
+        self.m_client.iter_archive.assert_called_once_with(change_id, revision_id="abc")
+        self.m_client.get_revision_files.assert_not_called()
+        assert (tmp_path / "src" / "app.py").read_bytes() == b"print"
+
+    def test_change_revision_snapshot_modified_only(self, tmp_path):
+        change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
+        args = f"change revision snapshot {change_id} --modified-only -d {tmp_path}"
+        self.m_client.get_by_id.return_value = {"current_revision": "abc"}
+        self.m_client.get_revision_files.return_value = {
+            "/COMMIT_MSG": {},
+            "src/app.py": {"size": 5},
+        }
+        self.m_client.iter_file_content.return_value = iter([b"print"])
+        self.exec_command(args)
+
+        self.m_client.get_by_id.assert_called_once_with(
+            change_id, options=["CURRENT_REVISION"]
+        )
+        self.m_client.get_revision_files.assert_called_once_with(
+            change_id, revision_id="abc", base=None, parent=None
+        )
+        self.m_client.iter_file_content.assert_called_once_with(
+            change_id, "src/app.py", revision_id="abc"
+        )
+        assert (tmp_path / "src" / "app.py").read_bytes() == b"print"
+
+    def test_change_local_index_sync_and_query(self, tmp_path):
+        database = tmp_path / "changes.sqlite"
+        self.m_client.iter_all.return_value = iter(
+            [fake_change.get_fake_change(identifier="I1")]
+        )
+        self.exec_command(
+            f"change local-index sync project:gerrit --database {database}"
+        )
+
+        self.m_client.iter_all.assert_called_once_with(
+            "project:gerrit", options=["DETAILED_ACCOUNTS"], page_size=500
+        )
+        assert database.exists()
+        assert (
+            self.exec_command(
+                f"change local-index query status:open --database {database}"
+            )
+            == 0
+        )
+
+    @mock.patch("sys.stderr")
+    def test_change_local_index_query_wo_index_fail(self, mocked_stderr, tmp_path):
+        args = f"change local-index query status:open --database {tmp_path}/db"
+        assert self.exec_command(args) == 1
+
+    def test_change_bulk_topic_set_w_query(self):
+        args = "change bulk topic set --query status:open -t release"
+        self.m_client.iter_all.return_value = iter(
+            [
+                fake_change.get_fake_change(identifier="I1", topic="release"),
+                fake_change.get_fake_change(identifier="I2"),
+            ]
+        )
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with("status:open", options=None)
+        self.m_client.get_topic.assert_not_called()
+        self.m_client.set_topic.assert_called_once_with("I2", "release")
+
+    def test_change_bulk_topic_delete_w_ids(self):
+        args = "change bulk topic delete I1 I2"
+        self.m_client.get_topic.side_effect = lambda change_id: {"I1": "old"}.get(
+            change_id, ""
+        )
+        self.exec_command(args)
+
+        self.m_client.delete_topic.assert_called_once_with("I1")
+
     def test_change_assignee_show(self):
         change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
         args = f"change assignee show {change_id}"
@@ -500,6 +1080,32 @@ class TestChangeCommand(clibase.BaseCLITest):
             change_id, query=query, limit=None, exclude_groups=None
         )
 
+    @mock.patch("sys.stderr")
+    def test_change_reviewer_workload(self, mocked_stderr, capsys):
+        args = "change reviewer workload --query project:gerrit --unit hours -f json"
+        self.m_client.iter_all.return_value = iter(
+            [
+                {
+                    "owner": {"_account_id": 1000},
+                    "created": "2024-01-01 00:00:00.000000000",
+                    "reviewers": {
+                        "REVIEWER": [{"_account_id": 1001, "username": "jdoe"}]
+                    },
+                }
+            ]
+        )
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with(
+            "project:gerrit",
+            options=("DETAILED_ACCOUNTS", "DETAILED_LABELS"),
+            page_size=500,
+        )
+        data = json.loads(capsys.readouterr().out)
+        assert [(r["name"], r["changes"], r["pending"]) for r in data] == [
+            ("jdoe", 1, 1)
+        ]
+
     # Review (voting) tests
 
     def test_change_review_w_message(self):
@@ -582,6 +1188,146 @@ class TestChangeCommand(clibase.BaseCLITest):
 
     # Attention Set tests
 
+    def test_change_bulk_review_w_query(self):
+        query = "status:open project:p"
+        args = f"change bulk review --query '{query}' -l Code-Review=-1 -l Verified=1 -m Done"
+        self.m_client.get_by_id.return_value = {"_account_id": 1000096}
+        self.m_client.iter_all.return_value = iter(
+            [
+                fake_change.get_fake_change(identifier="p~master~I1"),
+                fake_change.get_fake_change(identifier="p~master~I2"),
+            ]
+        )
+        self.exec_command(args)
+
+        self.m_get_client.assert_any_call("change", mock.ANY)
+        self.m_get_client.assert_any_call("account", mock.ANY)
+        self.m_client.iter_all.assert_called_once_with(
+            query, options=["DETAILED_LABELS"]
+        )
+        assert self.m_client.set_review.call_count == 2
+        self.m_client.set_review.assert_any_call(
+            "p~master~I1",
+            revision_id="current",
+            labels={"Code-Review": -1, "Verified": 1},
+            message="Done",
+        )
+
+    def test_change_bulk_review_skips_votes_in_place(self):
+        args = "change bulk review --query status:open -l Code-Review=-1"
+        self.m_client.get_by_id.return_value = {"_account_id": 1000096}
+        self.m_client.iter_all.return_value = iter([fake_change.get_fake_change()])
+        self.exec_command(args)
+
+        self.m_client.set_review.assert_not_called()
+
+    @mock.patch("gerritclient.common.utils.file_exists", mock.Mock(return_value=True))
+    def test_change_bulk_review_w_manifest(self):
+        entries = [
+            {"change": "I1", "labels": {"Verified": 1}},
+            {"change": "I2", "labels": {"Verified": -1}, "message": "Failed"},
+        ]
+        args = "change bulk review --manifest /tmp/reviews.jsonl --tag ci --force"
+        m_open = mock.mock_open(read_data="\n".join(json.dumps(e) for e in entries))
+        with mock.patch("gerritclient.common.review.open", m_open, create=True):
+            self.exec_command(args)
+
+        self.m_client.get_by_id.assert_not_called()
+        self.m_client.set_review.assert_has_calls(
+            [
+                mock.call(
+                    "I1", revision_id="current", labels={"Verified": 1}, tag="ci"
+                ),
+                mock.call(
+                    "I2",
+                    revision_id="current",
+                    labels={"Verified": -1},
+                    message="Failed",
+                    tag="ci",
+                ),
+            ],
+            any_order=True,
+        )
+
+    @mock.patch("sys.stderr")
+    def test_change_bulk_review_wo_votes_fail(self, mocked_stderr):
+        args = "change bulk review --query status:open"
+        assert self.exec_command(args) == 1
+        self.m_client.iter_all.assert_not_called()
+
+    def test_change_bulk_reviewer_add_w_query(self):
+        query = "status:open project:p"
+        args = f"change bulk reviewer add --query '{query}' -r jdoe -r alice"
+        self.m_client.iter_all.return_value = iter(
+            [
+                fake_change.get_fake_change(identifier="p~master~I1"),
+                fake_change.get_fake_change(identifier="p~master~I2"),
+            ]
+        )
+        self.m_client.add_reviewer.return_value = {"input": "alice"}
+        self.m_client.get_members.side_effect = error.HTTPError("Not found", 404)
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_called_once_with(
+            query, options=("DETAILED_LABELS", "DETAILED_ACCOUNTS")
+        )
+        self.m_client.get_by_id.assert_not_called()
+        self.m_client.get_members.assert_called_once_with("alice")
+        assert self.m_client.add_reviewer.call_count == 2
+        self.m_client.add_reviewer.assert_any_call(
+            "p~master~I1", "alice", state="REVIEWER", confirmed=None, notify="NONE"
+        )
+
+    def test_change_bulk_reviewer_add_w_ids(self):
+        args = "change bulk reviewer add I1 I2 -r bob --state CC --notify ALL"
+        self.m_client.get_by_id.side_effect = lambda change_id, options: {
+            "id": change_id,
+            "reviewers": {"CC": [{"username": "bob"}]} if change_id == "I1" else {},
+        }
+        self.m_client.add_reviewer.return_value = {"input": "bob"}
+        self.m_client.get_members.side_effect = error.HTTPError("Not found", 404)
+        self.exec_command(args)
+
+        self.m_client.iter_all.assert_not_called()
+        self.m_client.get_by_id.assert_any_call(
+            "I1", options=["DETAILED_LABELS", "DETAILED_ACCOUNTS"]
+        )
+        self.m_client.add_reviewer.assert_called_once_with(
+            "I2", "bob", state="CC", confirmed=None, notify="ALL"
+        )
+
+    @mock.patch("sys.stderr")
+    def test_change_bulk_reviewer_add_w_ids_and_query_fail(self, mocked_stderr):
+        args = "change bulk reviewer add I1 --query status:open -r bob"
+        assert self.exec_command(args) == 1
+        self.m_client.add_reviewer.assert_not_called()
+
+    def test_change_bulk_attention_set_update(self):
+        args = (
+            "change bulk attention-set update --query attention:jdoe "
+            "--remove jdoe --add delegate --add-if-removed"
+        )
+        self.m_client.iter_all.return_value = iter([{"id": "I1"}, {"id": "I2"}])
+        self.m_client.get_attention_set.side_effect = lambda change_id: (
+            [{"account": {"_account_id": 1, "username": "jdoe"}}]
+            if change_id == "I1"
+            else []
+        )
+        self.exec_command(args)
+
+        self.m_client.add_to_attention_set.assert_called_once_with(
+            "I1", "delegate", reason="Attention set update", notify="NONE"
+        )
+        self.m_client.remove_from_attention_set.assert_called_once_with(
+            "I1", "jdoe", reason="Attention set update", notify="NONE"
+        )
+
+    @mock.patch("sys.stderr")
+    def test_change_bulk_attention_set_update_wo_accounts_fail(self, mocked_stderr):
+        args = "change bulk attention-set update I1"
+        assert self.exec_command(args) == 1
+        self.m_client.get_attention_set.assert_not_called()
+
     def test_change_attention_set_show(self):
         change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
         args = f"change attention-set show {change_id}"
@@ -701,6 +1447,23 @@ class TestChangeCommand(clibase.BaseCLITest):
 
     # Change Messages tests
 
+    def test_change_bulk_hashtags_set(self):
+        args = "change bulk hashtags set I1 I2 --add a --remove b --parallel 2"
+        self.m_client.get_hashtags.side_effect = lambda change_id: {"I1": ["a"]}.get(
+            change_id, ["b"]
+        )
+        self.exec_command(args)
+
+        self.m_client.set_hashtags.assert_called_once_with(
+            "I2", add=["a"], remove=["b"]
+        )
+
+    @mock.patch("sys.stderr")
+    def test_change_bulk_hashtags_set_wo_tags_fail(self, mocked_stderr):
+        args = "change bulk hashtags set I1"
+        assert self.exec_command(args) == 1
+        self.m_client.get_hashtags.assert_not_called()
+
     def test_change_message_list(self):
         change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
         args = f"change message list {change_id} --max-width 110"
@@ -712,6 +1475,49 @@ class TestChangeCommand(clibase.BaseCLITest):
         self.m_get_client.assert_called_once_with("change", mock.ANY)
         self.m_client.get_messages.assert_called_once_with(change_id)
 
+    def test_change_bulk_message_export(self, tmp_path):
+        output = tmp_path / "messages.jsonl.gz"
+        args = (
+            f"change bulk message export --query project:gerrit --output {output} "
+            "--run-size 1"
+        )
+        self.m_client.iter_all.return_value = iter(
+            [{"id": "I1", "_number": 1}, {"id": "I2", "_number": 2}]
+        )
+        self.m_client.get_messages.side_effect = lambda change_id: [
+            {"id": f"{change_id}-1", "date": f"2024-01-0{3 - int(change_id[1])}"},
+            {"id": f"{change_id}-2", "date": "2024-01-03"},
+        ]
+        self.exec_command(args)
+
+        assert self.m_client.get_messages.call_count == 2
+        with gzip.open(output, "rt") as stream:
+            rows = [json.loads(line) for line in stream]
+        assert [r["id"] for r in rows] == ["I2-1", "I1-1", "I1-2", "I2-2"]
+
+    def test_change_bulk_message_export_to_stdout(self, capsys):
+        args = "change bulk message export I1 I2 --output - -f json"
+
+        def get_messages(change_id):
+            if change_id == "I2":
+                raise error.HTTPError("Not found", 404)
+            return [{"id": "I1-1", "date": "2024-01-01"}]
+
+        self.m_client.get_messages.side_effect = get_messages
+        self.exec_command(args)
+
+        captured = capsys.readouterr()
+        rows = [json.loads(line) for line in captured.out.splitlines()]
+        assert [r["id"] for r in rows] == ["I1-1"]
+        assert '"id": "I2"' in captured.err
+
+    @mock.patch("sys.stderr")
+    def test_change_bulk_message_export_wrong_run_size_fail(self, mocked_stderr):
+        args = "change bulk message export I1 --output - --run-size 0"
+        with pytest.raises(SystemExit):
+            self.exec_command(args)
+        self.m_client.get_messages.assert_not_called()
+
     def test_change_message_show(self):
         change_id = "I8473b95934b5732ac55d26311a706c9c2bde9940"
         message_id = "abc123"
@@ -1,4 +1,5 @@
 import json
+import os
 from unittest import mock
 
 import pytest
@@ -453,6 +454,45 @@ class TestProjectCommand(clibase.BaseCLITest):
             project_name, recursively=True
         )
 
+    def test_project_hierarchy_show(self, capsys):
+        args = "project hierarchy show --depth 1"
+        self.exec_command(args)
+
+        self.m_client.get_all.assert_called_once_with(is_all=True, tree=True)
+        self.m_client.get_children.assert_not_called()
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "Fake-Projects"
+        assert lines[1:3] == ["|-- fakes/project-1", "|-- fakes/project-10"]
+        assert lines[-1] == "`-- fakes/project-9"
+
+    def test_project_hierarchy_show_w_cache(self, tmp_path, capsys):
+        cache = tmp_path / "projects.json"
+        args = f"project hierarchy show fakes/project-1 -f json --cache {cache}"
+        self.exec_command(args)
+
+        assert json.loads(capsys.readouterr().out) == [
+            {"name": "fakes/project-1", "children": []}
+        ]
+        self.exec_command(args)
+        self.m_client.get_all.assert_called_once_with(is_all=True, tree=True)
+
+    def test_project_hierarchy_descendants(self, capsys):
+        args = "project hierarchy descendants Fake-Projects -f json"
+        self.exec_command(args)
+
+        data = json.loads(capsys.readouterr().out)
+        assert len(data) == 10
+        assert data[0] == {
+            "name": "fakes/project-1",
+            "parent": "Fake-Projects",
+            "depth": 1,
+        }
+
+    @mock.patch("sys.stderr")
+    def test_project_hierarchy_descendants_unknown_fail(self, mocked_stderr):
+        args = "project hierarchy descendants unknown"
+        assert self.exec_command(args) == 1
+
     def test_project_run_garbage_collection_wo_parameters(self):
         project_name = "fake/fake-project"
         msg = "Garbage collection completed successfully."
@@ -640,6 +680,46 @@ Garbage collection completed successfully."""
         self.m_get_client.assert_called_once_with("project", mock.ANY)
         self.m_client.get_config.assert_called_once_with(project_name)
 
+    def test_project_bulk_configuration_download_w_patterns(self, tmp_path):
+        args = (
+            "project bulk configuration download fakes/project-1? other "
+            f"-d {tmp_path} --file-format yaml --parallel 2"
+        )
+        self.m_client.get_config.side_effect = lambda name: {"description": name}
+        self.exec_command(args)
+
+        self.m_client.get_all.assert_called_once_with(is_all=True)
+        assert self.m_client.get_config.call_count == 2
+        assert sorted(os.listdir(tmp_path)) == [
+            "fakes_project_10.yaml",
+            "other.yaml",
+        ]
+
+    def test_project_bulk_configuration_download_w_regex(self, tmp_path):
+        args = f"project bulk configuration download -r fakes/.* -d {tmp_path}"
+        self.m_client.get_config.return_value = {"description": "fake"}
+        self.exec_command(args)
+
+        self.m_client.get_all.assert_called_once_with(
+            is_all=True, pattern_dispatcher={"regex": "fakes/.*"}
+        )
+        assert self.m_client.get_config.call_count == 10
+
+    @mock.patch("sys.stderr")
+    def test_project_bulk_configuration_download_wo_projects_fail(self, mocked_stderr):
+        args = "project bulk configuration download"
+        assert self.exec_command(args) == 1
+        self.m_client.get_config.assert_not_called()
+
+    @mock.patch("sys.stderr")
+    def test_project_bulk_configuration_download_colliding_fail(
+        self, mocked_stderr, tmp_path
+    ):
+        args = f"project bulk configuration download a/b a-b -d {tmp_path}"
+        assert self.exec_command(args) == 1
+        self.m_client.get_config.assert_not_called()
+        assert "same file" in "".join(c.args[0] for c in mocked_stderr.write.mock_calls)
+
     @mock.patch("gerritclient.common.utils.file_exists", mock.Mock(return_value=True))
     def test_project_configuration_set(self):
         project_name = "fakes/fake-project"
@@ -758,6 +838,58 @@ Garbage collection completed successfully."""
         self.m_get_client.assert_called_once_with("project", mock.ANY)
         self.m_client.get_access.assert_called_once_with(project_name)
 
+    def test_project_access_effective(self, tmp_path, capsys):
+        cache = tmp_path / "access.json"
+        args = (
+            "project access effective fakes/project-1 fakes/project-2 "
+            f"--ref refs/heads/main -p push -p read -f json --cache {cache}"
+        )
+        parent_access = {
+            "local": {
+                "refs/heads/*": {
+                    "permissions": {
+                        "push": {"rules": {"devs": {"action": "ALLOW", "force": True}}}
+                    }
+                }
+            },
+            "groups": {"devs": {"name": "Developers"}},
+        }
+        self.m_client.get_access.side_effect = lambda name: (
+            parent_access
+            if name == "Fake-Projects"
+            else {"inherits_from": {"name": "Fake-Projects"}, "local": {}}
+        )
+        self.exec_command(args)
+
+        assert self.m_client.get_access.call_count == 3
+        self.m_client.get_all.assert_not_called()
+        data = json.loads(capsys.readouterr().out)
+        assert [(e["project"], e["permission"]) for e in data] == [
+            ("fakes/project-1", "push"),
+            ("fakes/project-2", "push"),
+        ]
+        assert data[0] == {
+            "project": "fakes/project-1",
+            "ref": "refs/heads/main",
+            "permission": "push",
+            "group": "Developers",
+            "action": "ALLOW",
+            "source": "Fake-Projects",
+            "pattern": "refs/heads/*",
+            "force": True,
+            "range": None,
+        }
+        self.exec_command(args)
+        assert self.m_client.get_access.call_count == 3
+
+    def test_project_access_effective_w_patterns(self):
+        args = "project access effective fakes/project-1? --ref refs/heads/main -p read"
+        self.m_client.get_access.return_value = {"local": {}}
+        self.exec_command(args)
+
+        self.m_client.get_all.assert_called_once_with(is_all=True)
+        self.m_client.get_access.assert_called_once_with("fakes/project-10")
+
     # Labels tests
 
     def test_project_label_list(self):
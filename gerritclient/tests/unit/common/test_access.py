@@ -0,0 +1,268 @@
+"""Tests for gerritclient.common.access module."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import access
+
+
+def make_access(parent, local, groups=None):
+    info = {"local": local, "groups": groups or {}}
+    if parent:
+        info["inherits_from"] = {"name": parent}
+    return info
+
+
+def make_permission(rules, exclusive=False):
+    permission = {"rules": rules}
+    if exclusive:
+        permission["exclusive"] = True
+    return permission
+
+
+ACCESS = {
+    "All-Projects": make_access(
+        None,
+        {
+            "refs/*": {
+                "permissions": {
+                    "read": make_permission({"global:Anonymous-Users": {}}),
+                    "push": make_permission(
+                        {"global:Anonymous-Users": {"action": "BLOCK"}}
+                    ),
+                    "label-Code-Review": make_permission(
+                        {"devs": {"min": -1, "max": 1}}
+                    ),
+                }
+            },
+            "refs/heads/*": {
+                "permissions": {
+                    "push": make_permission({"admins": {"force": True}}),
+                    "submit": make_permission({"devs": {}}),
+                }
+            },
+        },
+        groups={"devs": {"name": "Developers"}},
+    ),
+    "base": make_access(
+        "All-Projects",
+        {
+            "refs/heads/*": {
+                "permissions": {
+                    "submit": make_permission({"devs": {"action": "DENY"}}),
+                    "push": make_permission(
+                        {"admins": {"action": "BLOCK"}, "admins-ok": {}}
+                    ),
+                }
+            },
+            "^refs/heads/release-.*": {
+                "permissions": {
+                    "submit": make_permission({"release": {}}, exclusive=True),
+                }
+            },
+        },
+        groups={"release": {"name": "Release"}},
+    ),
+    "base/a": make_access(
+        "base",
+        {
+            "refs/heads/*": {
+                "permissions": {
+                    "push": make_permission({"admins": {}}),
+                }
+            },
+            "refs/heads/main": {
+                "permissions": {
+                    "submit": make_permission({"devs": {}}),
+                }
+            },
+        },
+    ),
+    "base/b": make_access("base", {}),
+}
+
+
+def get_actions(entries):
+    return sorted((e["group"], e["action"], e["project"]) for e in entries)
+
+
+class TestAccessResolver:
+    """Tests for AccessResolver."""
+
+    @pytest.fixture(autouse=True)
+    def setup_resolver(self):
+        self.m_client = mock.Mock()
+        self.m_client.get_access.side_effect = lambda name: ACCESS[name]
+        self.resolver = access.AccessResolver(self.m_client, access=ACCESS)
+
+    def test_matches(self):
+        assert access.matches("refs/heads/*", "refs/heads/main")
+        assert access.matches("refs/heads/*", "refs/heads/*")
+        assert access.matches("refs/heads/main", "refs/heads/main")
+        assert access.matches("^refs/heads/rel-[0-9]+", "refs/heads/rel-1")
+        assert not access.matches("^refs/heads/rel-[0-9]+", "refs/heads/rel-1x")
+        assert not access.matches("refs/heads/main", "refs/heads/maint")
+        assert not access.matches("refs/tags/*", "refs/heads/main")
+        assert not access.matches("refs/heads/${username}/*", "refs/heads/u/x")
+
+    def test_get_specificity(self):
+        ref = "refs/heads/release-1"
+        patterns = ["refs/*", "refs/heads/*", ref, "^refs/heads/release-.*"]
+
+        assert sorted(patterns, key=lambda p: access.get_specificity(p, ref)) == [
+            ref,
+            "^refs/heads/release-.*",
+            "refs/heads/*",
+            "refs/*",
+        ]
+
+    def test_fetch_fetches_ancestors_once(self):
+        resolver = access.AccessResolver(self.m_client)
+
+        resolver.fetch(["base/a", "base/b"], max_workers=2)
+
+        assert sorted(resolver.access) == sorted(ACCESS)
+        assert sorted(c.args[0] for c in self.m_client.get_access.call_args_list) == [
+            "All-Projects",
+            "base",
+            "base/a",
+            "base/b",
+        ]
+
+    def test_fetch_skips_fetched(self):
+        resolver = access.AccessResolver(self.m_client, access={"base": ACCESS["base"]})
+
+        resolver.fetch(["base/b"])
+
+        assert sorted(c.args[0] for c in self.m_client.get_access.call_args_list) == [
+            "All-Projects",
+            "base/b",
+        ]
+
+    def test_fetch_fail(self):
+        self.m_client.get_access.side_effect = error.HTTPError("Forbidden", 403)
+        resolver = access.AccessResolver(self.m_client)
+
+        with pytest.raises(error.BadDataException, match="Unable to get access"):
+            resolver.fetch(["base/a"])
+
+    def test_evaluate_not_fetched_fail(self):
+        resolver = access.AccessResolver(self.m_client)
+
+        with pytest.raises(error.BadDataException, match="are not fetched"):
+            resolver.evaluate("base/a", "refs/heads/main", "read")
+
+    def test_evaluate_inherited(self):
+        entries = self.resolver.evaluate("base/b", "refs/heads/main", "read")
+
+        assert get_actions(entries) == [
+            ("global:Anonymous-Users", access.ALLOW, "All-Projects")
+        ]
+        assert entries[0]["pattern"] == "refs/*"
+
+    def test_evaluate_deny_overrides_parent(self):
+        assert self.resolver.evaluate("base/b", "refs/heads/main", "submit") == []
+
+    def test_evaluate_more_specific_pattern_wins(self):
+        entries = self.resolver.evaluate("base/a", "refs/heads/main", "submit")
+
+        assert get_actions(entries) == [("devs", access.ALLOW, "base/a")]
+        assert entries[0]["group_name"] == "Developers"
+
+    def test_evaluate_exclusive(self):
+        entries = self.resolver.evaluate("base/a", "refs/heads/release-1", "submit")
+
+        assert get_actions(entries) == [("release", access.ALLOW, "base")]
+        assert entries[0]["group_name"] == "Release"
+
+    def test_evaluate_block(self):
+        entries = self.resolver.evaluate("base/a", "refs/heads/main", "push")
+
+        assert get_actions(entries) == [
+            ("admins", access.BLOCK, "base"),
+            ("admins", access.BLOCKED, "base/a"),
+            ("admins-ok", access.BLOCKED, "base"),
+            ("global:Anonymous-Users", access.BLOCK, "All-Projects"),
+        ]
+
+    def test_evaluate_block_overridden_in_same_section(self):
+        local = {
+            "refs/*": {
+                "permissions": {
+                    "push": make_permission(
+                        {"global:Anonymous-Users": {"action": "BLOCK"}, "bots": {}}
+                    ),
+                }
+            }
+        }
+        resolver = access.AccessResolver(
+            self.m_client, access={"p": make_access(None, local)}
+        )
+
+        assert get_actions(resolver.evaluate("p", "refs/heads/x", "push")) == [
+            ("bots", access.ALLOW, "p"),
+            ("global:Anonymous-Users", access.BLOCK, "p"),
+        ]
+
+    def test_evaluate_label_range(self):
+        (entry,) = self.resolver.evaluate("base", "refs/heads/x", "label-Code-Review")
+
+        assert (entry["min"], entry["max"], entry["force"]) == (-1, 1, False)
+
+    def test_query(self):
+        entries = list(
+            self.resolver.query(
+                ["base/a", "base/b"], ["refs/heads/main"], ["read", "submit"]
+            )
+        )
+
+        assert [
+            (e["queried_project"], e["ref"], e["permission"], e["group"])
+            for e in entries
+        ] == [
+            ("base/a", "refs/heads/main", "read", "global:Anonymous-Users"),
+            ("base/a", "refs/heads/main", "submit", "devs"),
+            ("base/b", "refs/heads/main", "read", "global:Anonymous-Users"),
+        ]
+        self.m_client.get_access.assert_not_called()
+
+    def test_save_load(self, tmp_path):
+        path = str(tmp_path / "cache" / "access.json")
+        self.resolver.save(path)
+        resolver = access.AccessResolver.load(self.m_client, path, max_age=60)
+
+        assert resolver.access == ACCESS
+        assert resolver.created == self.resolver.created
+        assert not os.path.exists(f"{path}.part")
+
+    def test_save_keeps_created_of_loaded(self, tmp_path):
+        path = str(tmp_path / "access.json")
+        access.AccessResolver(
+            self.m_client, access={"base": ACCESS["base"]}, created=100
+        ).save(path)
+        resolver = access.AccessResolver.load(self.m_client, path)
+        resolver.fetch(["base/b"])
+        resolver.save(path)
+
+        resolver = access.AccessResolver.load(self.m_client, path)
+        assert resolver.created == 100
+        assert sorted(resolver.access) == ["All-Projects", "base", "base/b"]
+        assert access.AccessResolver.load(self.m_client, path, max_age=60) is None
+
+    def test_load_expired(self, tmp_path):
+        path = str(tmp_path / "access.json")
+        self.resolver.save(path)
+        os.utime(path)
+
+        assert access.AccessResolver.load(self.m_client, path, max_age=-1) is None
+        assert access.AccessResolver.load(self.m_client, str(tmp_path / "x")) is None
+
+    def test_load_malformed_fail(self, tmp_path):
+        path = tmp_path / "access.json"
+        path.write_text("{")
+
+        with pytest.raises(error.BadDataException, match="Malformed cache"):
+            access.AccessResolver.load(self.m_client, str(path))
@@ -0,0 +1,68 @@
+"""Tests for gerritclient.common.attention module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient.common import attention, bulk
+
+
+def make_attention_set(*usernames):
+    return [
+        {"account": {"_account_id": 1000 + i, "username": name}, "reason": "r"}
+        for i, name in enumerate(usernames)
+    ]
+
+
+class TestAttentionSetUpdater:
+    """Tests for AttentionSetUpdater."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+
+    def test_get_attention_accounts_from_change_info(self):
+        attention_set = {"1000": {"account": {"_account_id": 1000}}}
+
+        assert attention.get_attention_accounts(attention_set) == [
+            {"_account_id": 1000}
+        ]
+
+    def test_apply_only_needed_calls(self):
+        self.m_client.get_attention_set.return_value = make_attention_set(
+            "jdoe", "delegate"
+        )
+        updater = attention.AttentionSetUpdater(
+            self.m_client,
+            add=["delegate", "other"],
+            remove=["jdoe", "absent"],
+            reason="Vacation",
+        )
+
+        assert updater.apply("I1") == (["other"], ["jdoe"])
+        self.m_client.add_to_attention_set.assert_called_once_with(
+            "I1", "other", reason="Vacation", notify="NONE"
+        )
+        self.m_client.remove_from_attention_set.assert_called_once_with(
+            "I1", "jdoe", reason="Vacation", notify="NONE"
+        )
+
+    def test_apply_up_to_date_skipped(self):
+        self.m_client.get_attention_set.return_value = make_attention_set("delegate")
+        updater = attention.AttentionSetUpdater(
+            self.m_client, add=["delegate"], remove=["jdoe"]
+        )
+
+        with pytest.raises(bulk.SkipItem):
+            updater.apply("I1")
+        self.m_client.add_to_attention_set.assert_not_called()
+        self.m_client.remove_from_attention_set.assert_not_called()
+
+    def test_apply_add_if_removed(self):
+        self.m_client.get_attention_set.return_value = make_attention_set("owner")
+        updater = attention.AttentionSetUpdater(
+            self.m_client, add=["delegate"], remove=["jdoe"], add_if_removed=True
+        )
+
+        with pytest.raises(bulk.SkipItem):
+            updater.apply("I1")
+        self.m_client.add_to_attention_set.assert_not_called()
@@ -0,0 +1,285 @@
+"""Tests for gerritclient.common.bulk module."""
+
+import threading
+from unittest import mock
+
+import pytest
+import requests
+
+from gerritclient import error
+from gerritclient.common import bulk
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy."""
+
+    @pytest.mark.parametrize(
+        ("exc", "expected"),
+        [
+            (error.HTTPError("503 Service Unavailable", status_code=503), True),
+            (error.HTTPError("429 Too Many Requests", status_code=429), True),
+            (error.HTTPError("409 Conflict", status_code=409), False),
+            (error.HTTPError("Unknown"), False),
+            (requests.exceptions.ConnectionError(), True),
+            (requests.exceptions.Timeout(), True),
+            (error.BadDataException("Bad data"), False),
+        ],
+    )
+    def test_is_retriable(self, exc, expected):
+        assert bulk.RetryPolicy.is_retriable(exc) is expected
+
+    def test_delay_is_exponential_and_limited(self):
+        policy = bulk.RetryPolicy(backoff=1.0, max_backoff=5.0)
+
+        assert [policy.delay(a) for a in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+
+class TestExecute:
+    """Tests for execute() function."""
+
+    def test_execute_ok(self):
+        result = bulk.execute(lambda x: x * 2, 21, index=3)
+
+        assert result == bulk.Result(3, 21, bulk.OK, 42, None, 1)
+
+    def test_execute_skipped(self):
+        func = mock.Mock()
+        result = bulk.execute(func, "item", skip=lambda x: "Not needed.")
+
+        assert result.status == bulk.SKIPPED
+        assert result.detail == "Not needed."
+        func.assert_not_called()
+
+    def test_execute_skipped_by_action(self):
+        func = mock.Mock(side_effect=bulk.SkipItem("Nothing to do."))
+        result = bulk.execute(func, "item")
+
+        assert result.status == bulk.SKIPPED
+        assert result.detail == "Nothing to do."
+
+    @mock.patch("time.sleep")
+    def test_execute_retries_transient_errors(self, m_sleep):
+        func = mock.Mock(
+            side_effect=[error.HTTPError("502 Bad Gateway", status_code=502), "done"]
+        )
+        result = bulk.execute(func, "item", retry_policy=bulk.RetryPolicy(retries=2))
+
+        assert result.status == bulk.OK
+        assert result.value == "done"
+        assert result.attempts == 2
+        m_sleep.assert_called_once_with(1.0)
+
+    @mock.patch("time.sleep")
+    def test_execute_gives_up_after_retries(self, m_sleep):
+        func = mock.Mock(side_effect=requests.exceptions.ConnectionError("Refused"))
+        result = bulk.execute(func, "item", retry_policy=bulk.RetryPolicy(retries=2))
+
+        assert result.status == bulk.FAILED
+        assert result.detail == "Refused"
+        assert func.call_count == 3
+
+    def test_execute_does_not_retry_permanent_errors(self):
+        func = mock.Mock(side_effect=error.HTTPError("404 Not Found", status_code=404))
+        result = bulk.execute(func, "item", retry_policy=bulk.RetryPolicy(retries=2))
+
+        assert result.status == bulk.FAILED
+        func.assert_called_once_with("item")
+
+    def test_execute_fails_on_unexpected_errors(self):
+        func = mock.Mock(side_effect=KeyError("_number"))
+        result = bulk.execute(func, "item", retry_policy=bulk.RetryPolicy(retries=2))
+
+        assert result.status == bulk.FAILED
+        assert result.detail == "KeyError: '_number'"
+        func.assert_called_once_with("item")
+
+
+class TestRunConcurrently:
+    """Tests for run_concurrently() function."""
+
+    def test_run_concurrently_processes_all_items(self):
+        results = list(bulk.run_concurrently(lambda x: x * x, range(50), max_workers=4))
+
+        assert sorted(r.value for r in results) == [x * x for x in range(50)]
+        assert sorted(r.index for r in results) == list(range(50))
+
+    def test_run_concurrently_survives_unexpected_errors(self):
+        results = list(
+            bulk.run_concurrently(lambda x: 10 // x, range(-2, 3), max_workers=2)
+        )
+
+        assert sorted((r.item, r.status) for r in results) == [
+            (-2, bulk.OK),
+            (-1, bulk.OK),
+            (0, bulk.FAILED),
+            (1, bulk.OK),
+            (2, bulk.OK),
+        ]
+
+    def test_run_concurrently_bounds_concurrency(self):
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+        barrier = threading.Event()
+
+        def func(item):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            barrier.wait(0.01)
+            with lock:
+                state["active"] -= 1
+
+        list(bulk.run_concurrently(func, range(30), max_workers=3))
+
+        assert state["peak"] <= 3
+
+    def test_run_concurrently_consumes_items_lazily(self):
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = bulk.run_concurrently(lambda x: x, items(), max_workers=2)
+        next(results)
+        # Only a bounded number of items is taken ahead of the consumer
+        assert len(consumed) <= 2 * 2 + 1
+        results.close()
+
+    def test_run_concurrently_wrong_workers(self):
+        with pytest.raises(ValueError):
+            list(bulk.run_concurrently(lambda x: x, [1], max_workers=0))
+
+
+class TestRunDependent:
+    """Tests for run_dependent() function."""
+
+    def test_run_dependent_respects_order(self):
+        processed = []
+        lock = threading.Lock()
+
+        def func(node):
+            with lock:
+                processed.append(node)
+
+        dependencies = {"a": set(), "b": {"a"}, "c": {"b"}, "x": set()}
+        results = list(bulk.run_dependent(func, dependencies, max_workers=4))
+
+        assert {r.status for r in results} == {bulk.OK}
+        assert processed.index("a") < processed.index("b") < processed.index("c")
+        assert sorted(r.index for r in results) == [0, 1, 2, 3]
+
+    def test_run_dependent_blocks_descendants_of_failed(self):
+        def func(node):
+            if node == "b":
+                raise error.HTTPError("409 Conflict", status_code=409)
+
+        dependencies = {
+            "a": set(),
+            "b": {"a"},
+            "c": {"b"},
+            "d": {"c", "x"},
+            "x": set(),
+        }
+        results = {r.item: r for r in bulk.run_dependent(func, dependencies)}
+
+        assert results["a"].status == bulk.OK
+        assert results["x"].status == bulk.OK
+        assert results["b"].status == bulk.FAILED
+        assert results["c"].status == bulk.BLOCKED
+        assert results["d"].status == bulk.BLOCKED
+        assert results["d"].detail == "Blocked by failed upstream b."
+
+    def test_run_dependent_skipped_does_not_block(self):
+        def func(node):
+            if node == "a":
+                raise bulk.SkipItem("Already done.")
+
+        results = {
+            r.item: r for r in bulk.run_dependent(func, {"a": set(), "b": {"a"}})
+        }
+
+        assert results["a"].status == bulk.SKIPPED
+        assert results["b"].status == bulk.OK
+
+    def test_run_dependent_cycle(self):
+        with pytest.raises(error.BadDataException, match="cycle"):
+            list(bulk.run_dependent(mock.Mock(), {"a": {"b"}, "b": {"a"}}))
+
+
+class TestAdaptiveLimiter:
+    """Tests for AdaptiveLimiter."""
+
+    def test_limiter_grows_with_steady_latency(self):
+        limiter = bulk.AdaptiveLimiter(initial=2, maximum=3)
+
+        for _ in range(20):
+            limiter.record(0.1)
+
+        assert limiter.limit == 3
+
+    def test_limiter_backs_off_on_latency_rise(self):
+        limiter = bulk.AdaptiveLimiter(initial=8, maximum=8)
+        for _ in range(8):
+            limiter.record(0.1)
+
+        for _ in range(8):
+            limiter.record(1.0)
+
+        assert limiter.limit == 4
+
+    def test_limiter_backs_off_once_per_round(self):
+        limiter = bulk.AdaptiveLimiter(initial=8, maximum=8)
+        for _ in range(8):
+            limiter.record_overload()
+
+        assert limiter.limit == 4
+        limiter.record_overload()
+        assert limiter.limit == 4
+
+    def test_limiter_respects_minimum(self):
+        limiter = bulk.AdaptiveLimiter(initial=2, minimum=2, maximum=4)
+        for _ in range(10):
+            limiter.record_overload()
+
+        assert limiter.limit == 2
+
+    def test_limiter_wrong_limits(self):
+        with pytest.raises(ValueError):
+            bulk.AdaptiveLimiter(initial=10, maximum=5)
+
+
+class TestRunAdaptive:
+    """Tests for run_adaptive() function."""
+
+    def test_run_adaptive_follows_limit(self):
+        limiter = bulk.AdaptiveLimiter(initial=2, maximum=4)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def func(item):
+            with lock:
+                active.append(item)
+                peak.append(len(active))
+            with lock:
+                active.remove(item)
+
+        results = list(bulk.run_adaptive(func, range(50), limiter))
+
+        assert len(results) == 50
+        assert max(peak) <= 4
+        assert limiter.latency is not None
+
+    def test_run_adaptive_reports_overload(self):
+        limiter = bulk.AdaptiveLimiter(initial=1, maximum=2)
+        func = mock.Mock(
+            side_effect=error.HTTPError("429 Too Many Requests", status_code=429)
+        )
+
+        with mock.patch.object(limiter, "record_overload") as m_record:
+            results = list(bulk.run_adaptive(func, ["a"], limiter))
+
+        assert results[0].status == bulk.FAILED
+        m_record.assert_called_once_with()
@@ -0,0 +1,111 @@
+"""Tests for gerritclient.common.cherrypick module."""
+
+from unittest import mock
+
+import pytest
+import requests
+
+from gerritclient import error
+from gerritclient.common import bulk, cherrypick
+
+
+class TestCherryPickFanOut:
+    """Tests for CherryPickFanOut."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+        self.m_client.cherry_pick.return_value = {"id": "p~stable~I1", "_number": 42}
+
+    def test_get_short_branch_name(self):
+        assert cherrypick.get_short_branch_name("refs/heads/stable") == "stable"
+        assert cherrypick.get_short_branch_name("stable") == "stable"
+
+    def test_load_included(self):
+        self.m_client.get_included.side_effect = [
+            {"branches": ["master", "stable-1"], "tags": ["v1.0"]},
+            error.HTTPError("404 Not Found", status_code=404),
+        ]
+        fan_out = cherrypick.CherryPickFanOut(self.m_client)
+
+        fan_out.load_included(["I1", "I2"], max_workers=1)
+
+        assert fan_out.included == {"I1": {"master", "stable-1"}, "I2": set()}
+
+    def test_load_included_failure(self):
+        self.m_client.get_included.side_effect = error.HTTPError(
+            "500 Internal Server Error", status_code=500
+        )
+
+        with pytest.raises(error.BadDataException, match="I1"):
+            cherrypick.CherryPickFanOut(self.m_client).load_included(["I1"])
+
+    def test_pick_skips_included_branch(self):
+        fan_out = cherrypick.CherryPickFanOut(self.m_client)
+        fan_out.included = {"I1": {"stable-1"}}
+
+        with pytest.raises(bulk.SkipItem):
+            fan_out.pick(("I1", "refs/heads/stable-1"))
+        self.m_client.cherry_pick.assert_not_called()
+
+    def test_pick_w_topic_and_hashtags(self):
+        fan_out = cherrypick.CherryPickFanOut(
+            self.m_client, notify="NONE", topic="backport", hashtags=["fix"]
+        )
+
+        assert fan_out.pick(("I1", "stable-2"))["_number"] == 42
+        self.m_client.cherry_pick.assert_called_once_with(
+            "I1",
+            revision_id="current",
+            destination="stable-2",
+            message=None,
+            notify="NONE",
+            keep_reviewers=None,
+            allow_conflicts=None,
+        )
+        self.m_client.set_topic.assert_called_once_with("p~stable~I1", "backport")
+        self.m_client.set_hashtags.assert_called_once_with("p~stable~I1", add=["fix"])
+
+    def test_pick_tagging_failure_is_not_retried(self):
+        self.m_client.set_topic.side_effect = error.HTTPError(
+            "503 Service Unavailable", status_code=503
+        )
+        fan_out = cherrypick.CherryPickFanOut(self.m_client, topic="backport")
+        policy = bulk.RetryPolicy(retries=3, backoff=0)
+
+        result = bulk.execute(fan_out.pick, ("I1", "stable-2"), retry_policy=policy)
+
+        assert result.status == bulk.FAILED
+        assert "Change 42 was created" in result.detail
+        self.m_client.cherry_pick.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            error.HTTPError("502 Bad Gateway", status_code=502),
+            requests.exceptions.ReadTimeout("Read timed out"),
+        ],
+    )
+    def test_pick_processed_failure_is_not_retried(self, exc):
+        self.m_client.cherry_pick.side_effect = exc
+        fan_out = cherrypick.CherryPickFanOut(self.m_client)
+        policy = bulk.RetryPolicy(retries=3, backoff=0)
+
+        result = bulk.execute(fan_out.pick, ("I1", "stable-2"), retry_policy=policy)
+
+        assert result.status == bulk.FAILED
+        assert "was not retried" in result.detail
+        self.m_client.cherry_pick.assert_called_once()
+
+    def test_pick_rejected_request_is_retried(self):
+        self.m_client.cherry_pick.side_effect = [
+            requests.exceptions.ConnectTimeout("Connect timed out"),
+            error.HTTPError("429 Too Many Requests", status_code=429),
+            {"id": "p~stable~I1", "_number": 42},
+        ]
+        fan_out = cherrypick.CherryPickFanOut(self.m_client)
+        policy = bulk.RetryPolicy(retries=3, backoff=0)
+
+        result = bulk.execute(fan_out.pick, ("I1", "stable-2"), retry_policy=policy)
+
+        assert result.status == bulk.OK
+        assert self.m_client.cherry_pick.call_count == 3
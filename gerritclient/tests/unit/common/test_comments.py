@@ -0,0 +1,86 @@
+"""Tests for gerritclient.common.comments module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient.common import bulk, comments
+
+
+def make_comments(**files):
+    return {
+        path: [
+            {
+                "id": f"c{line}",
+                "patch_set": 2,
+                "line": line,
+                "author": {"_account_id": 1000},
+                "message": "nit",
+            }
+            for line in lines
+        ]
+        for path, lines in files.items()
+    }
+
+
+class TestCommentHarvester:
+    """Tests for CommentHarvester."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+
+    def test_get_records(self):
+        records = list(
+            comments.get_records("I1", make_comments(b=[3], a=[1, 2]), "published")
+        )
+
+        assert [(r["file"], r["line"]) for r in records] == [
+            ("a", 1),
+            ("a", 2),
+            ("b", 3),
+        ]
+        assert set(records[0]) == set(comments.RECORD_FIELDS)
+        assert records[0]["change"] == "I1"
+        assert records[0]["author"] == 1000
+        assert records[0]["side"] == "REVISION"
+
+    def test_fetch(self):
+        self.m_client.get_comments.return_value = make_comments(a=[1])
+        harvester = comments.CommentHarvester(self.m_client, ["drafts", "robot"])
+
+        records = harvester.fetch("I1", "robot")
+
+        assert [r["type"] for r in records] == ["robot"]
+        self.m_client.get_comments.assert_called_once_with(
+            "I1", comment_type="robotcomments"
+        )
+
+    def test_unknown_type_fail(self):
+        with pytest.raises(ValueError, match="Unknown comment types: bogus"):
+            comments.CommentHarvester(self.m_client, ["bogus"])
+
+    def test_harvest(self):
+        self.m_client.get_comments.return_value = make_comments(a=[1])
+        harvester = comments.CommentHarvester(self.m_client)
+
+        results = list(harvester.harvest(iter(["I1", "I2"]), max_workers=2))
+
+        assert sorted(r.item for r in results) == [
+            ("I1", "published"),
+            ("I2", "published"),
+        ]
+        assert all(r.status == bulk.OK and len(r.value) == 1 for r in results)
+        self.m_client.get_comments.assert_called_with(mock.ANY, comment_type=None)
+
+    def test_harvest_all_types(self):
+        self.m_client.get_comments.side_effect = lambda change_id, comment_type: (
+            make_comments(a=[1]) if comment_type == "robotcomments" else {}
+        )
+        harvester = comments.CommentHarvester(self.m_client, ["drafts", "robot"])
+
+        results = list(harvester.harvest(["I1"], max_workers=2))
+
+        assert sorted((r.item, len(r.value)) for r in results) == [
+            (("I1", "drafts"), 0),
+            (("I1", "robot"), 1),
+        ]
@@ -0,0 +1,82 @@
+"""Tests for gerritclient.common.configs module."""
+
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, configs
+
+
+class TestConfigDownloader:
+    """Tests for ConfigDownloader."""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self, tmp_path):
+        self.m_client = mock.Mock()
+        self.m_client.get_config.side_effect = lambda name: {"description": name}
+        self.directory = str(tmp_path / "configs")
+
+    def run(self, projects, data_format="json"):
+        downloader = configs.ConfigDownloader(
+            self.m_client, self.directory, data_format=data_format
+        )
+        return {r.item: r.status for r in downloader.run(projects, max_workers=2)}
+
+    def test_select_projects(self):
+        projects = ["tools/a", "tools/b/c", "apps/x"]
+
+        assert configs.select_projects(projects, ["tools/*", "other"]) == [
+            "other",
+            "tools/a",
+            "tools/b/c",
+        ]
+        assert configs.select_projects(projects, ["apps/?"]) == ["apps/x"]
+
+    def test_download(self):
+        assert self.run(["tools/a", "apps/x"]) == {
+            "tools/a": bulk.OK,
+            "apps/x": bulk.OK,
+        }
+
+        with open(os.path.join(self.directory, "tools_a.json")) as stream:
+            assert json.load(stream) == {"description": "tools/a"}
+        assert sorted(os.listdir(self.directory)) == ["apps_x.json", "tools_a.json"]
+
+    def test_download_skips_unchanged(self):
+        self.run(["tools/a", "apps/x"])
+        path = os.path.join(self.directory, "apps_x.json")
+        modified = os.stat(path).st_mtime_ns
+        self.m_client.get_config.side_effect = lambda name: {
+            "description": "new" if name == "tools/a" else name
+        }
+
+        assert self.run(["tools/a", "apps/x"]) == {
+            "tools/a": bulk.OK,
+            "apps/x": bulk.SKIPPED,
+        }
+        assert os.stat(path).st_mtime_ns == modified
+
+    def test_download_failure_keeps_file(self):
+        self.run(["tools/a"])
+        self.m_client.get_config.side_effect = error.HTTPError("Not found", 404)
+
+        assert self.run(["tools/a"]) == {"tools/a": bulk.FAILED}
+        assert os.listdir(self.directory) == ["tools_a.json"]
+
+    def test_download_colliding_names_fail(self):
+        with pytest.raises(error.BadDataException, match="a/b, a_b -> a_b"):
+            self.run(["a/b", "a_b", "tools/a"])
+
+        self.m_client.get_config.assert_not_called()
+
+    def test_download_write_failure(self):
+        os.makedirs(os.path.join(self.directory, "tools_a.json", "x"))
+
+        assert self.run(["tools/a", "apps/x"]) == {
+            "tools/a": bulk.FAILED,
+            "apps/x": bulk.OK,
+        }
+        assert sorted(os.listdir(self.directory)) == ["apps_x.json", "tools_a.json"]
@@ -0,0 +1,86 @@
+"""Tests for gerritclient.common.consistency module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, consistency
+
+
+class TestProblems:
+    """Tests for problem aggregation helpers."""
+
+    @pytest.mark.parametrize(
+        ("message", "expected"),
+        [
+            (
+                "Patch set 2 (" + "ab" * 20 + ") is missing",
+                "Patch set <n> (<sha1>) is missing",
+            ),
+            (
+                "Ref refs/changes/01/1/2 points to nothing",
+                "Ref <ref> points to nothing",
+            ),
+            ("Current patch set not found", "Current patch set not found"),
+        ],
+    )
+    def test_get_problem_type(self, message, expected):
+        assert consistency.get_problem_type(message) == expected
+
+    def test_summarize(self):
+        problems = {
+            "I2": [{"message": "Patch set 1 is missing"}],
+            "I1": [
+                {"message": "Patch set 3 is missing"},
+                {"message": "Current patch set not found"},
+            ],
+        }
+
+        assert consistency.summarize(problems) == {
+            "Patch set <n> is missing": ["I1", "I2"],
+            "Current patch set not found": ["I1"],
+        }
+
+
+class TestConsistencySweeper:
+    """Tests for ConsistencySweeper."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+
+    def test_sweep(self):
+        self.m_client.check_consistency.side_effect = lambda change_id: (
+            {"problems": [{"message": "broken"}]} if change_id == "I2" else {}
+        )
+        sweeper = consistency.ConsistencySweeper(self.m_client)
+
+        results = {r.item: r.value for r in sweeper.sweep(["I1", "I2"])}
+
+        assert results == {"I1": [], "I2": [{"message": "broken"}]}
+
+    def test_fix(self):
+        self.m_client.fix_consistency.return_value = {
+            "problems": [{"message": "broken", "status": "FIXED"}]
+        }
+        sweeper = consistency.ConsistencySweeper(self.m_client, is_delete=True)
+
+        assert sweeper.fix("I1") == [{"message": "broken", "status": "FIXED"}]
+        self.m_client.fix_consistency.assert_called_once_with(
+            "I1", is_delete=True, expect_merged_as=False
+        )
+
+    def test_fix_failed(self):
+        self.m_client.fix_consistency.return_value = {
+            "problems": [
+                {"message": "broken", "status": "FIX_FAILED", "outcome": "denied"}
+            ]
+        }
+        sweeper = consistency.ConsistencySweeper(self.m_client)
+
+        result = bulk.execute(sweeper.fix, "I1")
+
+        assert result.status == bulk.FAILED
+        assert result.detail == "broken: denied"
+        with pytest.raises(error.BadDataException):
+            sweeper.fix("I1")
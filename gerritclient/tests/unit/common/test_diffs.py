@@ -0,0 +1,79 @@
+"""Tests for gerritclient.common.diffs module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import diffs
+
+FILES = {
+    "/COMMIT_MSG": {"status": "A", "lines_inserted": 7},
+    "src/app.py": {"lines_inserted": 3, "lines_deleted": 1, "size_delta": 42},
+    "static/app.min.js": {"lines_inserted": 1},
+    "logo.png": {"binary": True, "status": "A"},
+}
+
+
+class TestDiffs:
+    """Tests for diff bundle helpers."""
+
+    def test_is_generated(self):
+        assert diffs.is_generated("web/yarn.lock")
+        assert diffs.is_generated("api/v1/service_pb2.py")
+        assert not diffs.is_generated("src/app.py")
+        assert diffs.is_generated("src/app.py", patterns=("src/*",))
+
+    def test_select_files(self):
+        selected = diffs.select_files(FILES, skip_binary=True, skip_generated=True)
+
+        assert [path for path, _ in selected] == ["/COMMIT_MSG", "src/app.py"]
+
+    def test_select_files_all(self):
+        assert len(diffs.select_files(FILES)) == len(FILES)
+
+    def test_get_record(self):
+        record = diffs.get_record("src/app.py", FILES["src/app.py"], {"content": []})
+
+        assert record == {
+            "path": "src/app.py",
+            "binary": False,
+            "status": "M",
+            "old_path": None,
+            "lines_inserted": 3,
+            "lines_deleted": 1,
+            "size_delta": 42,
+            "diff": {"content": []},
+        }
+
+    def test_iter_diffs(self):
+        m_client = mock.Mock()
+        m_client.get_file_diff.side_effect = lambda change_id, path, **kwargs: {
+            "meta_b": {"name": path}
+        }
+
+        records = list(
+            diffs.iter_diffs(
+                m_client,
+                "I1",
+                sorted(FILES.items()),
+                revision_id=2,
+                max_workers=2,
+                base=1,
+            )
+        )
+
+        assert sorted(r["path"] for r in records) == sorted(FILES)
+        assert all(r["diff"]["meta_b"]["name"] == r["path"] for r in records)
+        m_client.get_file_diff.assert_any_call(
+            "I1", "src/app.py", revision_id=2, base=1
+        )
+
+    def test_iter_diffs_fail(self):
+        m_client = mock.Mock()
+        m_client.get_file_diff.side_effect = error.HTTPError("Not found", 404)
+
+        with pytest.raises(
+            error.BadDataException, match="Unable to get the diff of src/app"
+        ):
+            list(diffs.iter_diffs(m_client, "I1", [("src/app.py", {})]))
@@ -0,0 +1,170 @@
+"""Tests for gerritclient.common.export module."""
+
+import gzip
+import json
+import sys
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import export
+from gerritclient.tests.utils import fake_change
+
+
+class TestFlatten:
+    """Tests for flattening helpers."""
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("owner.username", "jdoe"),
+            ("labels.Code-Review.all.0._account_id", 1000096),
+            ("labels.Code-Review.all.9._account_id", None),
+            ("owner.missing", None),
+            ("subject.length", None),
+        ],
+    )
+    def test_get_path(self, path, expected):
+        change = fake_change.get_fake_change()
+
+        assert export.get_path(change, path) == expected
+
+    def test_flatten(self):
+        change = fake_change.get_fake_change(identifier="p~master~I1", topic="t")
+
+        row = export.flatten(change, {"id": "id", "owner": "owner.email", "x": "x"})
+
+        assert row == {"id": "p~master~I1", "owner": "john.doe@example.com", "x": None}
+
+    def test_load_schema_from_list(self):
+        with mock.patch(
+            "gerritclient.common.utils.read_from_file",
+            return_value=["id", "owner.email"],
+        ):
+            schema = export.load_schema("/tmp/schema.yaml")
+
+        assert schema == {"id": "id", "owner_email": "owner.email"}
+
+    def test_load_schema_wrong(self):
+        with (
+            mock.patch("gerritclient.common.utils.read_from_file", return_value="id"),
+            pytest.raises(error.BadDataException),
+        ):
+            export.load_schema("/tmp/schema.yaml")
+
+
+class TestWriters:
+    """Tests for export writers."""
+
+    @pytest.mark.parametrize(
+        ("file_name", "expected"),
+        [
+            ("changes.jsonl", (export.JSONL, None)),
+            ("changes.jsonl.gz", (export.JSONL, "gzip")),
+            ("changes.xz", (export.JSONL, "xz")),
+            ("changes.parquet", (export.PARQUET, None)),
+        ],
+    )
+    def test_guess_format(self, file_name, expected):
+        assert (
+            export.get_format(file_name),
+            export.get_compression(file_name),
+        ) == expected
+
+    def test_jsonl_writer_compressed(self, tmp_path):
+        path = str(tmp_path / "changes.jsonl.gz")
+
+        with export.get_writer(path) as writer:
+            writer.write({"id": "I1"})
+            writer.write({"id": "I2", "hashtags": ["a"]})
+
+        with gzip.open(path, "rt") as stream:
+            lines = [json.loads(line) for line in stream]
+        assert lines == [{"id": "I1"}, {"id": "I2", "hashtags": ["a"]}]
+        assert writer.count == 2
+
+    def test_jsonl_writer_stdout_compressed_fail(self):
+        with pytest.raises(error.BadDataException):
+            export.JsonLinesWriter("-", compression="gzip")
+
+    def test_parquet_writer_wo_pyarrow(self):
+        with (
+            mock.patch.dict(sys.modules, {"pyarrow": None}),
+            pytest.raises(error.BadDataException, match="pyarrow"),
+        ):
+            export.get_writer("/tmp/changes.parquet")
+
+    def test_parquet_writer(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "changes.parquet")
+
+        with export.ParquetWriter(path, batch_size=2) as writer:
+            for number in range(5):
+                writer.write({"number": number, "topic": None, "hashtags": ["a"]})
+
+        table = pq.read_table(path)
+        assert table.num_rows == 5
+        assert table.column("hashtags").to_pylist()[0] == '["a"]'
+
+    def test_parquet_writer_typed_field_after_first_group(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "changes.parquet")
+        schema = export.CHANGE_SCHEMA
+
+        with export.ParquetWriter(
+            path,
+            batch_size=2,
+            columns=list(schema),
+            types=export.get_types(schema),
+        ) as writer:
+            writer.write(export.flatten({"_number": 1}, schema))
+            writer.write(export.flatten({"_number": 2}, schema))
+            writer.write(
+                export.flatten({"_number": 3, "work_in_progress": True}, schema)
+            )
+
+        table = pq.read_table(path)
+        assert str(table.schema.field("work_in_progress").type) == "bool"
+        assert str(table.schema.field("number").type) == "int64"
+        assert table.column("work_in_progress").to_pylist() == [None, None, True]
+
+    def test_parquet_writer_untyped_field_after_first_group(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "changes.parquet")
+
+        with export.ParquetWriter(path, batch_size=1) as writer:
+            writer.write({"number": 1, "custom": None})
+            writer.write({"number": 2, "custom": 5})
+
+        table = pq.read_table(path)
+        assert table.column("custom").to_pylist() == [None, "5"]
+        assert table.column("number").to_pylist() == [1, 2]
+
+    def test_get_types(self):
+        schema = {"n": "_number", "wip": "work_in_progress", "x": "labels"}
+
+        assert export.get_types(schema) == {"n": "int64", "wip": "bool"}
+
+    def test_parquet_writer_wo_records(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "changes.parquet")
+
+        with export.get_writer(path, columns=["number", "topic"]) as writer:
+            assert writer.count == 0
+
+        table = pq.read_table(path)
+        assert table.num_rows == 0
+        assert table.column_names == ["number", "topic"]
+
+    def test_parquet_writer_wo_records_typed(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "changes.parquet")
+
+        with export.get_writer(
+            path, columns=["number", "topic"], types={"number": "int64"}
+        ):
+            pass
+
+        schema = pq.read_table(path).schema
+        assert [str(f.type) for f in schema] == ["int64", "string"]
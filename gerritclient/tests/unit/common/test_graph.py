@@ -0,0 +1,90 @@
+"""Tests for gerritclient.common.graph module."""
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import graph
+from gerritclient.tests.utils import fake_change
+
+
+class TestGraph:
+    """Tests for dependency graph helpers."""
+
+    def test_topological_sort(self):
+        dependencies = {3: {2}, 2: {1}, 1: set(), 5: set(), 4: {1, 5}}
+
+        assert graph.topological_sort(dependencies) == [1, 2, 3, 5, 4]
+
+    def test_topological_sort_ignores_unknown_parents(self):
+        assert graph.topological_sort({"b": {"a"}}) == ["b"]
+
+    def test_topological_sort_cycle(self):
+        dependencies = {1: set(), 2: {1, 3}, 3: {2}}
+
+        with pytest.raises(error.BadDataException, match="2, 3"):
+            graph.topological_sort(dependencies)
+
+    def test_get_descendants(self):
+        children = graph.get_children({1: set(), 2: {1}, 3: {2}, 4: set()})
+
+        assert graph.get_descendants(children, 1) == {2, 3}
+        assert graph.get_descendants(children, 4) == set()
+
+    def test_transitive_reduction(self):
+        dependencies = {1: set(), 2: {1}, 3: {1, 2}, 4: {1, 5}, 5: set()}
+
+        assert graph.transitive_reduction(dependencies) == {
+            1: set(),
+            2: {1},
+            3: {2},
+            4: {1, 5},
+            5: set(),
+        }
+
+    def test_find_cycles(self):
+        dependencies = {1: set(), 2: {1, 3}, 3: {2}, 4: {4}, 5: {4, 9}}
+
+        assert graph.find_cycles(dependencies) == [[2, 3], [4]]
+
+    def test_find_cycles_acyclic(self):
+        assert graph.find_cycles({1: set(), 2: {1}, 3: {1, 2}}) == []
+
+    def test_to_dot(self):
+        dot = graph.to_dot({1: set(), 2: {1}}, labels={2: 'Fix "quotes"'})
+
+        assert dot == (
+            'digraph "dependencies" {\n'
+            "  rankdir=BT;\n"
+            '  "1" [label="1"];\n'
+            '  "2" [label="Fix \\"quotes\\""];\n'
+            '  "2" -> "1";\n'
+            "}\n"
+        )
+
+
+class TestRelationChains:
+    """Tests for relation chain helpers."""
+
+    def test_get_chain_parents(self):
+        related = fake_change.get_fake_related_changes(1, 2, 3)
+
+        assert graph.get_chain_parents(related) == {1: None, 2: 1, 3: 2}
+
+    def test_get_nearest_ancestor(self):
+        parents = {3: 2, 2: 1, 1: None}
+
+        assert graph.get_nearest_ancestor(3, parents, {1, 3}) == 1
+        assert graph.get_nearest_ancestor(3, parents, {3}) is None
+
+    def test_get_chain_dependencies(self):
+        related = [
+            fake_change.get_fake_related_changes(1, 2, 3),
+            fake_change.get_fake_related_changes(4, 5),
+        ]
+
+        assert graph.get_chain_dependencies({1, 3, 5, 6}, related) == {
+            1: set(),
+            3: {1},
+            5: set(),
+            6: set(),
+        }
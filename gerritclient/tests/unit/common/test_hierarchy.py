@@ -0,0 +1,135 @@
+"""Tests for gerritclient.common.hierarchy module."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import hierarchy
+
+PARENTS = {
+    "All-Projects": None,
+    "All-Users": "All-Projects",
+    "base": "All-Projects",
+    "base/a": "base",
+    "base/b": "base",
+    "base/a/x": "base/a",
+}
+
+
+class TestProjectHierarchy:
+    """Tests for ProjectHierarchy."""
+
+    @pytest.fixture(autouse=True)
+    def setup_hierarchy(self):
+        self.hierarchy = hierarchy.ProjectHierarchy(PARENTS)
+
+    def test_get_roots(self):
+        assert self.hierarchy.get_roots() == ["All-Projects"]
+        assert hierarchy.ProjectHierarchy({"a": "b"}).get_roots() == ["b"]
+
+    def test_get_ancestors(self):
+        assert self.hierarchy.get_ancestors("base/a/x") == [
+            "base/a",
+            "base",
+            "All-Projects",
+        ]
+
+    def test_get_descendants(self):
+        assert self.hierarchy.get_descendants("base") == [
+            "base/a",
+            "base/a/x",
+            "base/b",
+        ]
+        assert self.hierarchy.get_descendants("base/b") == []
+
+    def test_walk_w_max_depth(self):
+        assert list(self.hierarchy.walk("All-Projects", max_depth=1)) == [
+            ("All-Users", "All-Projects", 1),
+            ("base", "All-Projects", 1),
+        ]
+
+    def test_to_dict(self):
+        assert self.hierarchy.to_dict("base") == {
+            "name": "base",
+            "children": [
+                {
+                    "name": "base/a",
+                    "children": [{"name": "base/a/x", "children": []}],
+                },
+                {"name": "base/b", "children": []},
+            ],
+        }
+
+    def test_render(self):
+        assert self.hierarchy.render("All-Projects") == (
+            "All-Projects\n"
+            "|-- All-Users\n"
+            "`-- base\n"
+            "    |-- base/a\n"
+            "    |   `-- base/a/x\n"
+            "    `-- base/b\n"
+        )
+
+    def test_save_load(self, tmp_path):
+        path = str(tmp_path / "cache" / "projects.json")
+        self.hierarchy.save(path)
+
+        loaded = hierarchy.ProjectHierarchy.load(path, max_age=60)
+
+        assert loaded.parents == PARENTS
+        assert loaded.created == self.hierarchy.created
+        assert not os.path.exists(f"{path}.part")
+
+    def test_load_expired(self, tmp_path):
+        path = str(tmp_path / "projects.json")
+        hierarchy.ProjectHierarchy(PARENTS, created=0).save(path)
+
+        assert hierarchy.ProjectHierarchy.load(path, max_age=60) is None
+        assert hierarchy.ProjectHierarchy.load(str(tmp_path / "missing")) is None
+
+    def test_load_malformed_fail(self, tmp_path):
+        path = tmp_path / "projects.json"
+        path.write_text("{")
+
+        with pytest.raises(error.BadDataException, match="Malformed cache"):
+            hierarchy.ProjectHierarchy.load(str(path))
+
+
+class TestFetch:
+    """Tests for fetching the hierarchy."""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        self.m_client = mock.Mock()
+        self.m_client.get_children.side_effect = lambda name: [
+            {"name": child} for child, parent in PARENTS.items() if parent == name
+        ]
+
+    def test_fetch_from_listing(self):
+        self.m_client.get_all.return_value = {
+            name: {"parent": parent} if parent else {}
+            for name, parent in PARENTS.items()
+        }
+
+        project_hierarchy = hierarchy.fetch(self.m_client)
+
+        assert project_hierarchy.parents == PARENTS
+        self.m_client.get_all.assert_called_once_with(is_all=True, tree=True)
+        self.m_client.get_children.assert_not_called()
+
+    def test_fetch_w_children(self):
+        self.m_client.get_all.return_value = {name: {} for name in PARENTS}
+
+        project_hierarchy = hierarchy.fetch(self.m_client, max_workers=2)
+
+        assert project_hierarchy.parents == PARENTS
+        assert self.m_client.get_children.call_count == len(PARENTS)
+
+    def test_fetch_w_children_fail(self):
+        self.m_client.get_all.return_value = {name: {} for name in PARENTS}
+        self.m_client.get_children.side_effect = error.HTTPError("Forbidden", 403)
+
+        with pytest.raises(error.BadDataException, match="Unable to get children"):
+            hierarchy.fetch(self.m_client)
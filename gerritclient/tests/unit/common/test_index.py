@@ -0,0 +1,177 @@
+"""Tests for gerritclient.common.index module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import index, utils
+
+NOW = utils.parse_timestamp("2024-01-10 00:00:00.000000000")
+
+
+def make_change(number, updated="2024-01-01 00:00:00.000000000", **kwargs):
+    change = {
+        "id": f"project~master~I{number}",
+        "_number": number,
+        "project": "project",
+        "branch": "master",
+        "status": "NEW",
+        "owner": {"_account_id": 1000, "username": "jdoe", "email": "j@e.com"},
+        "updated": updated,
+    }
+    change.update(kwargs)
+    return change
+
+
+CHANGES = [
+    make_change(1, topic="release", hashtags=["Perf"]),
+    make_change(2, status="MERGED", branch="stable", project="project/sub"),
+    make_change(
+        3,
+        status="ABANDONED",
+        updated="2024-01-09 12:00:00.000000000",
+        owner={"_account_id": 1001, "username": "other"},
+    ),
+]
+
+
+class TestQueryCompiler:
+    """Tests for parsing of queries."""
+
+    def test_tokenize(self):
+        assert index.tokenize('-status:open (topic:"a b" OR -(hashtag:x))') == [
+            "-status:open",
+            "(",
+            'topic:"a b"',
+            "OR",
+            "-",
+            "(",
+            "hashtag:x",
+            ")",
+            ")",
+        ]
+
+    @pytest.mark.parametrize(
+        ("value", "seconds"), [("30s", 30), ("2d", 172800), ("3weeks", 1814400)]
+    )
+    def test_parse_age(self, value, seconds):
+        assert index.parse_age(value) == seconds
+
+    @pytest.mark.parametrize(
+        ("query", "message"),
+        [
+            ("reviewer:jdoe", "Operator 'reviewer' is not supported"),
+            ("owner:self", "owner:self"),
+            ("status:draft", "Unsupported status"),
+            ("(status:open", "Unbalanced parentheses"),
+            ("status:open )", "Unexpected"),
+            ("fix bug", "Free text search"),
+            ("age:1fortnight", "Unsupported age"),
+        ],
+    )
+    def test_compile_fail(self, query, message):
+        with pytest.raises(error.BadDataException, match=message):
+            index.QueryCompiler(now=NOW).compile(query)
+
+
+class TestChangeIndex:
+    """Tests for ChangeIndex."""
+
+    @pytest.fixture(autouse=True)
+    def setup_index(self, tmp_path):
+        self.m_client = mock.Mock()
+        self.m_client.iter_all.return_value = iter(CHANGES)
+        self.change_index = index.ChangeIndex(str(tmp_path / "index" / "db.sqlite"))
+        self.change_index.sync(self.m_client, "project:project", page_size=2)
+        yield
+        self.change_index.close()
+
+    def query(self, query):
+        return [c["_number"] for c in self.change_index.query(query, now=NOW)]
+
+    def test_sync_full(self):
+        self.m_client.iter_all.assert_called_once_with(
+            "project:project", options=["DETAILED_ACCOUNTS"], page_size=2
+        )
+        assert self.change_index.count() == 3
+        assert (
+            self.change_index.get_meta("last_updated")
+            == "2024-01-09 12:00:00.000000000"
+        )
+
+    def test_sync_incremental(self):
+        self.m_client.iter_all.return_value = iter(
+            [make_change(1, status="MERGED", updated="2024-01-09 13:00:00.000000000")]
+        )
+
+        assert self.change_index.sync(self.m_client, "project:project") == 1
+
+        self.m_client.iter_all.assert_called_with(
+            '(project:project) since:"2024-01-09 12:00:00"',
+            options=["DETAILED_ACCOUNTS"],
+            page_size=500,
+        )
+        # The only open change was fetched by the incremental query
+        assert self.m_client.iter_all.call_count == 2
+        assert self.change_index.count() == 3
+        assert self.query("status:merged") == [1, 2]
+        # Hashtags of the updated change are replaced
+        assert self.query("hashtag:perf") == []
+
+    def test_sync_refreshes_open_changes(self):
+        self.change_index.upsert([make_change(4), make_change(5)])
+        self.m_client.iter_all.side_effect = lambda query, **kwargs: iter(
+            [make_change(1, status="MERGED"), make_change(4, status="ABANDONED")]
+            if query.startswith("change:")
+            else []
+        )
+
+        assert self.change_index.sync(self.m_client, "project:project") == 2
+
+        self.m_client.iter_all.assert_called_with(
+            "change:1 OR change:4 OR change:5",
+            options=["DETAILED_ACCOUNTS"],
+            page_size=index.REFRESH_BATCH_SIZE,
+        )
+        assert self.query("status:open") == []
+        assert self.query("status:abandoned") == [3, 4]
+        # Change 5 is not visible any more
+        assert self.change_index.count() == 4
+
+    def test_sync_other_query_fail(self):
+        with pytest.raises(error.BadDataException, match="run a full sync"):
+            self.change_index.sync(self.m_client, "project:other")
+
+    def test_sync_other_query_full(self):
+        self.m_client.iter_all.return_value = iter([make_change(7)])
+
+        self.change_index.sync(self.m_client, "project:other", full=True)
+
+        assert self.change_index.count() == 1
+        assert self.change_index.get_meta("query") == "project:other"
+
+    @pytest.mark.parametrize(
+        ("query", "numbers"),
+        [
+            ("status:open", [1]),
+            ("is:closed", [3, 2]),
+            ("-status:open", [3, 2]),
+            ("project:project", [3, 1]),
+            ("projects:project/", [2]),
+            ("branch:refs/heads/stable", [2]),
+            ("owner:other", [3]),
+            ("owner:1000 status:open", [1]),
+            ("owner:j@e.com AND topic:release", [1]),
+            ("hashtag:PERF", [1]),
+            ("age:1d", [2, 1]),
+            ("-age:1d", [3]),
+            ("status:merged OR topic:release", [2, 1]),
+            ("NOT (status:merged OR topic:release)", [3]),
+        ],
+    )
+    def test_query(self, query, numbers):
+        assert self.query(query) == numbers
+
+    def test_query_w_limit(self):
+        assert len(self.change_index.query("is:closed", limit=1)) == 1
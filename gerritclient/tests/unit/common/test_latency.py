@@ -0,0 +1,134 @@
+"""Tests for gerritclient.common.latency module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient.common import bulk, latency
+
+
+def make_change(number=1, owner=1000, status="NEW", submitted=None, **kwargs):
+    change = {
+        "id": f"I{number}",
+        "_number": number,
+        "project": "gerrit",
+        "owner": {"_account_id": owner},
+        "status": status,
+        "created": "2024-01-01 00:00:00.000000000",
+    }
+    if submitted:
+        change["submitted"] = submitted
+    change.update(kwargs)
+    return change
+
+
+def make_message(account, date, tag=None):
+    message = {"author": {"_account_id": account}, "date": date}
+    if tag:
+        message["tag"] = tag
+    return message
+
+
+class TestLatency:
+    """Tests for latency metrics and their aggregation."""
+
+    def test_get_metrics(self):
+        change = make_change(status="MERGED", submitted="2024-01-02 00:00:00.000000000")
+        messages = [
+            make_message(1002, "2024-01-01 05:00:00.000000000"),
+            make_message(1000, "2024-01-01 00:30:00.000000000"),
+            make_message(1003, "2024-01-01 01:00:00.000000000", "autogenerated:ci"),
+            make_message(1001, "2024-01-01 02:00:00.000000000"),
+            make_message(1001, "2024-01-01 03:00:00.000000000"),
+        ]
+
+        metrics = latency.get_metrics(change, messages)
+
+        assert metrics[latency.FIRST_REVIEW] == 7200
+        assert metrics[latency.MERGE] == 86400
+        assert metrics["reviewers"] == {1001: 7200, 1002: 18000}
+        assert metrics["owner"] == 1000
+
+    def test_get_metrics_not_reviewed(self):
+        metrics = latency.get_metrics(make_change(), [])
+
+        assert metrics[latency.FIRST_REVIEW] is None
+        assert metrics[latency.MERGE] is None
+
+    def test_percentile(self):
+        values = [1, 2, 3, 4, 5]
+
+        assert latency.percentile(values, 50) == 3
+        assert latency.percentile(values, 90) == pytest.approx(4.6)
+        assert latency.percentile(values, 100) == 5
+        assert latency.percentile([7], 99) == 7
+
+    def test_aggregate_by_project(self):
+        metrics_list = [
+            {"project": "a", latency.FIRST_REVIEW: h * 3600, latency.MERGE: None}
+            for h in (1, 2, 3)
+        ] + [{"project": "b", latency.FIRST_REVIEW: None, latency.MERGE: 60}]
+
+        rows = latency.aggregate(
+            metrics_list, "project", latency.FIRST_REVIEW, percentiles=(50, 100)
+        )
+
+        assert rows == [("a", 3, 2.0, 2.0, 3.0)]
+
+    def test_aggregate_by_reviewer(self):
+        metrics_list = [
+            {
+                "reviewers": {1001: 60, 1002: 120},
+                latency.FIRST_REVIEW: 60,
+                latency.MERGE: 600,
+            },
+            {"reviewers": {1001: 180}, latency.FIRST_REVIEW: 180, latency.MERGE: None},
+        ]
+
+        assert latency.aggregate(
+            metrics_list, "reviewer", latency.FIRST_REVIEW, (50,), unit="minutes"
+        ) == [(1001, 2, 2.0, 2.0), (1002, 1, 2.0, 2.0)]
+        assert latency.aggregate(
+            metrics_list, "reviewer", latency.MERGE, (50,), unit="minutes"
+        ) == [(1001, 1, 10.0, 10.0), (1002, 1, 10.0, 10.0)]
+
+    def test_aggregate_unsupported_grouping_fail(self):
+        with pytest.raises(ValueError, match="Unsupported grouping"):
+            latency.aggregate([], "branch", latency.MERGE)
+
+
+class TestLatencyCollector:
+    """Tests for LatencyCollector."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+        self.collector = latency.LatencyCollector(self.m_client)
+
+    def test_fetch_w_change_info(self):
+        self.m_client.get_messages.return_value = []
+
+        self.collector.fetch(make_change())
+
+        self.m_client.get_by_id.assert_not_called()
+        self.m_client.get_messages.assert_called_once_with("I1")
+
+    def test_fetch_w_id_and_embedded_messages(self):
+        self.m_client.get_by_id.return_value = make_change(messages=[])
+
+        metrics = self.collector.fetch({"id": "I1"})
+
+        assert metrics["number"] == 1
+        self.m_client.get_by_id.assert_called_once_with("I1")
+        self.m_client.get_messages.assert_not_called()
+
+    def test_collect(self):
+        self.m_client.get_messages.return_value = [
+            make_message(1001, "2024-01-01 01:00:00.000000000")
+        ]
+
+        results = list(
+            self.collector.collect(iter([make_change(1), make_change(2)]), 2)
+        )
+
+        assert all(r.status == bulk.OK for r in results)
+        assert sorted(r.value["number"] for r in results) == [1, 2]
@@ -0,0 +1,105 @@
+"""Tests for gerritclient.common.messages module."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, messages
+
+
+def make_message(message_id, date, author=1000):
+    return {
+        "id": message_id,
+        "date": f"2024-01-01 {date}.000000000",
+        "author": {"_account_id": author},
+        "_revision_number": 1,
+        "message": f"Message {message_id}",
+    }
+
+
+MESSAGES = {
+    "I1": [make_message("a", "10:00:00"), make_message("b", "08:00:00")],
+    "I2": [make_message("c", "09:00:00")],
+    "I3": [make_message("d", "07:00:00"), make_message("e", "11:00:00")],
+}
+
+
+def get_messages(change_id):
+    if change_id not in MESSAGES:
+        raise error.HTTPError("Not found", 404)
+    return MESSAGES[change_id]
+
+
+class TestMessageStream:
+    """Tests for MessageStream."""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        self.m_client = mock.Mock()
+        self.m_client.get_messages.side_effect = get_messages
+
+    def test_get_records(self):
+        change = {"id": "I1", "_number": 1, "project": "gerrit"}
+        real_author = dict(
+            make_message("x", "12:00:00"), real_author={"_account_id": 7}
+        )
+
+        records = messages.get_records(change, [real_author, *MESSAGES["I1"]])
+
+        assert [r["id"] for r in records] == ["b", "a", "x"]
+        assert records[0] == {
+            "date": "2024-01-01 08:00:00.000000000",
+            "change": 1,
+            "project": "gerrit",
+            "id": "b",
+            "author": 1000,
+            "real_author": 1000,
+            "tag": None,
+            "revision_number": 1,
+            "message": "Message b",
+        }
+        assert records[2]["real_author"] == 7
+
+    @pytest.mark.parametrize("run_size", [1, 2, 100])
+    def test_merge(self, run_size):
+        changes = [{"id": change_id} for change_id in ("I1", "I2", "I3", "I4")]
+
+        with messages.MessageStream(self.m_client, run_size=run_size) as stream:
+            results = list(stream.collect(changes, max_workers=2))
+            merged = list(stream.merge())
+
+        assert sorted(r.item["id"] for r in results if r.status == bulk.FAILED) == [
+            "I4"
+        ]
+        assert stream.count == 5
+        assert [(r["change"], r["id"]) for r in merged] == [
+            ("I3", "d"),
+            ("I1", "b"),
+            ("I2", "c"),
+            ("I1", "a"),
+            ("I3", "e"),
+        ]
+
+    def test_wrong_run_size_fail(self):
+        with pytest.raises(ValueError, match="greater than 0"):
+            messages.MessageStream(self.m_client, run_size=0)
+
+    def test_close_removes_runs(self):
+        stream = messages.MessageStream(self.m_client, run_size=1)
+        list(stream.collect([{"id": "I1"}, {"id": "I2"}]))
+        runs = list(stream.runs)
+
+        stream.close()
+
+        assert runs
+        assert not any(os.path.exists(path) for path in runs)
+
+    def test_fetch_w_messages(self):
+        stream = messages.MessageStream(self.m_client)
+
+        records = stream.fetch({"id": "I9", "messages": MESSAGES["I2"]})
+
+        assert [r["id"] for r in records] == ["c"]
+        self.m_client.get_messages.assert_not_called()
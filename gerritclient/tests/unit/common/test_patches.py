@@ -0,0 +1,145 @@
+"""Tests for gerritclient.common.patches module."""
+
+import gzip
+import mailbox
+import tarfile
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, patches
+from gerritclient.tests.utils import fake_change
+
+
+def make_patch(number):
+    return (
+        f"From {number:040x} Mon Sep 17 00:00:00 2001\n"
+        f"Subject: [PATCH] Change {number}\n\n"
+        "diff --git a/foo b/foo\n"
+    ).encode()
+
+
+class TestPatches:
+    """Tests for patch archives."""
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("patches", patches.DIRECTORY),
+            ("out/patches.mbox", patches.MBOX),
+            ("patches.mbox.gz", patches.MBOX),
+            ("patches.tar", patches.TAR),
+            ("patches.tgz", patches.TAR),
+            ("patches.tar.xz", patches.TAR),
+        ],
+    )
+    def test_get_archive_format(self, path, expected):
+        assert patches.get_archive_format(path) == expected
+
+    def test_get_patch_name(self):
+        change = fake_change.get_fake_change(identifier="I1")
+        change.update(
+            _number=42,
+            current_revision="abc",
+            revisions={"abc": {"_number": 3}},
+        )
+
+        assert patches.get_patch_name(change) == "42-3.patch"
+        assert patches.get_patch_name(change, "2") == "42-2.patch"
+        assert (
+            patches.get_patch_name({"id": "p~master~I1"}) == "p_master_I1-current.patch"
+        )
+
+    def test_directory(self, tmp_path):
+        with patches.get_archive(str(tmp_path / "out")) as archive:
+            assert archive.add("1-1.patch", iter([b"a", b"b"])) == 2
+
+        assert (tmp_path / "out" / "1-1.patch").read_bytes() == b"ab"
+        assert archive.exists("1-1.patch")
+
+    def test_directory_partial_removed(self, tmp_path):
+        def chunks():
+            yield b"a"
+            raise error.HTTPError("Connection reset", 502)
+
+        archive = patches.PatchDirectory(str(tmp_path))
+        with pytest.raises(error.HTTPError):
+            archive.add("1-1.patch", chunks())
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_mbox(self, tmp_path):
+        path = tmp_path / "patches.mbox.gz"
+        with patches.get_archive(str(path)) as archive:
+            archive.add("1-1.patch", iter([make_patch(1)]))
+            archive.add("2-1.patch", iter([make_patch(2)]))
+
+        mbox_path = tmp_path / "patches.mbox"
+        mbox_path.write_bytes(gzip.decompress(path.read_bytes()))
+        subjects = [m["Subject"] for m in mailbox.mbox(str(mbox_path))]
+        assert subjects == ["[PATCH] Change 1", "[PATCH] Change 2"]
+
+    def test_tar(self, tmp_path):
+        path = tmp_path / "patches.tar.gz"
+        with patches.get_archive(str(path)) as archive:
+            archive.add("1-1.patch", iter([b"a", b"bc"]))
+
+        with tarfile.open(path) as tar:
+            assert tar.getnames() == ["1-1.patch"]
+            assert tar.extractfile("1-1.patch").read() == b"abc"
+
+    def test_tar_w_compression_fail(self, tmp_path):
+        with pytest.raises(error.BadDataException, match="mbox files only"):
+            patches.get_archive(str(tmp_path / "p.tar"), compression="gzip")
+
+
+class TestPatchDownloader:
+    """Tests for PatchDownloader."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+        self.m_client.iter_patch.side_effect = lambda change_id, revision_id: iter(
+            [change_id.encode()]
+        )
+        self.m_client.get_by_id.side_effect = lambda change_id, options: {
+            "_number": int(change_id[1:]),
+            "current_revision": f"sha{change_id}",
+            "revisions": {f"sha{change_id}": {"_number": 4}},
+        }
+
+    def test_run(self, tmp_path):
+        archive = patches.PatchDirectory(str(tmp_path))
+        downloader = patches.PatchDownloader(self.m_client, archive)
+
+        results = list(downloader.run([{"id": "I1"}, {"id": "I2"}], max_workers=2))
+
+        assert sorted(r.value for r in results) == [("1-4.patch", 2), ("2-4.patch", 2)]
+        assert (tmp_path / "2-4.patch").read_bytes() == b"I2"
+        self.m_client.get_by_id.assert_any_call("I1", options=["CURRENT_REVISION"])
+        self.m_client.iter_patch.assert_any_call("I1", revision_id="shaI1")
+
+    def test_download_current_skip_existing(self, tmp_path):
+        (tmp_path / "1-4.patch").write_bytes(b"old")
+        archive = patches.PatchDirectory(str(tmp_path))
+        downloader = patches.PatchDownloader(self.m_client, archive, skip_existing=True)
+
+        with pytest.raises(bulk.SkipItem):
+            downloader.download({"id": "I1"})
+        assert downloader.download({"id": "I2"}) == ("2-4.patch", 2)
+
+    def test_download_skip_existing(self, tmp_path):
+        (tmp_path / "I1-3.patch").write_bytes(b"old")
+        archive = patches.PatchDirectory(str(tmp_path))
+        downloader = patches.PatchDownloader(
+            self.m_client, archive, revision="3", skip_existing=True
+        )
+
+        with pytest.raises(bulk.SkipItem):
+            downloader.download({"id": "I1"})
+        self.m_client.iter_patch.assert_not_called()
+        self.m_client.get_by_id.assert_not_called()
+
+    def test_spooled_archive_is_abstract(self, tmp_path):
+        with pytest.raises(TypeError):
+            patches.SpooledArchive(str(tmp_path / "p"))
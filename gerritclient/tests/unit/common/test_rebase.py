@@ -0,0 +1,80 @@
+"""Tests for gerritclient.common.rebase module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, rebase
+from gerritclient.tests.utils import fake_change
+
+
+class TestChainRebaser:
+    """Tests for ChainRebaser."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+        self.m_client.get_related_changes.side_effect = lambda change_id: (
+            fake_change.get_fake_related_changes(1, 2, 3)
+            if change_id in ("I1", "I2", "I3")
+            else fake_change.get_fake_related_changes(4, 5)
+        )
+        self.changes = [
+            {"id": f"I{n}", "_number": n, "status": "NEW"} for n in (3, 2, 1, 4, 5)
+        ]
+
+    def test_plan(self):
+        rebaser = rebase.ChainRebaser(self.m_client)
+
+        assert rebaser.plan(self.changes) == {
+            1: set(),
+            2: {1},
+            3: {2},
+            4: set(),
+            5: {4},
+        }
+        assert rebaser.get_chain_root(3) == 1
+        assert rebaser.get_chain_root(4) == 4
+        self.m_client.get_by_id.assert_not_called()
+
+    def test_plan_fetch_failure(self):
+        self.m_client.get_by_id.side_effect = error.HTTPError("404 Not Found")
+
+        with pytest.raises(error.BadDataException, match="I7: 404"):
+            rebase.ChainRebaser(self.m_client).plan([{"id": "I7"}])
+
+    def test_run_isolates_conflicts(self):
+        rebased = []
+
+        def fake_rebase(change_id):
+            if change_id == "I1":
+                raise error.HTTPError(
+                    "409 Conflict: Change is already up to date.", status_code=409
+                )
+            if change_id == "I4":
+                raise error.HTTPError("409 Conflict: merge conflict", status_code=409)
+            rebased.append(change_id)
+            return {}
+
+        self.m_client.rebase.side_effect = fake_rebase
+        rebaser = rebase.ChainRebaser(self.m_client)
+        rebaser.plan(self.changes)
+
+        results = {r.item: r.status for r in rebaser.run(max_workers=2)}
+
+        assert results == {
+            1: bulk.SKIPPED,
+            2: bulk.OK,
+            3: bulk.OK,
+            4: bulk.FAILED,
+            5: bulk.BLOCKED,
+        }
+        assert rebased == ["I2", "I3"]
+
+    def test_rebase_closed_change_skipped(self):
+        rebaser = rebase.ChainRebaser(self.m_client)
+        rebaser.changes = {1: {"id": "I1", "_number": 1, "status": "MERGED"}}
+
+        with pytest.raises(bulk.SkipItem, match="MERGED"):
+            rebaser.rebase(1)
+        self.m_client.rebase.assert_not_called()
@@ -0,0 +1,23 @@
+"""Tests for gerritclient.common.reindex module."""
+
+from gerritclient.common import reindex
+
+
+class TestReindex:
+    """Tests for change identifier files and the resume journal."""
+
+    def test_read_change_ids(self, tmp_path):
+        path = tmp_path / "changes.txt"
+        path.write_text("# after upgrade\nI1\n\n  p~master~I2  \n")
+
+        assert list(reindex.read_change_ids(str(path))) == ["I1", "p~master~I2"]
+
+    def test_journal(self, tmp_path):
+        path = str(tmp_path / "journal.txt")
+        journal = reindex.ResumeJournal(path)
+
+        assert journal.load() == set()
+        journal.record("I1")
+        journal.record("I2")
+
+        assert reindex.ResumeJournal(path).load() == {"I1", "I2"}
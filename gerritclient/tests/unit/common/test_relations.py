@@ -0,0 +1,134 @@
+"""Tests for gerritclient.common.relations module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import relations
+from gerritclient.tests.utils import fake_change
+
+# Changes 1 <- 2 <- 3 form a chain, 5 is in the same topic as 3
+TOGETHER = {1: [1], 2: [1, 2], 3: [1, 2, 3, 5], 5: [1, 2, 3, 5]}
+
+
+def get_by_id(change_id, options=None):
+    number = int(change_id)
+    if number not in TOGETHER:
+        raise error.HTTPError("Not found", 404)
+    return fake_change.get_fake_change(
+        identifier=f"project~master~I{number}", subject=f"Change {number}"
+    ) | {"_number": number, "current_revision": f"sha{number}"}
+
+
+def get_related_changes(change_id, revision_id=None):
+    number = int(revision_id[len("sha") :])
+    if number == 5:
+        return {"changes": []}
+    return fake_change.get_fake_related_changes(1, 2, 3)
+
+
+def get_submitted_together(change_id):
+    number = int(change_id.rsplit("~I", 1)[1])
+    return [{"_number": n} for n in TOGETHER[number]]
+
+
+class TestRelationCrawler:
+    """Tests for RelationCrawler."""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        self.m_client = mock.Mock()
+        self.m_client.get_by_id.side_effect = get_by_id
+        self.m_client.get_related_changes.side_effect = get_related_changes
+        self.m_client.get_submitted_together.side_effect = get_submitted_together
+
+    def test_crawl(self):
+        crawler = relations.RelationCrawler(self.m_client)
+
+        dependencies = crawler.crawl(["3"], max_workers=2)
+
+        assert dependencies == {1: set(), 2: {1}, 3: {2}, 5: {2}}
+        assert crawler.get_groups() == [[3, 5]]
+        assert crawler.failures == {}
+        assert self.m_client.get_by_id.call_count == 4
+        assert crawler.nodes[5]["subject"] == "Change 5"
+        assert crawler.nodes[5]["revision"] == "sha5"
+
+    def test_crawl_deduplicates_seeds(self):
+        crawler = relations.RelationCrawler(self.m_client)
+
+        crawler.crawl(["1", "2", 1], max_workers=2)
+
+        visited = sorted(c[0][0] for c in self.m_client.get_by_id.call_args_list)
+        assert visited == ["1", "2", "3", "5"]
+
+    def test_crawl_w_cache(self, tmp_path):
+        cache = relations.EdgeCache(str(tmp_path / "cache.json"))
+        relations.RelationCrawler(self.m_client, cache=cache).crawl(["3"])
+        cache.save()
+        self.m_client.reset_mock()
+
+        cache = relations.EdgeCache(str(tmp_path / "cache.json"))
+        crawler = relations.RelationCrawler(self.m_client, cache=cache)
+        dependencies = crawler.crawl(["3"])
+
+        assert len(cache) == 4
+        assert dependencies == {1: set(), 2: {1}, 3: {2}, 5: {2}}
+        self.m_client.get_related_changes.assert_not_called()
+        self.m_client.get_submitted_together.assert_not_called()
+
+    def test_crawl_w_max_changes(self):
+        crawler = relations.RelationCrawler(self.m_client, max_changes=2)
+
+        dependencies = crawler.crawl(["3"])
+
+        assert len(crawler.nodes) == 2
+        assert set(dependencies) == set(crawler.nodes)
+
+    def test_crawl_w_failures(self):
+        crawler = relations.RelationCrawler(self.m_client)
+
+        dependencies = crawler.crawl(["4", "1"])
+
+        assert set(crawler.failures) == {"4"}
+        assert dependencies == {1: set(), 2: {1}, 3: {2}, 5: {2}}
+
+    def test_to_json_w_cycles(self):
+        crawler = relations.RelationCrawler(self.m_client)
+        crawler.nodes = {1: {"subject": "A"}, 2: {"subject": "B"}}
+
+        data = crawler.to_json({1: {2}, 2: {1}})
+
+        assert data["order"] is None
+        assert data["cycles"] == [[1, 2]]
+        assert data["edges"] == [[1, 2], [2, 1]]
+        assert data["nodes"][0] == {"number": 1, "subject": "A"}
+
+    def test_to_json(self):
+        crawler = relations.RelationCrawler(self.m_client)
+
+        data = crawler.to_json(crawler.crawl(["5"]))
+
+        assert data["order"] == [1, 2, 3, 5]
+        assert data["cycles"] == []
+        assert data["groups"] == [[3, 5]]
+
+
+class TestEdgeCache:
+    """Tests for EdgeCache."""
+
+    def test_save_wo_path(self):
+        cache = relations.EdgeCache()
+        cache.set("sha1", {"chain": {}, "together": []})
+
+        cache.save()
+
+        assert cache.get("sha1") == {"chain": {}, "together": []}
+
+    def test_malformed_fail(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("{")
+
+        with pytest.raises(error.BadDataException, match="Malformed cache"):
+            relations.EdgeCache(str(path))
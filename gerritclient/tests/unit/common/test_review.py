@@ -0,0 +1,134 @@
+"""Tests for gerritclient.common.review module."""
+
+import json
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, review
+from gerritclient.tests.utils import fake_change
+
+
+class TestManifest:
+    """Tests for load_manifest() function."""
+
+    def test_load_manifest_jsonl(self):
+        entries = [
+            {"change": "p~master~I1", "labels": {"Verified": 1}},
+            {"change": "p~master~I2", "message": "Build passed"},
+        ]
+        content = "\n".join(json.dumps(e) for e in entries) + "\n\n"
+        m_open = mock.mock_open(read_data=content)
+        with mock.patch("gerritclient.common.review.open", m_open, create=True):
+            assert review.load_manifest("/tmp/reviews.jsonl") == entries
+
+    def test_load_manifest_numeric_change(self):
+        m_open = mock.mock_open(read_data='{"change": 12345}\n')
+        with mock.patch("gerritclient.common.review.open", m_open, create=True):
+            assert review.load_manifest("/tmp/reviews.jsonl") == [{"change": "12345"}]
+
+    def test_load_manifest_jsonl_bad_line(self):
+        m_open = mock.mock_open(read_data='{"change": "I1"}\n{bad\n')
+        with (
+            mock.patch("gerritclient.common.review.open", m_open, create=True),
+            pytest.raises(error.BadDataException, match=r"reviews\.jsonl:2"),
+        ):
+            review.load_manifest("/tmp/reviews.jsonl")
+
+    def test_load_manifest_yaml(self):
+        m_open = mock.mock_open(read_data="- change: I1\n  labels:\n    Verified: 1\n")
+        with mock.patch("gerritclient.common.utils.open", m_open, create=True):
+            entries = review.load_manifest("/tmp/reviews.yaml")
+
+        assert entries == [{"change": "I1", "labels": {"Verified": 1}}]
+
+    def test_load_manifest_wo_change_fail(self):
+        m_open = mock.mock_open(read_data='{"labels": {"Verified": 1}}\n')
+        with (
+            mock.patch("gerritclient.common.review.open", m_open, create=True),
+            pytest.raises(error.BadDataException),
+        ):
+            review.load_manifest("/tmp/reviews.jsonl")
+
+
+class TestVotes:
+    """Tests for vote de-duplication helpers."""
+
+    def test_get_votes(self):
+        change = fake_change.get_fake_change()
+
+        assert review.get_votes(change, 1000096) == {
+            "Verified": 0,
+            "Code-Review": -1,
+        }
+        assert review.get_votes(change, 42) == {}
+
+    @pytest.mark.parametrize(
+        ("labels", "votes", "expected"),
+        [
+            ({"Verified": 1}, {"Verified": 1, "Code-Review": 2}, True),
+            ({"Verified": 1}, {"Verified": 0}, False),
+            ({"Code-Review": 0}, {}, True),
+            (None, {"Verified": 1}, False),
+        ],
+    )
+    def test_is_redundant(self, labels, votes, expected):
+        assert review.is_redundant(labels, votes) is expected
+
+
+class TestBulkReviewer:
+    """Tests for BulkReviewer."""
+
+    @pytest.fixture(autouse=True)
+    def setup_reviewer(self):
+        self.change_client = mock.Mock()
+        self.account_client = mock.Mock()
+        self.account_client.get_by_id.return_value = {"_account_id": 1000096}
+        self.reviewer = review.BulkReviewer(self.change_client, self.account_client)
+
+    def test_post_skips_votes_in_place(self):
+        entry = {"change": "I1", "labels": {"Code-Review": -1}}
+        self.change_client.get_by_id.return_value = fake_change.get_fake_change()
+
+        with pytest.raises(bulk.SkipItem):
+            self.reviewer.post(entry)
+        self.change_client.get_by_id.assert_called_once_with(
+            "I1", options=["DETAILED_LABELS"]
+        )
+        self.change_client.set_review.assert_not_called()
+
+    def test_post_w_message_and_votes_in_place(self):
+        entry = {"change": "I1", "labels": {"Code-Review": -1}, "message": "Again"}
+        self.reviewer.post(entry)
+
+        self.change_client.get_by_id.assert_not_called()
+        self.change_client.set_review.assert_called_once_with(
+            "I1", revision_id="current", labels={"Code-Review": -1}, message="Again"
+        )
+
+    def test_post_uses_known_change(self):
+        entry = {"change": "I1", "labels": {"Verified": 1}, "tag": "ci"}
+        self.reviewer.post(entry, change=fake_change.get_fake_change())
+
+        self.change_client.get_by_id.assert_not_called()
+        self.change_client.set_review.assert_called_once_with(
+            "I1", revision_id="current", labels={"Verified": 1}, tag="ci"
+        )
+
+    def test_post_resolves_account_once(self):
+        change = fake_change.get_fake_change()
+        for _ in range(3):
+            self.reviewer.post({"change": "I1", "labels": {"Verified": 1}}, change)
+
+        self.account_client.get_by_id.assert_called_once_with("self")
+
+    def test_post_wo_deduplication(self):
+        self.reviewer.deduplicate = False
+        entry = {"change": "I1", "revision": 2, "labels": {"Code-Review": -1}}
+        self.reviewer.post(entry)
+
+        self.change_client.get_by_id.assert_not_called()
+        self.change_client.set_review.assert_called_once_with(
+            "I1", revision_id=2, labels={"Code-Review": -1}
+        )
@@ -0,0 +1,126 @@
+"""Tests for gerritclient.common.reviewers module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, reviewers
+from gerritclient.tests.utils import fake_change
+
+
+class TestPresentAccounts:
+    """Tests for reviewer matching helpers."""
+
+    @pytest.mark.parametrize(
+        "reviewer", ["1000096", 1000096, "jdoe", "john.doe@example.com", "John Doe"]
+    )
+    def test_account_matches(self, reviewer):
+        account = fake_change.get_fake_change()["reviewers"]["REVIEWER"][0]
+
+        assert reviewers.account_matches(account, reviewer)
+
+    def test_account_does_not_match(self):
+        assert not reviewers.account_matches({"_account_id": 1}, "jdoe")
+
+    def test_get_present_accounts_cc_includes_reviewers(self):
+        change = {
+            "reviewers": {"REVIEWER": [{"_account_id": 1}], "CC": [{"_account_id": 2}]}
+        }
+
+        assert reviewers.get_present_accounts(change) == [{"_account_id": 1}]
+        assert reviewers.get_present_accounts(change, state="CC") == [
+            {"_account_id": 1},
+            {"_account_id": 2},
+        ]
+
+
+class TestReviewerAssigner:
+    """Tests for ReviewerAssigner."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+        self.m_client.add_reviewer.return_value = {"input": "x"}
+
+    def test_assign_only_missing(self):
+        assigner = reviewers.ReviewerAssigner(self.m_client, ["jdoe", "alice"])
+        change = fake_change.get_fake_change(identifier="I1")
+
+        assert assigner.assign(change) == ["alice"]
+        self.m_client.get_reviewers.assert_not_called()
+        self.m_client.add_reviewer.assert_called_once_with(
+            "I1", "alice", state="REVIEWER", confirmed=None, notify="NONE"
+        )
+
+    def test_assign_all_present_skipped(self):
+        assigner = reviewers.ReviewerAssigner(self.m_client, ["jdoe", "jroe"])
+
+        with pytest.raises(bulk.SkipItem):
+            assigner.assign(fake_change.get_fake_change())
+        self.m_client.add_reviewer.assert_not_called()
+
+    def test_assign_fetches_reviewers(self):
+        self.m_client.get_by_id.return_value = {
+            "id": "I1",
+            "reviewers": {"CC": [{"_account_id": 7}]},
+        }
+        assigner = reviewers.ReviewerAssigner(self.m_client, ["7", "bob"], state="CC")
+
+        assert assigner.assign({"id": "I1"}) == ["bob"]
+        self.m_client.get_by_id.assert_called_once_with(
+            "I1", options=["DETAILED_LABELS", "DETAILED_ACCOUNTS"]
+        )
+        self.m_client.add_reviewer.assert_called_once_with(
+            "I1", "bob", state="CC", confirmed=None, notify="NONE"
+        )
+
+    def test_assign_fetched_cc_is_not_reviewer(self):
+        self.m_client.get_by_id.return_value = {
+            "id": "I1",
+            "reviewers": {"CC": [{"_account_id": 7}]},
+        }
+        assigner = reviewers.ReviewerAssigner(self.m_client, ["7"])
+
+        assert assigner.assign({"id": "I1"}) == ["7"]
+
+    def test_assign_skips_present_group(self):
+        group_client = mock.Mock()
+        group_client.get_members.return_value = [
+            {"_account_id": 1000096},
+            {"_account_id": 1000097},
+        ]
+        assigner = reviewers.ReviewerAssigner(
+            self.m_client, ["devs"], group_client=group_client
+        )
+
+        with pytest.raises(bulk.SkipItem):
+            assigner.assign(fake_change.get_fake_change())
+        with pytest.raises(bulk.SkipItem):
+            assigner.assign(fake_change.get_fake_change())
+        group_client.get_members.assert_called_once_with("devs")
+
+    def test_assign_adds_incomplete_group_and_accounts(self):
+        def get_members(name):
+            if name != "devs":
+                raise error.HTTPError("Not found", 404)
+            return [{"_account_id": 1000096}, {"_account_id": 1}]
+
+        group_client = mock.Mock()
+        group_client.get_members.side_effect = get_members
+        assigner = reviewers.ReviewerAssigner(
+            self.m_client, ["devs", "bob"], group_client=group_client
+        )
+
+        assert assigner.assign(fake_change.get_fake_change()) == ["devs", "bob"]
+
+    def test_assign_reports_errors(self):
+        self.m_client.get_by_id.return_value = {"id": "I1", "reviewers": {}}
+        self.m_client.add_reviewer.side_effect = [
+            {"input": "bob", "error": "bob does not identify a registered user"},
+            {"input": "alice"},
+        ]
+        assigner = reviewers.ReviewerAssigner(self.m_client, ["bob", "alice"])
+
+        with pytest.raises(error.BadDataException, match="bob does not identify"):
+            assigner.assign({"id": "I1"})
+        assert self.m_client.add_reviewer.call_count == 2
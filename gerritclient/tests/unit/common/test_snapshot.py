@@ -0,0 +1,177 @@
+"""Tests for gerritclient.common.snapshot module."""
+
+import io
+import json
+import os
+import tarfile
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, snapshot
+
+FILES = {
+    "/COMMIT_MSG": {"status": "A", "size": 10},
+    "bin/run.sh": {"status": "A", "size": 9, "new_mode": 100755},
+    "docs/link": {"status": "A", "new_mode": 0o120000},
+    "old.txt": {"status": "D"},
+    "src/app.py": {"size": 5, "new_mode": 100644},
+    "third_party/lib": {"new_mode": 160000},
+}
+
+CONTENTS = {
+    "bin/run.sh": b"#!/bin/sh",
+    "docs/link": b"../README",
+    "src/app.py": b"print",
+}
+
+
+def make_archive(members):
+    """Returns chunks of a tgz archive of (name, content or link) tuples."""
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            if name.endswith("link"):
+                info.type = tarfile.SYMTYPE
+                info.linkname = data
+                tar.addfile(info)
+            else:
+                info.size = len(data)
+                info.mode = 0o755 if name.endswith(".sh") else 0o644
+                tar.addfile(info, io.BytesIO(data))
+    content = buffer.getvalue()
+    return [content[i : i + 7] for i in range(0, len(content), 7)]
+
+
+ARCHIVE = [
+    ("bin/run.sh", b"#!/bin/sh"),
+    ("docs/link", "../README"),
+    ("src/app.py", b"print"),
+]
+
+
+class TestSnapshot:
+    """Tests for Snapshot."""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self, tmp_path):
+        self.m_client = mock.Mock()
+        self.m_client.iter_file_content.side_effect = (
+            lambda change_id, file_path, revision_id: iter([CONTENTS[file_path]])
+        )
+        self.destination = str(tmp_path / "tree")
+
+    def make_snapshot(self, revision="abc"):
+        return snapshot.Snapshot(self.m_client, "I1", self.destination, revision)
+
+    def run(self, revision_snapshot):
+        results = list(
+            revision_snapshot.run(snapshot.select_files(FILES), max_workers=2)
+        )
+        revision_snapshot.save_manifest()
+        return {r.item[0]: r.status for r in results}
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [(100644, 0o100644), (33261, 0o100755), ("120000", 0o120000), (None, None)],
+    )
+    def test_parse_mode(self, value, expected):
+        assert snapshot.parse_mode(value) == expected
+
+    @pytest.mark.parametrize("file_path", ["../etc/passwd", "/etc/passwd", "a/../.."])
+    def test_get_target_unsafe_fail(self, file_path):
+        with pytest.raises(error.BadDataException, match="Unsafe file path"):
+            snapshot.get_target(self.destination, file_path)
+
+    def test_get_target_through_symlink_fail(self, tmp_path):
+        os.makedirs(self.destination)
+        os.symlink(str(tmp_path), os.path.join(self.destination, "docs"))
+
+        with pytest.raises(error.BadDataException, match="symbolic link"):
+            snapshot.get_target(self.destination, "docs/evil.py")
+
+    def test_select_files(self):
+        assert [path for path, _ in snapshot.select_files(FILES)] == [
+            "bin/run.sh",
+            "docs/link",
+            "src/app.py",
+            "third_party/lib",
+        ]
+
+    def test_run(self):
+        statuses = self.run(self.make_snapshot())
+
+        assert statuses == {
+            "bin/run.sh": bulk.OK,
+            "docs/link": bulk.OK,
+            "src/app.py": bulk.OK,
+            "third_party/lib": bulk.SKIPPED,
+        }
+        script = os.path.join(self.destination, "bin", "run.sh")
+        assert os.stat(script).st_mode & 0o777 == 0o755
+        assert os.readlink(os.path.join(self.destination, "docs", "link")) == (
+            "../README"
+        )
+        with open(os.path.join(self.destination, snapshot.MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        assert manifest["revision"] == "abc"
+        assert manifest["files"]["src/app.py"]["size"] == 5
+
+    def test_run_resume(self):
+        self.run(self.make_snapshot())
+        with open(os.path.join(self.destination, "src", "app.py"), "wb") as f:
+            f.write(b"PRINT")
+        self.m_client.iter_file_content.reset_mock()
+
+        statuses = self.run(self.make_snapshot())
+
+        assert statuses["bin/run.sh"] == bulk.SKIPPED
+        assert statuses["docs/link"] == bulk.SKIPPED
+        # Same size, but the content was modified locally
+        assert statuses["src/app.py"] == bulk.OK
+        self.m_client.iter_file_content.assert_called_once_with(
+            "I1", "src/app.py", revision_id="abc"
+        )
+
+    def test_run_other_revision(self):
+        self.run(self.make_snapshot())
+        self.m_client.iter_file_content.reset_mock()
+
+        self.run(self.make_snapshot("def"))
+
+        assert self.m_client.iter_file_content.call_count == 3
+
+    def test_extract(self):
+        revision_snapshot = self.make_snapshot()
+
+        results = list(revision_snapshot.extract(make_archive(ARCHIVE)))
+
+        assert [(r.item, r.status) for r in results] == [
+            ("bin/run.sh", bulk.OK),
+            ("docs/link", bulk.OK),
+            ("src/app.py", bulk.OK),
+        ]
+        script = os.path.join(self.destination, "bin", "run.sh")
+        assert os.stat(script).st_mode & 0o777 == 0o755
+        assert os.readlink(os.path.join(self.destination, "docs", "link")) == (
+            "../README"
+        )
+        assert revision_snapshot.manifest["src/app.py"]["size"] == 5
+
+        revision_snapshot.save_manifest()
+        statuses = {
+            r.item: r.status
+            for r in self.make_snapshot().extract(make_archive(ARCHIVE))
+        }
+        assert set(statuses.values()) == {bulk.SKIPPED}
+
+    def test_extract_through_symlink_fail(self, tmp_path):
+        members = [("docs/link", str(tmp_path)), ("docs/link/evil.py", b"x")]
+
+        results = list(self.make_snapshot().extract(make_archive(members)))
+
+        assert [r.status for r in results] == [bulk.OK, bulk.FAILED]
+        assert not (tmp_path / "evil.py").exists()
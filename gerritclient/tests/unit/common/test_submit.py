@@ -0,0 +1,130 @@
+"""Tests for gerritclient.common.submit module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import error
+from gerritclient.common import bulk, submit
+from gerritclient.tests.utils import fake_change
+
+
+def make_change(number, status="NEW"):
+    return {
+        "id": f"p~master~I{number}",
+        "_number": number,
+        "current_revision": f"sha{number}",
+        "status": status,
+    }
+
+
+class TestSubmitTrain:
+    """Tests for SubmitTrain."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+        self.related = {
+            1: fake_change.get_fake_related_changes(1, 2, 3),
+            2: fake_change.get_fake_related_changes(1, 2, 3),
+            3: fake_change.get_fake_related_changes(1, 2, 3),
+            4: {"changes": []},
+            5: {"changes": []},
+            6: {"changes": []},
+            7: fake_change.get_fake_related_changes(1, 8, 7),
+        }
+        self.together = {1: [1], 2: [1, 2], 3: [1, 2, 3], 4: [], 5: [5, 6], 6: [5, 6]}
+        self.together[7] = [1, 8, 7]
+        self.m_client.get_related_changes.side_effect = lambda change_id: self.related[
+            int(change_id.rsplit("I", 1)[1])
+        ]
+        self.m_client.get_submitted_together.side_effect = lambda change_id: [
+            {"_number": n} for n in self.together[int(change_id.rsplit("I", 1)[1])]
+        ]
+        self.changes = [make_change(n) for n in (3, 1, 2, 4, 5, 6, 7)]
+
+    def test_plan(self):
+        train = submit.SubmitTrain(self.m_client)
+
+        dependencies = train.plan(self.changes)
+
+        assert dependencies == {1: set(), 2: {1}, 3: {2}, 4: set(), 5: set(), 7: {1}}
+        assert train.groups[5] == [5, 6]
+        self.m_client.get_by_id.assert_not_called()
+
+    def test_plan_fetches_changes(self):
+        self.m_client.get_by_id.side_effect = lambda change_id, options: make_change(
+            int(change_id)
+        )
+        train = submit.SubmitTrain(self.m_client)
+
+        train.plan([{"id": "2"}, {"id": "1"}])
+
+        assert train.dependencies == {1: set(), 2: {1}}
+        self.m_client.get_by_id.assert_any_call("1", options=["CURRENT_REVISION"])
+
+    def test_plan_fetch_failure(self):
+        self.m_client.get_related_changes.side_effect = error.HTTPError("404")
+
+        with pytest.raises(error.BadDataException, match="p~master~I1"):
+            submit.SubmitTrain(self.m_client).plan([make_change(1)])
+
+    def test_run_stops_downstream_on_failure(self):
+        def fake_submit(change_id, **kwargs):
+            if change_id == "p~master~I2":
+                raise error.HTTPError("409 Conflict", status_code=409)
+            return {"status": "MERGED"}
+
+        self.m_client.submit.side_effect = fake_submit
+        self.m_client.get_by_id.return_value = make_change(2)
+        self.changes[1]["status"] = "MERGED"
+        train = submit.SubmitTrain(self.m_client, notify="NONE")
+        train.plan(self.changes)
+
+        results = {r.item: r.status for r in train.run(max_workers=2)}
+
+        assert results == {
+            1: bulk.SKIPPED,
+            2: bulk.FAILED,
+            3: bulk.BLOCKED,
+            4: bulk.OK,
+            5: bulk.OK,
+            7: bulk.OK,
+        }
+        submitted = {c.args[0] for c in self.m_client.submit.call_args_list}
+        assert submitted == {"p~master~I2", "p~master~I4", "p~master~I5", "p~master~I7"}
+        self.m_client.submit.assert_any_call(
+            "p~master~I4", on_behalf_of=None, notify="NONE"
+        )
+
+    @mock.patch("time.sleep", mock.Mock())
+    def test_submit_retry_of_merged_change(self):
+        self.m_client.submit.side_effect = error.HTTPError(
+            "504 Gateway Timeout", status_code=504
+        )
+        self.m_client.get_by_id.return_value = make_change(1, status="MERGED")
+        train = submit.SubmitTrain(self.m_client)
+        train.changes = {1: make_change(1)}
+
+        result = bulk.execute(train.submit, 1, retry_policy=bulk.RetryPolicy(retries=2))
+
+        assert result.status == bulk.OK
+        assert result.value["status"] == "MERGED"
+        self.m_client.submit.assert_called_once()
+        self.m_client.get_by_id.assert_called_once_with("p~master~I1")
+
+    def test_submit_rejected_merged_change(self):
+        self.m_client.submit.side_effect = error.HTTPError(
+            "409 Conflict: change is merged", status_code=409
+        )
+        self.m_client.get_by_id.return_value = make_change(1, status="MERGED")
+        train = submit.SubmitTrain(self.m_client)
+        train.changes = {1: make_change(1)}
+
+        assert train.submit(1)["status"] == "MERGED"
+
+    def test_submit_abandoned_fails(self):
+        train = submit.SubmitTrain(self.m_client)
+        train.changes = {1: make_change(1, status="ABANDONED")}
+
+        with pytest.raises(error.BadDataException, match="ABANDONED"):
+            train.submit(1)
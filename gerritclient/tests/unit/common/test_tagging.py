@@ -0,0 +1,84 @@
+"""Tests for gerritclient.common.tagging module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient.common import bulk, tagging
+from gerritclient.tests.utils import fake_change
+
+
+class TestDiffHashtags:
+    """Tests for diff_hashtags() function."""
+
+    def test_diff_hashtags(self):
+        add, remove = tagging.diff_hashtags(
+            ["release", "old"], add=["release", "v2", "a"], remove=["old", "missing"]
+        )
+
+        assert add == ["a", "v2"]
+        assert remove == ["old"]
+
+    def test_diff_hashtags_no_changes(self):
+        assert tagging.diff_hashtags(None) == ([], [])
+
+
+class TestTopicUpdater:
+    """Tests for TopicUpdater."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+
+    def test_apply_uses_change_info(self):
+        change = fake_change.get_fake_change(identifier="I1", topic="old")
+        updater = tagging.TopicUpdater(self.m_client, "new")
+
+        assert updater.apply(change) == "old"
+        self.m_client.get_topic.assert_not_called()
+        self.m_client.set_topic.assert_called_once_with("I1", "new")
+
+    def test_apply_same_topic_skipped(self):
+        change = fake_change.get_fake_change(topic="release")
+
+        with pytest.raises(bulk.SkipItem):
+            tagging.TopicUpdater(self.m_client, "release").apply(change)
+        self.m_client.set_topic.assert_not_called()
+
+    def test_apply_fetches_topic(self):
+        self.m_client.get_topic.return_value = "old"
+
+        tagging.TopicUpdater(self.m_client).apply({"id": "I1"})
+
+        self.m_client.get_topic.assert_called_once_with("I1")
+        self.m_client.delete_topic.assert_called_once_with("I1")
+
+    def test_delete_wo_topic_skipped(self):
+        self.m_client.get_topic.return_value = ""
+
+        with pytest.raises(bulk.SkipItem):
+            tagging.TopicUpdater(self.m_client).apply({"id": "I1"})
+        self.m_client.delete_topic.assert_not_called()
+
+
+class TestHashtagsUpdater:
+    """Tests for HashtagsUpdater."""
+
+    def setup_method(self):
+        self.m_client = mock.Mock()
+
+    def test_apply_sends_only_difference(self):
+        change = dict(fake_change.get_fake_change(identifier="I1"), hashtags=["a"])
+        updater = tagging.HashtagsUpdater(self.m_client, add=["a", "b"], remove=["c"])
+
+        assert updater.apply(change) == (["b"], [])
+        self.m_client.get_hashtags.assert_not_called()
+        self.m_client.set_hashtags.assert_called_once_with("I1", add=["b"], remove=None)
+
+    def test_apply_up_to_date_skipped(self):
+        self.m_client.get_hashtags.return_value = ["a"]
+        updater = tagging.HashtagsUpdater(self.m_client, add=["a"], remove=["b"])
+
+        with pytest.raises(bulk.SkipItem):
+            updater.apply({"id": "I1"})
+        self.m_client.get_hashtags.assert_called_once_with("I1")
+        self.m_client.set_hashtags.assert_not_called()
@@ -1,5 +1,10 @@
 """Tests for gerritclient.common.utils module."""
 
+import base64
+
+import pytest
+
+from gerritclient import error
 from gerritclient.common import utils
 
 
@@ -63,3 +68,26 @@ class TestUtils:
 
     def test_normalize_w_default_replacer(self):
         assert utils.normalize("#Some/foo+bar_$!str.") == "_Some_foo_bar___str."
+
+    def test_decode_base64_chunks(self):
+        data = b"From 1234 Mon Sep 17 00:00:00 2001\nSubject: [PATCH] Fix\n" * 5
+        encoded = base64.encodebytes(data)
+        chunks = [encoded[i : i + 7] for i in range(0, len(encoded), 7)]
+
+        assert b"".join(utils.decode_base64_chunks(chunks)) == data
+
+    def test_decode_base64_chunks_truncated_fail(self):
+        with pytest.raises(error.BadDataException, match="truncated"):
+            list(utils.decode_base64_chunks([b"Zm9v", b"YmF"]))
+
+    def test_decode_base64_chunks_malformed_fail(self):
+        with pytest.raises(error.BadDataException, match="Malformed"):
+            list(utils.decode_base64_chunks(["Zm9v!!!!"]))
+
+    def test_parse_timestamp(self):
+        assert utils.parse_timestamp("1970-01-02 00:00:01.500000000") == 86401.5
+        assert utils.parse_timestamp("1970-01-01 00:01:00") == 60
+
+    def test_parse_timestamp_fail(self):
+        with pytest.raises(error.BadDataException, match="Malformed timestamp"):
+            utils.parse_timestamp("yesterday")
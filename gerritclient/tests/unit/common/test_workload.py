@@ -0,0 +1,93 @@
+"""Tests for gerritclient.common.workload module."""
+
+from gerritclient.common import utils, workload
+
+NOW = utils.parse_timestamp("2024-01-11 00:00:00.000000000")
+
+OWNER = {"_account_id": 1000, "username": "owner"}
+ALICE = {"_account_id": 1001, "username": "alice"}
+BOB = {"_account_id": 1002, "name": "Bob"}
+
+
+def make_change(reviewers, labels=None, attention_set=None, cc=()):
+    return {
+        "owner": OWNER,
+        "created": "2024-01-01 00:00:00.000000000",
+        "reviewers": {"REVIEWER": [OWNER, *reviewers], "CC": list(cc)},
+        "labels": labels or {},
+        "attention_set": attention_set or {},
+    }
+
+
+class TestWorkloadReport:
+    """Tests for WorkloadReport."""
+
+    def test_get_account_name(self):
+        assert workload.get_account_name(ALICE) == "alice"
+        assert workload.get_account_name(BOB) == "Bob"
+        assert workload.get_account_name({"_account_id": 7}) == "7"
+
+    def test_get_last_votes(self):
+        change = make_change(
+            [ALICE, BOB],
+            labels={
+                "Code-Review": {
+                    "all": [
+                        {
+                            "_account_id": 1001,
+                            "value": 1,
+                            "date": "2024-01-09 00:00:00",
+                        },
+                        {"_account_id": 1002, "value": 0},
+                    ]
+                },
+                "Verified": {
+                    "all": [
+                        {"_account_id": 1001, "value": 1, "date": "2024-01-10 00:00:00"}
+                    ]
+                },
+            },
+        )
+
+        assert workload.get_last_votes(change) == {1001: NOW - 86400}
+
+    def test_aggregate(self):
+        changes = [
+            make_change(
+                [ALICE, BOB],
+                labels={
+                    "Code-Review": {
+                        "all": [
+                            {
+                                "_account_id": 1001,
+                                "value": 2,
+                                "date": "2024-01-09 00:00:00",
+                            }
+                        ]
+                    }
+                },
+                attention_set={
+                    "1000": {"account": OWNER, "last_update": "2024-01-09 00:00:00"},
+                    "1002": {"account": BOB, "last_update": "2024-01-10 00:00:00"},
+                },
+            ),
+            make_change([BOB], cc=[ALICE]),
+        ]
+
+        report = workload.WorkloadReport(now=NOW).collect(iter(changes))
+
+        assert report.count == 2
+        assert report.get_rows() == [
+            (1002, "Bob", 2, 2, 1, 0, 10.0, None, None),
+            (1000, "owner", 0, 0, 1, 0, None, None, None),
+            (1001, "alice", 1, 0, 0, 1, None, 2.0, 2.0),
+        ]
+
+    def test_aggregate_w_cc(self):
+        report = workload.WorkloadReport(now=NOW, include_cc=True)
+
+        report.add(make_change([], cc=[ALICE]))
+
+        assert report.get_rows(unit="hours") == [
+            (1001, "alice", 1, 1, 0, 0, 240.0, None, None)
+        ]
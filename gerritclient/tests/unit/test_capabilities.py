@@ -0,0 +1,112 @@
+"""Tests for gerritclient.capabilities module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import capabilities, client, error
+from gerritclient.v1 import change
+
+
+class TestParseVersion:
+    """Tests for parse_version() function."""
+
+    @pytest.mark.parametrize(
+        ("version", "expected"),
+        [
+            ("3.9.1", (3, 9, 1)),
+            ("2.14", (2, 14, 0)),
+            ("2.14.6-2-g4f7a2e1", (2, 14, 6)),
+            ("v3.10.0-rc2", (3, 10, 0)),
+            ("unknown", None),
+            (None, None),
+        ],
+    )
+    def test_parse_version(self, version, expected):
+        assert capabilities.parse_version(version) == expected
+
+
+class TestServerCapabilities:
+    """Tests for ServerCapabilities."""
+
+    def test_supports_removed_feature(self):
+        caps = capabilities.ServerCapabilities(version="3.9.1")
+
+        assert not caps.supports("assignee")
+        assert not caps.supports("publish_draft")
+
+    def test_supports_feature_before_removal(self):
+        caps = capabilities.ServerCapabilities(version="2.14.6")
+
+        assert caps.supports("assignee")
+        assert caps.supports("publish_draft")
+
+    def test_supports_unknown_version(self):
+        caps = capabilities.ServerCapabilities()
+
+        assert caps.supports("assignee")
+
+    def test_supports_unknown_feature(self):
+        with pytest.raises(ValueError):
+            capabilities.ServerCapabilities(version="3.9").supports("fake")
+
+    def test_require_raises(self):
+        caps = capabilities.ServerCapabilities(version="3.9.1")
+
+        with pytest.raises(error.UnsupportedFeatureException, match="assignee"):
+            caps.require("assignee")
+
+
+class TestGetCapabilities:
+    """Tests for cached capability discovery."""
+
+    @pytest.fixture(autouse=True)
+    def setup_connection(self):
+        capabilities.clear_cache()
+        self.connection = client.connect("https://review.example.com")
+        with mock.patch.object(self.connection, "get_request") as m_get_request:
+            self.m_get_request = m_get_request
+            yield
+        capabilities.clear_cache()
+
+    def test_get_capabilities_cached_per_url(self):
+        self.m_get_request.side_effect = ["3.9.1", {"gerrit": {}}]
+
+        first = capabilities.get_capabilities(self.connection)
+        second = capabilities.get_capabilities(self.connection)
+
+        assert first is second
+        assert first.version_info == (3, 9, 1)
+        assert first.config == {"gerrit": {}}
+        self.m_get_request.assert_has_calls(
+            [mock.call("/config/server/version"), mock.call("/config/server/info")]
+        )
+        assert self.m_get_request.call_count == 2
+
+    def test_get_capabilities_refresh(self):
+        self.m_get_request.side_effect = ["3.9.1", {}, "3.10.0", {}]
+
+        capabilities.get_capabilities(self.connection)
+        caps = capabilities.get_capabilities(self.connection, refresh=True)
+
+        assert caps.version == "3.10.0"
+
+    def test_get_capabilities_discovery_failure(self):
+        self.m_get_request.side_effect = error.HTTPError("403 Forbidden")
+
+        caps = capabilities.get_capabilities(self.connection)
+
+        assert caps.version_info is None
+        assert caps.supports("assignee")
+
+    def test_change_client_short_circuits_unsupported_endpoint(self):
+        self.m_get_request.side_effect = ["3.9.1", {}]
+        change_client = change.get_client(self.connection)
+
+        with pytest.raises(error.UnsupportedFeatureException):
+            change_client.get_assignee("fake-change")
+        with pytest.raises(error.UnsupportedFeatureException):
+            change_client.delete_assignee("fake-change")
+
+        # Only the discovery requests have been made
+        assert self.m_get_request.call_count == 2
@@ -0,0 +1,136 @@
+"""Tests for gerritclient.client module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient import client
+from gerritclient.v1 import change, project
+
+CONFIG = {
+    "url": "https://review.example.com",
+    "auth_type": None,
+    "username": None,
+    "password": None,
+}
+
+
+class TestClientRegistry:
+    """Test suite for the process-wide connection and facade registry."""
+
+    @pytest.fixture(autouse=True)
+    def setup_registry(self):
+        self.registry = client.ClientRegistry()
+        with mock.patch.object(
+            client, "get_settings", return_value=dict(CONFIG)
+        ) as m_get_settings:
+            self.m_get_settings = m_get_settings
+            yield
+        self.registry.close()
+
+    def test_get_connection_loads_settings_once(self):
+        first = self.registry.get_connection()
+        second = self.registry.get_connection()
+
+        assert first is second
+        self.m_get_settings.assert_called_once_with()
+
+    def test_get_connection_keyed_by_settings(self):
+        other_config = dict(CONFIG, url="https://other.example.com")
+
+        default = self.registry.get_connection()
+        other = self.registry.get_connection(other_config)
+
+        assert default is not other
+        assert other.root == "https://other.example.com"
+        assert self.registry.get_connection(dict(other_config)) is other
+
+    def test_get_client_returns_cached_facade(self):
+        change_client = self.registry.get_client("change")
+
+        assert isinstance(change_client, change.ChangeClient)
+        assert self.registry.get_client("change") is change_client
+        assert isinstance(self.registry.get_client("project"), project.ProjectClient)
+
+    def test_facades_share_connection(self):
+        change_client = self.registry.get_client("change")
+        project_client = self.registry.get_client("project")
+
+        assert change_client.connection is project_client.connection
+
+    def test_get_client_unsupported_resource(self):
+        with pytest.raises(ValueError):
+            self.registry.get_client("fake")
+
+    def test_close_releases_connections(self):
+        connection = self.registry.get_connection()
+        facade = self.registry.get_client("change")
+        session = connection.session
+
+        with mock.patch.object(session, "close") as m_close:
+            self.registry.close()
+
+        m_close.assert_called_once_with()
+        assert self.registry.get_connection() is not connection
+        assert self.registry.get_client("change") is not facade
+        assert self.m_get_settings.call_count == 2
+
+
+class TestGetClient:
+    """Test suite for get_client() function."""
+
+    def test_get_client_w_connection_is_not_cached(self):
+        connection = client.connect(CONFIG["url"])
+
+        first = client.get_client("change", connection=connection)
+        second = client.get_client("change", connection=connection)
+
+        assert first is not second
+        assert first.connection is connection
+
+    @mock.patch.object(client, "registry")
+    def test_get_client_wo_connection_uses_registry(self, m_registry):
+        client.get_client("change")
+
+        m_registry.get_client.assert_called_once_with("change", "v1")
+
+
+class TestAPIClient:
+    """Test suite for APIClient."""
+
+    def test_post_request_content_type_not_persisted(self):
+        connection = client.connect(CONFIG["url"])
+
+        with mock.patch.object(connection.session, "post") as m_post:
+            connection.post_request_raw("/fake", data="key", content_type="plain/text")
+
+        m_post.assert_called_once_with(
+            "https://review.example.com/fake",
+            data="key",
+            json=None,
+            headers={"Content-Type": "plain/text"},
+        )
+        assert connection.session.headers["Content-Type"] == "application/json"
+
+    def test_session_pool_size(self):
+        connection = client.connect(CONFIG["url"], pool_maxsize=32)
+
+        adapter = connection.session.get_adapter("https://review.example.com")
+        assert adapter._pool_maxsize == 32
+
+    def test_get_request_chunks(self):
+        connection = client.connect(CONFIG["url"])
+        m_response = mock.Mock(status_code=200)
+        m_response.iter_content.return_value = iter([b"ab", b"cd"])
+
+        with mock.patch.object(
+            connection.session, "get", return_value=m_response
+        ) as m_get:
+            chunks = list(connection.get_request_chunks("/fake", chunk_size=2))
+
+        assert chunks == [b"ab", b"cd"]
+        m_get.assert_called_once_with(
+            "https://review.example.com/fake", params=None, stream=True
+        )
+        m_response.iter_content.assert_called_once_with(chunk_size=2)
+        m_response.close.assert_called_once_with()
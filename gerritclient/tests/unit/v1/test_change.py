@@ -0,0 +1,114 @@
+"""Tests for gerritclient.v1.change module."""
+
+from unittest import mock
+
+import pytest
+
+from gerritclient.v1 import change
+
+
+class TestChangeClient:
+    """Tests for ChangeClient methods containing client-side logic."""
+
+    @pytest.fixture(autouse=True)
+    def setup_client(self):
+        self.connection = mock.MagicMock()
+        self.client = change.get_client(self.connection)
+
+    def test_iter_all_follows_more_changes(self):
+        pages = [
+            [{"id": "1"}, {"id": "2", "_more_changes": True}],
+            [{"id": "3"}],
+        ]
+        with mock.patch.object(self.client, "get_all", side_effect=pages) as m_get:
+            changes = list(self.client.iter_all("status:open", page_size=2))
+
+        assert [c["id"] for c in changes] == ["1", "2", "3"]
+        m_get.assert_has_calls(
+            [
+                mock.call(["status:open"], options=None, limit=2, skip=None),
+                mock.call(["status:open"], options=None, limit=2, skip=2),
+            ]
+        )
+
+    def test_iter_all_w_limit(self):
+        pages = [[{"id": "1"}, {"id": "2", "_more_changes": True}], [{"id": "3"}]]
+        with mock.patch.object(self.client, "get_all", side_effect=pages) as m_get:
+            changes = list(self.client.iter_all("status:open", limit=3, page_size=2))
+
+        assert len(changes) == 3
+        assert m_get.call_args_list[-1] == mock.call(
+            ["status:open"], options=None, limit=1, skip=2
+        )
+
+    def test_iter_all_is_lazy(self):
+        with mock.patch.object(
+            self.client, "get_all", return_value=[{"id": "1", "_more_changes": True}]
+        ) as m_get:
+            changes = self.client.iter_all("status:open", page_size=1)
+            next(changes)
+
+        m_get.assert_called_once_with(["status:open"], options=None, limit=1, skip=None)
+
+    def test_get_revision_diff_bundle(self):
+        files = {"a.py": {}, "b.png": {"binary": True}, "yarn.lock": {}}
+        with (
+            mock.patch.object(
+                self.client, "get_revision_files", return_value=files
+            ) as m_files,
+            mock.patch.object(
+                self.client, "get_file_diff", return_value={"content": []}
+            ) as m_diff,
+            mock.patch.object(
+                self.client, "get_by_id", return_value={"current_revision": "sha2"}
+            ) as m_get,
+        ):
+            records = list(
+                self.client.get_revision_diff_bundle(
+                    "I1", base=1, skip_binary=True, skip_generated=True, context=5
+                )
+            )
+
+        m_get.assert_called_once_with("I1", options=["CURRENT_REVISION"])
+        m_files.assert_called_once_with("I1", revision_id="sha2", base=1, parent=None)
+        m_diff.assert_called_once_with(
+            "I1", "a.py", revision_id="sha2", base=1, parent=None, context=5
+        )
+        assert [r["path"] for r in records] == ["a.py"]
+
+    def test_get_revision_diff_bundle_w_revision(self):
+        with (
+            mock.patch.object(
+                self.client, "get_revision_files", return_value={"a.py": {}}
+            ) as m_files,
+            mock.patch.object(self.client, "get_file_diff", return_value={}),
+            mock.patch.object(self.client, "get_by_id") as m_get,
+        ):
+            list(self.client.get_revision_diff_bundle("I1", revision_id=3))
+
+        m_get.assert_not_called()
+        m_files.assert_called_once_with("I1", revision_id=3, base=None, parent=None)
+
+    def test_iter_patch(self):
+        self.connection.get_request_chunks.return_value = iter([b"Zm9", b"vYmFy"])
+
+        assert b"".join(self.client.iter_patch("I1", revision_id=2)) == b"foobar"
+        self.connection.get_request_chunks.assert_called_once_with(
+            "/changes/I1/revisions/2/patch", params=None
+        )
+
+    def test_iter_archive(self):
+        self.connection.get_request_chunks.return_value = iter([b"\x1f\x8b"])
+
+        assert list(self.client.iter_archive("I1", revision_id="abc")) == [b"\x1f\x8b"]
+        self.connection.get_request_chunks.assert_called_once_with(
+            "/changes/I1/revisions/abc/archive", params={"format": "tgz"}
+        )
+
+    def test_iter_file_content(self):
+        self.connection.get_request_chunks.return_value = iter([b"Zm9vYmFy"])
+
+        assert list(self.client.iter_file_content("I1", "a/b.py")) == [b"foobar"]
+        self.connection.get_request_chunks.assert_called_once_with(
+            "/changes/I1/revisions/current/files/a%2Fb.py/content"
+        )
@@ -1,5 +1,5 @@
 def get_fake_change(
-    identifier=None, project=None, branch=None, subject=None, topic=None
+    identifier=None, project=None, branch=None, subject=None, topic=None, status=None
 ):
     """Creates a fake change."""
 
@@ -11,7 +11,7 @@ def get_fake_change(
         "topic": topic or "Feature X Topic",
         "change_id": "I8473b95934b5732ac55d26311a706c9c2bde9940",
         "subject": subject or "Implementing Feature X",
-        "status": "NEW",
+        "status": status or "NEW",
         "created": "2017-07-26 09:59:32.126000000",
         "updated": "2013-07-27 11:16:36.775000000",
         "mergeable": True,
@@ -195,3 +195,27 @@ def get_fake_changes(change_count, **kwargs):
     """Creates a random fake list of changes."""
 
     return [get_fake_change(**kwargs) for _ in range(change_count)]
+
+
+def get_fake_related_changes(*chain):
+    """Creates a fake RelatedChangesInfo for a chain of change numbers.
+
+    Numbers go from the root of the chain to its tip, commit SHA-1 of
+    every change is 'sha<number>'.
+    """
+
+    entries = []
+    parent = "base"
+    for number in chain:
+        entries.append(
+            {
+                "project": "fake-project",
+                "_change_number": number,
+                "_revision_number": 1,
+                "_current_revision_number": 1,
+                "status": "NEW",
+                "commit": {"commit": f"sha{number}", "parents": [{"commit": parent}]},
+            }
+        )
+        parent = f"sha{number}"
+    return {"changes": entries[::-1]}
@@ -13,8 +13,7 @@ class BaseV1Client(abc.ABC):
 
     def __init__(self, connection=None):
         if connection is None:
-            config = client.get_settings()
-            connection = client.connect(**config)
+            connection = client.get_connection()
         self.connection = connection
 
 
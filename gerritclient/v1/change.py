@@ -1,11 +1,19 @@
 from requests import utils as requests_utils
 
+from gerritclient import capabilities
+from gerritclient.common import bulk, diffs, utils
 from gerritclient.v1 import base
 
 
 class ChangeClient(base.BaseV1Client):
     api_path = "/changes/"
 
+    @property
+    def capabilities(self):
+        """Cached capabilities of the server the client is connected to."""
+
+        return capabilities.get_capabilities(self.connection)
+
     def get_all(self, query, options=None, limit=None, skip=None):
         """Query changes.
 
@@ -28,6 +36,31 @@ class ChangeClient(base.BaseV1Client):
         )
         return self.connection.get_request(request_path, params=params)
 
+    def iter_all(self, query, options=None, limit=None, page_size=500):
+        """Query changes page by page.
+
+        The next page is requested only when the previous one has been
+        consumed and the server reports that more changes are available.
+
+        :param query: Query string
+        :param options: List of options to fetch additional data about changes
+        :param limit: Int value that allows to limit the total number of
+                      changes to be yielded
+        :param page_size: Number of changes to be fetched per request
+        :return Generator of ChangeInfo entries
+        """
+
+        fetched = 0
+        while limit is None or fetched < limit:
+            count = page_size if limit is None else min(page_size, limit - fetched)
+            page = self.get_all(
+                [query], options=options, limit=count, skip=fetched or None
+            )
+            yield from page
+            fetched += len(page)
+            if not page or not page[-1].get("_more_changes"):
+                break
+
     def get_by_id(self, change_id, detailed=False, options=None):
         """Retrieve a change.
 
@@ -149,6 +182,7 @@ class ChangeClient(base.BaseV1Client):
     def get_assignee(self, change_id):
         """Retrieve the account of the user assigned to a change."""
 
+        self.capabilities.require("assignee")
         request_path = "{api_path}{change_id}/assignee".format(
             api_path=self.api_path, change_id=requests_utils.quote(change_id, safe="")
         )
@@ -157,6 +191,7 @@ class ChangeClient(base.BaseV1Client):
     def get_assignees(self, change_id):
         """Retrieve a list of every user ever assigned to a change."""
 
+        self.capabilities.require("assignee")
         request_path = "{api_path}{change_id}/past_assignees".format(
             api_path=self.api_path, change_id=requests_utils.quote(change_id, safe="")
         )
@@ -165,6 +200,7 @@ class ChangeClient(base.BaseV1Client):
     def set_assignee(self, change_id, account_id):
         """Set the assignee of a change."""
 
+        self.capabilities.require("assignee")
         data = {"assignee": account_id}
         request_path = "{api_path}{change_id}/assignee".format(
             api_path=self.api_path, change_id=requests_utils.quote(change_id, safe="")
@@ -174,6 +210,7 @@ class ChangeClient(base.BaseV1Client):
     def delete_assignee(self, change_id):
         """Delete the assignee of a change."""
 
+        self.capabilities.require("assignee")
         request_path = "{api_path}{change_id}/assignee".format(
             api_path=self.api_path, change_id=requests_utils.quote(change_id, safe="")
         )
@@ -182,6 +219,7 @@ class ChangeClient(base.BaseV1Client):
     def publish_draft(self, change_id):
         """Publish a draft change."""
 
+        self.capabilities.require("publish_draft")
         request_path = "{api_path}{change_id}/publish".format(
             api_path=self.api_path, change_id=requests_utils.quote(change_id, safe="")
         )
@@ -631,6 +669,65 @@ class ChangeClient(base.BaseV1Client):
         )
         return self.connection.get_request(request_path, params=params or None)
 
+    def get_revision_diff_bundle(
+        self,
+        change_id,
+        revision_id="current",
+        base=None,
+        parent=None,
+        skip_binary=False,
+        skip_generated=False,
+        generated_patterns=None,
+        max_workers=bulk.DEFAULT_WORKERS,
+        retry_policy=None,
+        **diff_options,
+    ):
+        """Get the diffs of all files of a revision.
+
+        Files are listed first, then their diffs are fetched concurrently.
+        The 'current' revision is resolved once, so all files come from the
+        same revision even if a new patch set is uploaded meanwhile.
+
+        :param change_id: Identifier that uniquely identifies one change.
+        :param revision_id: Identifier that uniquely identifies one revision.
+        :param base: Patchset number to compare against.
+        :param parent: For merge commits, the parent number to compare against.
+        :param skip_binary: If True, skip binary files.
+        :param skip_generated: If True, skip generated files.
+        :param generated_patterns: Glob patterns of generated files.
+        :param max_workers: Maximum number of concurrent requests.
+        :param retry_policy: bulk.RetryPolicy for failed requests.
+        :param diff_options: Other arguments of get_file_diff()
+                             ('context', 'intraline', 'whitespace').
+        :return: Generator of dicts with the FileInfo fields and the 'path'
+                 and 'diff' (DiffInfo entity) keys, in completion order.
+        """
+
+        if revision_id == "current":
+            revision_id = self.get_by_id(change_id, options=["CURRENT_REVISION"])[
+                "current_revision"
+            ]
+        files = self.get_revision_files(
+            change_id, revision_id=revision_id, base=base, parent=parent
+        )
+        selected = diffs.select_files(
+            files,
+            skip_binary=skip_binary,
+            skip_generated=skip_generated,
+            generated_patterns=generated_patterns,
+        )
+        return diffs.iter_diffs(
+            self,
+            change_id,
+            selected,
+            revision_id=revision_id,
+            max_workers=max_workers,
+            retry_policy=retry_policy,
+            base=base,
+            parent=parent,
+            **diff_options,
+        )
+
     def get_file_content(self, change_id, file_path, revision_id="current"):
         """Get the content of a file from a revision.
 
@@ -648,6 +745,47 @@ class ChangeClient(base.BaseV1Client):
         )
         return self.connection.get_request(request_path)
 
+    def iter_file_content(self, change_id, file_path, revision_id="current"):
+        """Download the content of a file from a revision in chunks.
+
+        Unlike get_file_content() the base64 encoded body is decoded while
+        it is downloaded, so files of any size are not held in memory.
+
+        :param change_id: Identifier that uniquely identifies one change.
+        :param file_path: Path of the file.
+        :param revision_id: Identifier that uniquely identifies one revision.
+        :return: Generator of bytes of the file content.
+        """
+
+        request_path = "{api_path}{change_id}/revisions/{revision_id}/files/{file_path}/content".format(
+            api_path=self.api_path,
+            change_id=requests_utils.quote(change_id, safe=""),
+            revision_id=requests_utils.quote(str(revision_id), safe=""),
+            file_path=requests_utils.quote(file_path, safe=""),
+        )
+        return utils.decode_base64_chunks(
+            self.connection.get_request_chunks(request_path)
+        )
+
+    def iter_archive(self, change_id, revision_id="current", archive_format="tgz"):
+        """Download the archive of the whole tree of a revision in chunks.
+
+        :param change_id: Identifier that uniquely identifies one change.
+        :param revision_id: Identifier that uniquely identifies one revision.
+        :param archive_format: Format of the archive ('tar', 'tgz', 'tbz2',
+                               'txz'), must be enabled on the server.
+        :return: Generator of bytes of the archive.
+        """
+
+        request_path = "{api_path}{change_id}/revisions/{revision_id}/archive".format(
+            api_path=self.api_path,
+            change_id=requests_utils.quote(change_id, safe=""),
+            revision_id=requests_utils.quote(str(revision_id), safe=""),
+        )
+        return self.connection.get_request_chunks(
+            request_path, params={"format": archive_format}
+        )
+
     def get_related_changes(self, change_id, revision_id="current"):
         """Get related changes of a revision.
 
@@ -717,6 +855,28 @@ class ChangeClient(base.BaseV1Client):
         )
         return self.connection.get_request(request_path, params=params or None)
 
+    def iter_patch(self, change_id, revision_id="current", path=None):
+        """Download the formatted patch for a revision in chunks.
+
+        Unlike get_patch() the base64 encoded body is decoded while it is
+        downloaded, so patches of any size are not held in memory.
+
+        :param change_id: Identifier that uniquely identifies one change.
+        :param revision_id: Identifier that uniquely identifies one revision.
+        :param path: If set, only return the patch for the specified file.
+        :return: Generator of bytes of the decoded patch.
+        """
+
+        params = {"path": path} if path else None
+        request_path = "{api_path}{change_id}/revisions/{revision_id}/patch".format(
+            api_path=self.api_path,
+            change_id=requests_utils.quote(change_id, safe=""),
+            revision_id=requests_utils.quote(str(revision_id), safe=""),
+        )
+        return utils.decode_base64_chunks(
+            self.connection.get_request_chunks(request_path, params=params)
+        )
+
     # Submitted Together endpoint
 
     def get_submitted_together(self, change_id, options=None):
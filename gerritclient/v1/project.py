@@ -15,6 +15,7 @@ class ProjectClient(base.BaseV1ClientCreateEntity):
         project_type=None,
         description=False,
         branches=None,
+        tree=False,
     ):
         """Get list of all available projects accessible by the caller.
 
@@ -33,6 +34,8 @@ class ProjectClient(base.BaseV1ClientCreateEntity):
         :param branches: List of names of branches as a string to limit the
                          results to the projects having the specified branches
                          and include the sha1 of the branches in the results
+        :param tree: boolean value, if True then the name of the parent
+                     project will be added to every entry
         :return: A map (dict) that maps entity names to respective entries
         """
 
@@ -62,6 +65,8 @@ class ProjectClient(base.BaseV1ClientCreateEntity):
         }
         params["all"] = int(is_all)
         params["d"] = int(description)
+        if tree:
+            params["t"] = 1
         return self.connection.get_request(self.api_path, params=params)
 
     def get_by_name(self, name):